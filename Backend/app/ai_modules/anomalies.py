@@ -6,37 +6,69 @@ import numpy as np
 import pandas as pd
 from sklearn.ensemble import IsolationForest
 
-from app.ai_modules.common import reservoir_sample, select_numeric_columns
+from app.ai_modules.chunk_view import ChunkView
+from app.ai_modules.common import ReservoirSampler
 
 
 class AnomalyDetector:
     """
     IsolationForest-based anomaly detector operating on numeric columns.
 
-    To remain memory-efficient, this detector relies on reservoir sampling
-    and caps its internal numeric sample to roughly 10,000 rows.
+    To remain memory-efficient, this detector keeps a uniform reservoir
+    sample of at most 10,000 complete numeric rows.
     """
 
+    SAMPLE_SIZE = 10_000
+
     def __init__(self) -> None:
         self._numeric_columns: Optional[List[str]] = None
-        self._sampled_numeric: Optional[pd.DataFrame] = None
+        self._sampler: Optional[ReservoirSampler] = None
 
-    def process_chunk_for_sampling(self, chunk: pd.DataFrame) -> None:
+    def process_chunk_for_sampling(
+        self,
+        chunk: pd.DataFrame,
+        view: Optional[ChunkView] = None,
+    ) -> None:
         """
-        Collect a stratified sample of numeric rows across chunks.
+        Offer the chunk's complete numeric rows to the sample.
         """
+        if view is None:
+            view = ChunkView(chunk)
         if self._numeric_columns is None:
-            self._numeric_columns = select_numeric_columns(chunk)
-            if not self._numeric_columns:
-                return
-
-        numeric_df = chunk[self._numeric_columns].apply(
-            pd.to_numeric, errors="coerce"
-        ).dropna(how="any")
-        if numeric_df.empty:
+            self._numeric_columns = view.numeric_columns()
+        if not self._numeric_columns:
+            return
+        # Chunks without the sampled columns (e.g. from another worksheet)
+        # cannot contribute rows to the sample.
+        if not set(self._numeric_columns).issubset(chunk.columns):
             return
 
-        self._sampled_numeric = reservoir_sample(self._sampled_numeric, numeric_df)
+        rows = np.column_stack(
+            [view.numeric(col) for col in self._numeric_columns]
+        )
+        rows = rows[~np.isnan(rows).any(axis=1)]
+        if self._sampler is None:
+            self._sampler = ReservoirSampler(self.SAMPLE_SIZE, width=len(self._numeric_columns))
+        self._sampler.add(rows)
+
+    def merge(self, other: "AnomalyDetector") -> None:
+        """
+        Combine with a detector that sampled other chunks of the same file.
+        """
+        if self._numeric_columns is None:
+            self._numeric_columns = other._numeric_columns
+        if not self._numeric_columns:
+            return
+        if other._sampler is None or not other._sampler.seen:
+            return
+        # Serial runs pick numeric columns from the first chunk only; a part
+        # that sampled different columns cannot contribute rows.
+        if not set(self._numeric_columns).issubset(other._numeric_columns):
+            return
+        order = [other._numeric_columns.index(col) for col in self._numeric_columns]
+        if self._sampler is None:
+            self._sampler = ReservoirSampler(self.SAMPLE_SIZE, width=len(self._numeric_columns))
+        self._sampler.merge(other._sampler.select_columns(order))
 
     def _compute_z_score_outliers(self, data: np.ndarray, threshold: float = 3.0) -> int:
         """
@@ -66,14 +98,26 @@ class AnomalyDetector:
         mask = np.any(np.abs(modified_z) > threshold, axis=1)
         return int(np.sum(mask))
 
-    def _compute_iqr_outliers(self, data: np.ndarray, factor: float = 1.5) -> int:
+    def _compute_iqr_outliers(
+        self,
+        data: np.ndarray,
+        factor: float = 1.5,
+        profiles: Optional[Dict[str, dict]] = None,
+    ) -> int:
         """
         Count outliers using the IQR rule per column.
+
+        Quartiles come from the column ``profiles`` (full-data sketches)
+        where available, otherwise from the sample itself.
         """
         if data.size == 0:
             return 0
         q1 = np.percentile(data, 25, axis=0)
         q3 = np.percentile(data, 75, axis=0)
+        for i, col in enumerate(self._numeric_columns or []):
+            profile = (profiles or {}).get(col) or {}
+            if profile.get("q1") is not None and profile.get("q3") is not None:
+                q1[i], q3[i] = profile["q1"], profile["q3"]
         iqr = q3 - q1
         iqr[iqr == 0] = 1.0
         lower = q1 - factor * iqr
@@ -81,7 +125,10 @@ class AnomalyDetector:
         mask = np.any((data < lower) | (data > upper), axis=1)
         return int(np.sum(mask))
 
-    def compute_anomalies(self) -> Dict[str, float | int]:
+    def compute_anomalies(
+        self,
+        profiles: Optional[Dict[str, dict]] = None,
+    ) -> Dict[str, float | int]:
         """
         Train IsolationForest on sampled numeric data and compute anomaly stats.
 
@@ -89,7 +136,7 @@ class AnomalyDetector:
         - Statistical anomaly counts via Z-score, modified Z-score (MAD),
           and IQR methods computed on the same sampled numeric data.
         """
-        if self._sampled_numeric is None or self._sampled_numeric.empty:
+        if self._sampler is None or not len(self._sampler):
             return {
                 "anomaly_count": 0,
                 "anomaly_ratio": 0.0,
@@ -99,7 +146,7 @@ class AnomalyDetector:
                 "iqr_outliers": 0,
             }
 
-        values = self._sampled_numeric.values.astype(float)
+        values = self._sampler.values
 
         # IsolationForest-based multivariate anomalies
         model = IsolationForest(
@@ -118,7 +165,7 @@ class AnomalyDetector:
         # Statistical anomalies on the same sample
         z_outliers = self._compute_z_score_outliers(values)
         modified_z_outliers = self._compute_modified_z_outliers(values)
-        iqr_outliers = self._compute_iqr_outliers(values)
+        iqr_outliers = self._compute_iqr_outliers(values, profiles=profiles)
 
         return {
             "anomaly_count": anomaly_count,
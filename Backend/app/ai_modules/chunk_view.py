@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from app.services.columnar_stream import FooterStats
+
+
+# Strings ``pd.to_numeric`` accepts as numbers (after trimming whitespace).
+_NUMERIC_PATTERN = r"^[-+]?((\d+\.?\d*|\.\d+)(e[-+]?\d+)?|inf|infinity|nan)$"
+
+
+class ChunkView:
+    """
+    Decoded columns of one chunk, shared by every detector.
+
+    Chunks arrive as object-typed DataFrames and every detector needs some
+    mix of numeric values, null masks and string forms of each column.
+    Each conversion is done at most once per column and cached here, so a
+    chunk is decoded once instead of once per detector.
+
+    Conversions are lazy: a detector that never asks for a column's numeric
+    values does not pay for them.
+
+    A view can also wrap an Arrow record batch (:meth:`from_record_batch`);
+    its columns are then decoded with Arrow compute kernels and ``frame``
+    holds Arrow-backed pandas columns instead of Python string objects.
+    Batches read from Parquet also carry the footer statistics of their
+    row group in ``footer_stats``.
+    """
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+        self._batch: Optional["pa.RecordBatch"] = None
+        self.footer_stats: Dict[str, "FooterStats"] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+        self._nulls: Dict[str, np.ndarray] = {}
+        self._arrow_string_arrays: Dict[str, "pa.Array"] = {}
+        self._strings: Dict[str, pd.Series] = {}
+        self._non_empty_strings: Dict[str, pd.Series] = {}
+        self._unique_strings: Dict[str, np.ndarray] = {}
+        self._string_counts: Dict[str, pd.Series] = {}
+        self._numeric_columns: Optional[List[str]] = None
+
+    @classmethod
+    def from_record_batch(
+        cls,
+        batch: "pa.RecordBatch",
+        footer_stats: Optional[Dict[str, "FooterStats"]] = None,
+    ) -> "ChunkView":
+        """
+        Build a view over an Arrow record batch without converting its
+        values to Python objects.
+
+        Nested columns (lists, structs, maps) are replaced by their text
+        form, so every detector sees hashable scalar values.
+        """
+        import pyarrow as pa
+
+        if any(pa.types.is_nested(field.type) for field in batch.schema):
+            columns = [
+                pa.array(
+                    [None if value is None else str(value) for value in column.to_pylist()],
+                    type=pa.string(),
+                )
+                if pa.types.is_nested(column.type)
+                else column
+                for column in batch.columns
+            ]
+            batch = pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+        view = cls(batch.to_pandas(types_mapper=pd.ArrowDtype))
+        view._batch = batch
+        view.footer_stats = footer_stats or {}
+        return view
+
+    def _arrow_column(self, col: str) -> Optional["pa.Array"]:
+        if self._batch is None:
+            return None
+        return self._batch.column(self.frame.columns.get_loc(col))
+
+    def is_text(self, col: str) -> bool:
+        """
+        Whether the column can hold strings (and so empty strings).
+        """
+        array = self._arrow_column(col)
+        if array is None:
+            return True
+        import pyarrow as pa
+
+        return pa.types.is_string(array.type) or pa.types.is_large_string(array.type)
+
+    @property
+    def record_batch(self) -> Optional["pa.RecordBatch"]:
+        """
+        The Arrow record batch behind the view, if it wraps one.
+        """
+        return self._batch
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.frame.columns)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def numeric(self, col: str) -> np.ndarray:
+        """
+        Column values as float64, with NaN where a value is not numeric.
+        """
+        values = self._numeric.get(col)
+        if values is None:
+            values = self._arrow_numeric(col)
+            if values is None:
+                values = (
+                    pd.to_numeric(self.frame[col], errors="coerce")
+                    .to_numpy(dtype=np.float64, na_value=np.nan)
+                )
+            self._numeric[col] = values
+        return values
+
+    def _arrow_numeric(self, col: str) -> Optional[np.ndarray]:
+        """
+        Decode an Arrow column to float64 with compute kernels.
+
+        Columns that are fully numeric are cast in one call. Otherwise values
+        that look like numbers are cast and the rest become NaN, matching
+        ``pd.to_numeric(errors="coerce")``. Typed columns that are neither
+        numbers nor strings (booleans, dates, nested values) are all NaN,
+        as their text form is in a CSV file. Returns None when the column
+        cannot be handled here, so the caller falls back to pandas.
+        """
+        array = self._arrow_column(col)
+        if array is None:
+            return None
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        kind = array.type
+        if not (
+            pa.types.is_integer(kind)
+            or pa.types.is_floating(kind)
+            or pa.types.is_decimal(kind)
+            or pa.types.is_string(kind)
+            or pa.types.is_large_string(kind)
+        ):
+            return np.full(len(array), np.nan)
+        try:
+            return array.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+        if not pa.types.is_string(array.type) and not pa.types.is_large_string(array.type):
+            return None
+        try:
+            trimmed = pc.utf8_trim_whitespace(array)
+            numeric_like = pc.match_substring_regex(
+                trimmed, _NUMERIC_PATTERN, ignore_case=True
+            )
+            kept = pc.if_else(numeric_like, trimmed, pa.scalar(None, array.type))
+            return kept.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return None
+
+    def null_mask(self, col: str) -> np.ndarray:
+        mask = self._nulls.get(col)
+        if mask is None:
+            array = self._arrow_column(col)
+            if array is not None:
+                mask = array.is_null().to_numpy(zero_copy_only=False)
+            else:
+                mask = self.frame[col].isna().to_numpy()
+            self._nulls[col] = mask
+        return mask
+
+    def _arrow_strings(self, col: str) -> Optional["pa.Array"]:
+        """
+        An Arrow column cast to strings, cast once and shared by
+        :meth:`strings`, :meth:`unique_strings` and :meth:`string_counts`.
+        """
+        strings = self._arrow_string_arrays.get(col)
+        if strings is None:
+            array = self._arrow_column(col)
+            if array is None:
+                return None
+            strings = self._cast_arrow_strings(array)
+            self._arrow_string_arrays[col] = strings
+        return strings
+
+    @staticmethod
+    def _cast_arrow_strings(array: "pa.Array") -> "pa.Array":
+        """
+        Cast an Arrow array to strings. Values Arrow cannot cast (e.g.
+        nested or binary values) are converted one by one with ``str``.
+        """
+        import pyarrow as pa
+
+        if pa.types.is_floating(array.type):
+            # Arrow prints floats in its own shortest form ("100", "1.5e-7");
+            # use Python's ("100.0", "1.5e-07") like the pandas engine does.
+            nulls = array.is_null().to_numpy(zero_copy_only=False)
+            strings = array.to_numpy(zero_copy_only=False).astype(str)
+            return pa.array(strings, type=pa.string(), mask=nulls)
+        try:
+            return array.cast(pa.string())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return pa.array(
+                [None if value is None else str(value) for value in array.to_pylist()],
+                type=pa.string(),
+            )
+
+    def strings(self, col: str) -> pd.Series:
+        """
+        Column values converted with ``astype(str)`` (nulls become "nan").
+        """
+        series = self._strings.get(col)
+        if series is None:
+            array = self._arrow_strings(col)
+            if array is not None:
+                series = pd.Series(
+                    array.fill_null("nan").to_numpy(zero_copy_only=False),
+                    index=self.frame.index,
+                    dtype=object,
+                )
+            else:
+                column = self.frame[col]
+                series = column.astype(str)
+                if column.dtype != object:
+                    # Typed columns print nulls as "<NA>"; text ones as "nan".
+                    series = series.mask(self.null_mask(col), "nan")
+            self._strings[col] = series
+        return series
+
+    def non_empty_strings(self, col: str) -> pd.Series:
+        """
+        String values that are not the empty string, in row order.
+        """
+        series = self._non_empty_strings.get(col)
+        if series is None:
+            strings = self.strings(col)
+            series = strings[strings != ""]
+            self._non_empty_strings[col] = series
+        return series
+
+    def unique_strings(self, col: str) -> np.ndarray:
+        """
+        Distinct string forms of the non-null values, in first-seen order.
+        """
+        values = self._unique_strings.get(col)
+        if values is None:
+            array = self._arrow_strings(col)
+            if array is not None:
+                values = array.drop_null().unique().to_numpy(zero_copy_only=False)
+            else:
+                values = self.strings(col)[~self.null_mask(col)].unique()
+            self._unique_strings[col] = values
+        return values
+
+    def string_counts(self, col: str) -> pd.Series:
+        """
+        Occurrences of every distinct string form of the non-null values.
+        """
+        counts = self._string_counts.get(col)
+        if counts is None:
+            array = self._arrow_strings(col)
+            if array is not None:
+                pairs = array.drop_null().value_counts()
+                counts = pd.Series(
+                    pairs.field("counts").to_numpy(),
+                    index=pairs.field("values").to_numpy(zero_copy_only=False),
+                    dtype=np.int64,
+                )
+            else:
+                counts = self.strings(col)[~self.null_mask(col)].value_counts()
+            self._string_counts[col] = counts
+        return counts
+
+    def numeric_columns(self) -> List[str]:
+        """
+        Columns with at least one numeric value, like ``select_numeric_columns``.
+        """
+        if self._numeric_columns is None:
+            self._numeric_columns = [
+                col for col in self.columns if not np.isnan(self.numeric(col)).all()
+            ]
+        return self._numeric_columns
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+import copy
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar
 
 import numpy as np
 import pandas as pd
 
 
+T = TypeVar("T")
+
+
+def merge_states(states: Sequence[T]) -> T:
+    """
+    Fold partial detector states into one with their ``merge()`` method.
+
+    Each detector keeps plain Python/numpy state that can be pickled, so
+    chunks can be processed independently (in other processes or on other
+    machines) and combined at the end. ``merge()`` is associative; states
+    must be given in chunk order for head-of-file samples to match a
+    serial run.
+    """
+    if not states:
+        raise ValueError("No states to merge")
+    merged = states[0]
+    for state in states[1:]:
+        merged.merge(state)
+    return merged
+
+
 def infer_column_types(sample: pd.Series) -> str:
     """
     Infer a simple semantic type for a column based on a sample.
@@ -14,6 +36,12 @@ def infer_column_types(sample: pd.Series) -> str:
     if non_null.empty:
         return "unknown"
 
+    # Typed samples (e.g. from Parquet) already know booleans and dates.
+    if pd.api.types.is_datetime64_any_dtype(non_null.dtype):
+        return "datetime"
+    if pd.api.types.is_bool_dtype(non_null.dtype):
+        return "categorical"
+
     # Try numeric
     numeric = pd.to_numeric(non_null, errors="coerce")
     if numeric.notna().mean() > 0.9:
@@ -31,9 +59,19 @@ def infer_column_types(sample: pd.Series) -> str:
 def select_numeric_columns(df: pd.DataFrame) -> List[str]:
     """
     Select numeric-like columns from an object-typed DataFrame.
+
+    Typed boolean and date/time columns (e.g. from Parquet) are not
+    numeric, as their text form in a CSV file would not be either.
     """
     numeric_cols: List[str] = []
     for col in df.columns:
+        dtype = df[col].dtype
+        if (
+            pd.api.types.is_bool_dtype(dtype)
+            or pd.api.types.is_datetime64_any_dtype(dtype)
+            or pd.api.types.is_timedelta64_dtype(dtype)
+        ):
+            continue
         series = pd.to_numeric(df[col], errors="coerce")
         if series.notna().sum() > 0:
             numeric_cols.append(col)
@@ -48,22 +86,282 @@ def detect_mixed_types(series: pd.Series) -> bool:
     return len(types) > 1
 
 
-def reservoir_sample(
-    existing: pd.DataFrame,
-    new_chunk: pd.DataFrame,
-    max_samples: int = 10_000,
-) -> pd.DataFrame:
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
     """
-    Reservoir sampling across chunks for large datasets.
+    Hash every row of a DataFrame into a 64-bit key in one vectorized pass.
+
+    Values are hashed by their string representation, so object columns
+    holding e.g. ``1`` and ``"1"`` produce the same key, matching the
+    previous ``"||".join(row.astype(str))`` behaviour. With 64-bit keys the
+    chance of any collision stays below 1e-5 for 20M distinct rows.
     """
-    if existing is None or existing.empty:
-        sample = new_chunk.sample(
-            n=min(len(new_chunk), max_samples), random_state=42
-        )
-        return sample
+    if df.empty:
+        return np.empty(0, dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+
+def hash_values(series: pd.Series) -> np.ndarray:
+    """
+    Hash every value of a Series into a 64-bit key in one vectorized pass.
+    """
+    if series.empty:
+        return np.empty(0, dtype=np.uint64)
+    return pd.util.hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64)
+
+
+class ReservoirSampler:
+    """
+    Uniform sample of at most ``capacity`` rows of a stream (Algorithm L).
+
+    Rows are kept in a preallocated numpy buffer. Once it is full, the
+    number of rows to skip before the next accepted one is drawn directly
+    (geometric skips with a shrinking acceptance threshold), so a chunk
+    costs time in the number of rows it contributes, not in its length.
+    Every row of the stream ends up in the sample with the same
+    probability, whatever the chunk sizes.
+
+    ``width`` is the number of values per row (None for a 1-D sample of
+    scalars); ``dtype`` is the buffer's dtype (``object`` for strings).
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        width: Optional[int] = None,
+        dtype: Any = np.float64,
+        seed: Optional[int] = 42,
+    ) -> None:
+        shape = (capacity,) if width is None else (capacity, width)
+        self.capacity = capacity
+        self._buffer = np.empty(shape, dtype=dtype)
+        self._rng = np.random.default_rng(seed)
+        self._size = 0
+        self.seen = 0
+        # Acceptance threshold and stream position of the next accepted row.
+        self._w = 1.0
+        self._next = 0
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        The sampled rows, in no particular order.
+        """
+        return self._buffer[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _skip(self) -> None:
+        # log1p keeps the skip finite while the threshold is still ~1.
+        skip = np.floor(np.log(self._rng.random()) / np.log1p(-self._w))
+        self._next += int(min(skip, np.iinfo(np.int64).max // 2)) + 1
+
+    def _advance(self) -> None:
+        self._w *= np.exp(np.log(self._rng.random()) / self.capacity)
+        self._skip()
+
+    def _start_skipping(self) -> None:
+        self._w = 1.0
+        self._next = self.seen - 1
+        self._advance()
+
+    def add(self, rows: np.ndarray) -> None:
+        """
+        Offer the rows of a chunk (one per element, or per row of a 2-D
+        array) to the sample.
+        """
+        count = len(rows)
+        if not count or not self.capacity:
+            self.seen += count
+            return
+        start = self.seen
+        taken = 0
+        if self._size < self.capacity:
+            taken = min(self.capacity - self._size, count)
+            self._buffer[self._size : self._size + taken] = rows[:taken]
+            self._size += taken
+            self.seen += taken
+            if self._size == self.capacity:
+                self._start_skipping()
+        end = start + count
+        picks: List[int] = []
+        slots: List[int] = []
+        while self._size == self.capacity and self._next < end:
+            picks.append(self._next - start)
+            slots.append(int(self._rng.integers(self.capacity)))
+            self._advance()
+        if picks:
+            # A slot replaced twice keeps the later row.
+            slots_rev = np.array(slots[::-1])
+            picks_rev = np.array(picks[::-1])
+            unique_slots, first = np.unique(slots_rev, return_index=True)
+            self._buffer[unique_slots] = rows[picks_rev[first]]
+        self.seen = end
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._buffer.dtype
+
+    def cast(self, dtype: Any) -> None:
+        """
+        Store rows as ``dtype`` from now on, converting the rows sampled so
+        far.
+        """
+        self._buffer = self._buffer.astype(dtype)
+
+    def select_columns(self, columns: Sequence[int]) -> "ReservoirSampler":
+        """
+        Copy of this sampler keeping the given columns of every row.
+        """
+        selected = copy.copy(self)
+        selected._buffer = self._buffer[:, list(columns)]
+        return selected
+
+    def merge(self, other: "ReservoirSampler") -> None:
+        """
+        Combine with a sampler of another part of the stream, giving a
+        uniform sample of both parts together.
+        """
+        if not other.seen:
+            return
+        total = self.seen + other.seen
+        size = min(self.capacity, self._size + other._size)
+        # How many of the merged rows come from each part: drawing without
+        # replacement from the union of both streams.
+        from_self = int(self._rng.hypergeometric(self.seen, other.seen, size)) if self.seen else 0
+        from_self = min(from_self, self._size)
+        from_other = min(size - from_self, other._size)
+        from_self = size - from_other
+        mine = self.values[self._rng.choice(self._size, from_self, replace=False)]
+        theirs = other.values[self._rng.choice(other._size, from_other, replace=False)]
+        self._buffer[:from_self] = mine
+        self._buffer[from_self:size] = theirs
+        self._size = size
+        self.seen = total
+        if self._size == self.capacity:
+            # The threshold after ``seen`` rows is the k-th smallest of
+            # ``seen`` uniform keys.
+            self._w = float(self._rng.beta(self.capacity, self.seen - self.capacity + 1))
+            self._next = self.seen - 1
+            self._skip()
+
+
+class WeightedReservoirSampler:
+    """
+    Weighted sample without replacement of at most ``capacity`` rows
+    (Efraimidis-Spirakis A-Res): each row gets the key ``log(u) / weight``
+    and the rows with the largest keys are kept, so a row's chance of
+    being sampled grows with its weight. Rows with a weight of zero or
+    less are never sampled.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        width: Optional[int] = None,
+        dtype: Any = np.float64,
+        seed: Optional[int] = 42,
+    ) -> None:
+        shape = (capacity,) if width is None else (capacity, width)
+        self.capacity = capacity
+        self._buffer = np.empty(shape, dtype=dtype)
+        self._keys = np.empty(capacity, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+        self._size = 0
+        self.seen = 0
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._buffer[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _keep(self, rows: np.ndarray, keys: np.ndarray) -> None:
+        if self._size == self.capacity:
+            # Only rows beating the smallest kept key can enter.
+            better = keys > self._keys[: self._size].min()
+            rows, keys = rows[better], keys[better]
+        if not len(keys):
+            return
+        all_keys = np.concatenate([self._keys[: self._size], keys])
+        keep = min(self.capacity, len(all_keys))
+        top = np.argpartition(all_keys, len(all_keys) - keep)[len(all_keys) - keep :]
+        old = top[top < self._size]
+        new = top[top >= self._size] - self._size
+        kept_rows = np.concatenate([self._buffer[old], rows[new]])
+        self._buffer[:keep] = kept_rows
+        self._keys[:keep] = all_keys[top[np.argsort(top >= self._size, kind="stable")]]
+        self._size = keep
+
+    def add(self, rows: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Offer the rows of a chunk with their weights.
+        """
+        self.seen += len(rows)
+        weights = np.asarray(weights, dtype=np.float64)
+        positive = weights > 0
+        if not positive.any() or not self.capacity:
+            return
+        rows, weights = rows[positive], weights[positive]
+        keys = np.log(self._rng.random(len(weights))) / weights
+        self._keep(rows, keys)
+
+    def merge(self, other: "WeightedReservoirSampler") -> None:
+        """
+        Combine with a sampler of another part of the stream. Keys are
+        independent per row, so keeping the largest of both is exact.
+        """
+        self.seen += other.seen
+        self._keep(other.values, other._keys[: other._size].copy())
+
+
+class StratifiedReservoirSampler:
+    """
+    A uniform sample of up to ``capacity`` rows for every stratum, so rare
+    strata are represented as well as common ones.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        width: Optional[int] = None,
+        dtype: Any = np.float64,
+        seed: Optional[int] = 42,
+    ) -> None:
+        self.capacity = capacity
+        self._width = width
+        self._dtype = dtype
+        self._seed = seed
+        self.strata: Dict[Any, ReservoirSampler] = {}
+
+    def _sampler(self, stratum: Any) -> ReservoirSampler:
+        sampler = self.strata.get(stratum)
+        if sampler is None:
+            seed = None if self._seed is None else self._seed + len(self.strata)
+            sampler = ReservoirSampler(self.capacity, self._width, self._dtype, seed)
+            self.strata[stratum] = sampler
+        return sampler
+
+    def add(self, rows: np.ndarray, strata: np.ndarray) -> None:
+        """
+        Offer the rows of a chunk with the stratum of each row.
+        """
+        labels, inverse = np.unique(np.asarray(strata), return_inverse=True)
+        for code, label in enumerate(labels.tolist()):
+            self._sampler(label).add(rows[inverse == code])
 
-    combined = pd.concat([existing, new_chunk], ignore_index=True)
-    if len(combined) <= max_samples:
-        return combined
-    return combined.sample(n=max_samples, random_state=42)
+    def merge(self, other: "StratifiedReservoirSampler") -> None:
+        for stratum, sampler in other.strata.items():
+            self._sampler(stratum).merge(sampler)
 
+    @property
+    def values(self) -> np.ndarray:
+        """
+        The sampled rows of every stratum, stratum by stratum.
+        """
+        parts = [sampler.values for sampler in self.strata.values()]
+        if not parts:
+            shape = (0,) if self._width is None else (0, self._width)
+            return np.empty(shape, dtype=self._dtype)
+        return np.concatenate(parts)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
+from app.ai_modules.chunk_view import ChunkView
 from app.ai_modules.common import infer_column_types
 
 
@@ -24,17 +25,27 @@ class ConsistencyChecker:
         # Per-column text samples for pattern checks
         self._string_samples: Dict[str, List[str]] = {}
 
-    def process_chunk(self, chunk: pd.DataFrame) -> None:
+    def process_chunk(self, chunk: pd.DataFrame, view: Optional[ChunkView] = None) -> None:
         """
         Collect string samples per column from a chunk.
         """
+        if view is None:
+            view = ChunkView(chunk)
         for col in chunk.columns:
-            series = chunk[col].astype(str)
             samples = self._string_samples.setdefault(col, [])
             if len(samples) < 5_000:
-                non_null = series[series.notna() & (series != "")]
                 remaining = 5_000 - len(samples)
-                samples.extend(non_null.head(remaining).tolist())
+                samples.extend(view.non_empty_strings(col).head(remaining).tolist())
+
+    def merge(self, other: "ConsistencyChecker") -> None:
+        """
+        Combine with a checker that processed later chunks of the same file.
+        """
+        for col, other_samples in other._string_samples.items():
+            samples = self._string_samples.setdefault(col, [])
+            remaining = 5_000 - len(samples)
+            if remaining > 0:
+                samples.extend(other_samples[:remaining])
 
     def _looks_like_email(self, name: str, samples: List[str]) -> bool:
         if "email" in name.lower():
@@ -137,7 +148,7 @@ class ConsistencyChecker:
                     )
                     # Align timezones to prevent comparison crashes
                     if parsed.dt.tz is None:
-                        parsed = parsed.dt.localize('UTC')
+                        parsed = parsed.dt.tz_localize('UTC')
                     
                     future_mask = parsed > now
                     if future_mask.any():
@@ -1,36 +1,330 @@
 from __future__ import annotations
 
-import hashlib
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
-from difflib import SequenceMatcher
+
+from app.ai_modules.chunk_view import ChunkView
+from app.ai_modules.common import hash_rows, hash_values
+from app.ai_modules.minhash import MinHasher
+from app.ai_modules.seen_set import BloomSeenSet, HashSeenSet
+from app.core.config import settings
+
+
+SeenSet = Union[HashSeenSet, BloomSeenSet]
+
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def soundex(value: str) -> str:
+    """
+    American Soundex code of the alphabetic characters in ``value``
+    (empty string when there are none).
+    """
+    letters = [c for c in value.lower() if "a" <= c <= "z"]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # "h" and "w" do not separate letters with the same code.
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+class RecordLinker:
+    """
+    Fuzzy row matching across a whole dataset using blocking keys.
+
+    Rows are reduced to their key-like columns, normalized (lower-cased,
+    punctuation stripped) and summarized by a MinHash signature of the
+    concatenated fields. Instead of comparing every pair of rows, candidate
+    pairs are generated by several blocking passes:
+
+    - normalized 4-character prefix of each key column,
+    - Soundex code of each key column,
+    - sorted neighbourhood: rows sorted by their normalized record and
+      compared with the next ``window - 1`` rows.
+
+    Within a block, rows are compared with a sliding window of
+    ``max_block`` rows, so oversized blocks (e.g. a very common surname)
+    cannot blow up the number of comparisons. Candidate pairs whose
+    estimated similarity reaches ``threshold`` are reported as near-duplicate
+    records; exact duplicates are left to the exact row pass.
+
+    Memory is a fixed number of bytes per linked row (signature, blocking
+    keys and a short sort key); rows beyond ``max_rows`` are not linked.
+    """
+
+    _SORT_KEY_WIDTH = 16
+
+    def __init__(
+        self,
+        key_columns: List[str],
+        max_rows: int,
+        window: int = 10,
+        max_block: int = 32,
+        threshold: float = 0.8,
+        sample_pairs: int = 20,
+    ) -> None:
+        self.key_columns = key_columns
+        self._max_rows = max_rows
+        self._window = window
+        self._max_block = max_block
+        self._threshold = threshold
+        self._sample_pairs = sample_pairs
+        self._hasher = MinHasher(num_perm=32, bands=8, ngram=3)
+
+        self._rows: int = 0
+        self._skipped_rows: int = 0
+        self._signatures: List[np.ndarray] = []
+        self._record_hashes: List[np.ndarray] = []
+        self._sort_keys: List[np.ndarray] = []
+        self._block_keys: List[List[np.ndarray]] = []
+
+    def process_chunk(self, chunk: pd.DataFrame) -> None:
+        """
+        Normalize key columns of a chunk and store its blocking keys and
+        signatures.
+        """
+        remaining = self._max_rows - self._rows
+        if remaining < len(chunk):
+            self._skipped_rows += len(chunk) - max(remaining, 0)
+            chunk = chunk.iloc[: max(remaining, 0)]
+        if chunk.empty:
+            return
+
+        fields = [
+            chunk[col]
+            .fillna("")
+            .astype(str)
+            .str.lower()
+            .str.replace(r"[^0-9a-z@.]+", "", regex=True)
+            for col in self.key_columns
+        ]
+        records = fields[0].str.cat(fields[1:], sep=" ") if len(fields) > 1 else fields[0]
+
+        block_keys: List[np.ndarray] = []
+        for field in fields:
+            prefixes = field.str.slice(0, 4)
+            codes = field.map(_soundex_codes(field))
+            for key in (prefixes, codes):
+                hashed = hash_values(key)
+                # Empty values must not form one giant block.
+                hashed[(key == "").to_numpy()] = 0
+                block_keys.append(hashed)
+
+        self._signatures.append(self._hasher.signatures(records.tolist()))
+        self._record_hashes.append(hash_values(records))
+        self._sort_keys.append(
+            records.str.slice(0, self._SORT_KEY_WIDTH)
+            .str.encode("utf-8", errors="ignore")
+            .to_numpy(dtype=f"S{self._SORT_KEY_WIDTH}")
+        )
+        self._block_keys.append(block_keys)
+        self._rows += len(chunk)
+
+    def merge(self, other: "RecordLinker") -> None:
+        """
+        Append rows linked by another linker over later chunks.
+        """
+        for idx in range(len(other._signatures)):
+            remaining = self._max_rows - self._rows
+            size = other._signatures[idx].shape[0]
+            take = min(size, max(remaining, 0))
+            self._skipped_rows += size - take
+            if take == 0:
+                continue
+            self._signatures.append(other._signatures[idx][:take])
+            self._record_hashes.append(other._record_hashes[idx][:take])
+            self._sort_keys.append(other._sort_keys[idx][:take])
+            self._block_keys.append([keys[:take] for keys in other._block_keys[idx]])
+            self._rows += take
+        self._skipped_rows += other._skipped_rows
+
+    def _window_pairs(
+        self,
+        keys: np.ndarray,
+        window: int,
+        require_equal: bool,
+    ) -> List[np.ndarray]:
+        """
+        Pair each row with up to ``window - 1`` following rows in key order,
+        encoded as ``low * n + high`` pair ids.
+        """
+        n = keys.size
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        pair_ids: List[np.ndarray] = []
+        for dist in range(1, min(window, n)):
+            left = order[:-dist]
+            right = order[dist:]
+            if require_equal:
+                same = (sorted_keys[:-dist] == sorted_keys[dist:]) & (sorted_keys[dist:] != 0)
+                if not same.any():
+                    break
+                left = left[same]
+                right = right[same]
+            lo = np.minimum(left, right).astype(np.uint64)
+            hi = np.maximum(left, right).astype(np.uint64)
+            pair_ids.append(lo * np.uint64(n) + hi)
+        return pair_ids
+
+    def find_matches(self) -> Dict[str, object]:
+        """
+        Run all blocking passes and count near-duplicate record pairs.
+
+        ``sample_pairs`` lists up to ``sample_pairs`` matches, most similar
+        first, as 0-based row numbers of the linked rows with their
+        similarity and the start of each normalized record.
+        """
+        n = self._rows
+        result: Dict[str, object] = {
+            "key_columns": list(self.key_columns),
+            "linked_rows": n,
+            "skipped_rows": self._skipped_rows,
+            "candidate_pairs": 0,
+            "fuzzy_record_pairs": 0,
+            "fuzzy_record_duplicates": 0,
+            "sample_pairs": [],
+        }
+        if n < 2:
+            return result
+
+        signatures = np.concatenate(self._signatures)
+        record_hashes = np.concatenate(self._record_hashes)
+
+        pair_ids: List[np.ndarray] = []
+        for pass_idx in range(len(self._block_keys[0])):
+            keys = np.concatenate([chunk_keys[pass_idx] for chunk_keys in self._block_keys])
+            pair_ids.extend(self._window_pairs(keys, self._max_block, require_equal=True))
+        pair_ids.extend(
+            self._window_pairs(np.concatenate(self._sort_keys), self._window, require_equal=False)
+        )
+        if not pair_ids:
+            return result
+
+        unique_ids = np.unique(np.concatenate(pair_ids))
+        left = (unique_ids // np.uint64(n)).astype(np.int64)
+        right = (unique_ids % np.uint64(n)).astype(np.int64)
+        # Exact duplicates are already counted by the exact row pass.
+        distinct = record_hashes[left] != record_hashes[right]
+        left, right = left[distinct], right[distinct]
+
+        similarity = self._hasher.similarity(signatures, left, right)
+        similar = similarity >= self._threshold
+        result["candidate_pairs"] = int(left.size)
+        result["fuzzy_record_pairs"] = int(np.count_nonzero(similar))
+        result["fuzzy_record_duplicates"] = int(
+            np.unique(np.concatenate([left[similar], right[similar]])).size
+        )
+
+        matches = np.flatnonzero(similar)
+        matches = matches[np.argsort(-similarity[matches], kind="stable")][: self._sample_pairs]
+        sort_keys = np.concatenate(self._sort_keys)
+        result["sample_pairs"] = [
+            {
+                "left_row": int(left[i]),
+                "right_row": int(right[i]),
+                "similarity": float(similarity[i]),
+                "left_preview": sort_keys[left[i]].decode("utf-8", errors="ignore"),
+                "right_preview": sort_keys[right[i]].decode("utf-8", errors="ignore"),
+            }
+            for i in matches
+        ]
+        return result
+
+
+def _soundex_codes(field: pd.Series) -> Dict[str, str]:
+    """
+    Soundex codes for the distinct values of a Series (values without any
+    letters, such as phone numbers, map to an empty code).
+    """
+    unique = pd.Series(field.unique())
+    with_letters = unique[unique.str.contains("[a-z]", regex=True)]
+    codes = dict.fromkeys(unique.tolist(), "")
+    codes.update((value, soundex(value)) for value in with_letters)
+    return codes
 
 
 class DuplicateDetector:
     """
     Duplicate detector with multiple strategies:
 
-    - Exact row-level duplicates using SHA-256 hashing across chunks.
+    - Exact row-level duplicates using vectorized 64-bit row hashing
+      across chunks, tracked in memory-bounded seen-sets that spill to disk
+      once ``duplicate_memory_budget_mb`` is exceeded. In approximate mode
+      fixed-size Bloom filters are used instead and the stats carry an
+      error bound.
     - Key-based duplicates on heuristically chosen identifier-like columns
       (e.g. email, phone, id).
-    - Lightweight fuzzy duplicates using string similarity on a bounded
-      sample of values per text column (no external dependencies).
+    - Fuzzy duplicates per column using character n-gram MinHash with LSH
+      banding over a bounded sample of distinct values, so candidate pairs
+      are found in near-linear time (no external dependencies).
+    - Optional record linkage (``record_linkage_enabled``): near-duplicate
+      rows across the whole dataset, matched on the key-like columns with
+      blocking keys (see :class:`RecordLinker`).
     """
 
-    def __init__(self) -> None:
-        # Exact row-level duplicates
-        self._seen_hashes: set[str] = set()
-        self._duplicate_count: int = 0
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        approximate: Optional[bool] = None,
+    ) -> None:
+        if memory_budget_bytes is None:
+            memory_budget_bytes = settings.duplicate_memory_budget_mb * 1024 * 1024
+        if approximate is None:
+            approximate = settings.duplicate_mode == "approximate"
+        self._memory_budget_bytes = memory_budget_bytes
+        self._approximate = approximate
+
+        # Exact row-level duplicates (created on the first chunk, once the
+        # number of seen-sets sharing the memory budget is known)
+        self._seen_hashes: Optional[SeenSet] = None
         self._total_rows: int = 0
 
         # Key-based duplicates (per-column)
-        self._key_seen: Dict[str, Set[str]] = {}
-        self._key_duplicate_counts: Dict[str, int] = {}
+        self._key_seen: Dict[str, SeenSet] = {}
+
+        # Fuzzy duplicates (per-column, via samples of distinct values kept
+        # in insertion order)
+        self._string_samples: Dict[str, Dict[str, None]] = {}
+        self._fuzzy_sample_size = settings.fuzzy_sample_size
+        self._fuzzy_pairs_by_column: Optional[Dict[str, int]] = None
+
+        # Record linkage over key-like columns (created on the first chunk)
+        self._record_linkage = settings.record_linkage_enabled
+        self._linker: Optional[RecordLinker] = None
 
-        # Fuzzy duplicates (per-column, via samples)
-        self._string_samples: Dict[str, List[str]] = {}
-        self._fuzzy_duplicate_pairs: int = 0
+    def _new_seen_set(self, share: int) -> SeenSet:
+        """
+        Create a seen-set holding an equal share of the memory budget, or a
+        fixed-size Bloom filter in approximate mode.
+        """
+        if self._approximate:
+            return BloomSeenSet(
+                capacity=settings.duplicate_bloom_capacity,
+                false_positive_rate=settings.duplicate_bloom_fpr,
+            )
+        return HashSeenSet(
+            memory_budget_bytes=max(self._memory_budget_bytes // share, 1),
+            spill_dir=settings.duplicate_spill_dir or None,
+        )
 
     def _candidate_key_columns(self, columns: List[str]) -> List[str]:
         """
@@ -43,86 +337,173 @@ class DuplicateDetector:
                 keys.append(name)
         return keys
 
-    def process_chunk(self, chunk: pd.DataFrame) -> None:
+    def process_chunk(self, chunk: pd.DataFrame, view: Optional[ChunkView] = None) -> None:
         """
-        Hash each row and count duplicates across chunks.
+        Hash the whole chunk at once and count duplicates across chunks.
 
         Also tracks key-based and fuzzy duplicate signals using bounded
         per-column samples to preserve memory characteristics.
         """
+        if view is None:
+            view = ChunkView(chunk)
         self._total_rows += len(chunk)
+        key_cols = self._candidate_key_columns(list(chunk.columns))
 
         # Exact row duplicates
-        for _, row in chunk.iterrows():
-            row_str = "||".join(row.astype(str).tolist())
-            digest = hashlib.sha256(row_str.encode("utf-8")).hexdigest()
-            if digest in self._seen_hashes:
-                self._duplicate_count += 1
-            else:
-                self._seen_hashes.add(digest)
+        if self._seen_hashes is None:
+            self._seen_hashes = self._new_seen_set(len(key_cols) + 1)
+        self._seen_hashes.add(hash_rows(chunk))
 
         # Key-based duplicates
-        key_cols = self._candidate_key_columns(list(chunk.columns))
         for col in key_cols:
-            values = chunk[col].astype(str)
-            seen = self._key_seen.setdefault(col, set())
-            dup_count = self._key_duplicate_counts.get(col, 0)
-            for v in values:
-                if v in seen:
-                    dup_count += 1
-                else:
-                    seen.add(v)
-            self._key_duplicate_counts[col] = dup_count
-
-        # Fuzzy duplicates: collect a small sample of unique values per text column
+            seen = self._key_seen.get(col)
+            if seen is None:
+                seen = self._key_seen[col] = self._new_seen_set(len(key_cols) + 1)
+            seen.add(hash_values(chunk[col]))
+
+        # Record linkage
+        if self._record_linkage and key_cols:
+            if self._linker is None:
+                self._linker = RecordLinker(
+                    key_columns=key_cols,
+                    max_rows=settings.record_linkage_max_rows,
+                    window=settings.record_linkage_window,
+                    threshold=settings.record_linkage_threshold,
+                    sample_pairs=settings.record_linkage_sample_pairs,
+                )
+            self._linker.process_chunk(chunk)
+
+        # Fuzzy duplicates: collect a bounded sample of distinct values per column
+        cap = self._fuzzy_sample_size
         for col in chunk.columns:
-            series = chunk[col].astype(str)
-            samples = self._string_samples.setdefault(col, [])
-            if len(samples) >= 300:  # cap to keep pairwise comparisons manageable
+            samples = self._string_samples.setdefault(col, {})
+            if len(samples) >= cap:
                 continue
-            # add new unique values up to the cap
-            unique_vals = series.dropna().unique().tolist()
-            for val in unique_vals:
-                if len(samples) >= 300:
+            for val in view.unique_strings(col).tolist():
+                if len(samples) >= cap:
                     break
-                if val not in samples:
-                    samples.append(val)
+                if val:
+                    samples.setdefault(val)
+        self._fuzzy_pairs_by_column = None
 
-    def _compute_fuzzy_duplicates(self) -> int:
+    def merge(self, other: "DuplicateDetector") -> None:
         """
-        Compute fuzzy duplicate pairs per column using a simple similarity
-        measure on a bounded sample of strings.
+        Combine with a detector that processed later chunks of the same file.
+
+        Exact and key-based counts stay exact because they are derived from
+        the union of the seen-sets. ``other`` must not be used afterwards.
         """
-        if self._fuzzy_duplicate_pairs:
-            return self._fuzzy_duplicate_pairs
+        self._total_rows += other._total_rows
+
+        if self._seen_hashes is None:
+            self._seen_hashes = other._seen_hashes
+        elif other._seen_hashes is not None:
+            self._seen_hashes.merge(other._seen_hashes)
+
+        for col, other_seen in other._key_seen.items():
+            seen = self._key_seen.get(col)
+            if seen is None:
+                self._key_seen[col] = other_seen
+            else:
+                seen.merge(other_seen)
+
+        cap = self._fuzzy_sample_size
+        for col, other_samples in other._string_samples.items():
+            samples = self._string_samples.setdefault(col, {})
+            for val in other_samples:
+                if len(samples) >= cap:
+                    break
+                samples.setdefault(val)
+        self._fuzzy_pairs_by_column = None
 
-        threshold = 0.9
-        total_pairs = 0
-        for samples in self._string_samples.values():
-            n = len(samples)
-            if n <= 1:
+        if self._linker is None:
+            self._linker = other._linker
+        elif other._linker is not None:
+            self._linker.merge(other._linker)
+
+    def _compute_fuzzy_duplicates(self) -> Dict[str, int]:
+        """
+        Count near-duplicate value pairs per column.
+
+        Candidate pairs come from MinHash-LSH buckets and are kept when their
+        estimated Jaccard similarity of character bigrams reaches
+        ``fuzzy_similarity_threshold``.
+        """
+        if self._fuzzy_pairs_by_column is not None:
+            return self._fuzzy_pairs_by_column
+
+        hasher = MinHasher()
+        threshold = settings.fuzzy_similarity_threshold
+        pairs_by_column: Dict[str, int] = {}
+        for col, samples in self._string_samples.items():
+            if len(samples) <= 1:
+                pairs_by_column[col] = 0
                 continue
-            # naive O(n^2) pairwise comparison, but n is capped to 300
-            for i in range(n):
-                for j in range(i + 1, n):
-                    s1, s2 = samples[i], samples[j]
-                    if not s1 or not s2:
-                        continue
-                    ratio = SequenceMatcher(a=s1.lower(), b=s2.lower()).ratio()
-                    if ratio >= threshold:
-                        total_pairs += 1
-        self._fuzzy_duplicate_pairs = total_pairs
-        return total_pairs
+            signatures = hasher.signatures(list(samples))
+            left, right = hasher.candidate_pairs(signatures)
+            similar = hasher.similarity(signatures, left, right) >= threshold
+            pairs_by_column[col] = int(np.count_nonzero(similar))
+        self._fuzzy_pairs_by_column = pairs_by_column
+        return pairs_by_column
 
     def get_stats(self) -> Dict[str, float | int]:
+        # Every row after the first occurrence of its hash is a duplicate.
+        duplicate_count = 0
+        if self._seen_hashes is not None:
+            duplicate_count = (
+                self._seen_hashes.total_count - self._seen_hashes.distinct_count()
+            )
         duplicate_ratio = (
-            self._duplicate_count / self._total_rows if self._total_rows > 0 else 0.0
+            duplicate_count / self._total_rows if self._total_rows > 0 else 0.0
         )
-        fuzzy_pairs = self._compute_fuzzy_duplicates()
-        return {
-            "duplicate_count": self._duplicate_count,
+        key_duplicate_counts = {
+            col: seen.total_count - seen.distinct_count()
+            for col, seen in self._key_seen.items()
+        }
+        fuzzy_pairs_by_column = self._compute_fuzzy_duplicates()
+        stats: Dict[str, float | int] = {
+            "duplicate_count": duplicate_count,
             "duplicate_ratio": float(duplicate_ratio),
-            "key_duplicate_counts": self._key_duplicate_counts,
-            "fuzzy_duplicate_pairs": fuzzy_pairs,
+            "key_duplicate_counts": key_duplicate_counts,
+            "fuzzy_duplicate_pairs": sum(fuzzy_pairs_by_column.values()),
+            "fuzzy_duplicate_pairs_by_column": fuzzy_pairs_by_column,
+            "is_approximate": self._approximate,
+            "false_positive_rate": 0.0,
+            "duplicate_expected_error": 0.0,
+            "duplicate_error_bound": 0.0,
+            "key_duplicate_expected_errors": {},
+            "key_duplicate_error_bounds": {},
         }
+        if self._linker is not None:
+            stats["record_linkage"] = self._linker.find_matches()
+        if self._approximate and isinstance(self._seen_hashes, BloomSeenSet):
+            # Bloom false positives only inflate duplicate counts. The ratio is
+            # over-estimated by the expected error on average and by no more
+            # than the error bound with 95% confidence.
+            total = max(self._total_rows, 1)
+            stats["false_positive_rate"] = self._seen_hashes.false_positive_rate()
+            stats["duplicate_expected_error"] = (
+                self._seen_hashes.expected_false_positives() / total
+            )
+            stats["duplicate_error_bound"] = self._seen_hashes.false_positive_bound() / total
+            stats["key_duplicate_expected_errors"] = {
+                col: seen.expected_false_positives() / total
+                for col, seen in self._key_seen.items()
+                if isinstance(seen, BloomSeenSet)
+            }
+            stats["key_duplicate_error_bounds"] = {
+                col: seen.false_positive_bound() / total
+                for col, seen in self._key_seen.items()
+                if isinstance(seen, BloomSeenSet)
+            }
+        return stats
+
+    def close(self) -> None:
+        """
+        Release any disk space used by spilled seen-sets.
+        """
+        if self._seen_hashes is not None:
+            self._seen_hashes.close()
+        for seen in self._key_seen.values():
+            seen.close()
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
+from app.ai_modules.chunk_view import ChunkView
 from app.ai_modules.common import infer_column_types
 
 
@@ -16,14 +17,24 @@ class InconsistencyDetector:
         # Track per-column original string samples for pattern checking
         self._string_samples: Dict[str, List[str]] = {}
 
-    def process_chunk(self, chunk: pd.DataFrame) -> None:
+    def process_chunk(self, chunk: pd.DataFrame, view: Optional[ChunkView] = None) -> None:
+        if view is None:
+            view = ChunkView(chunk)
         for col in chunk.columns:
-            series = chunk[col].astype(str)
             samples = self._string_samples.setdefault(col, [])
-            if len(samples) < 5_000:
-                non_null = series[series.notna() & (series != "")]
-                remaining = 5_000 - len(samples)
-                samples.extend(non_null.head(remaining).tolist())
+            if len(samples) < 1_000:
+                remaining = 1_000 - len(samples)
+                samples.extend(view.non_empty_strings(col).head(remaining).tolist())
+
+    def merge(self, other: "InconsistencyDetector") -> None:
+        """
+        Combine with a detector that processed later chunks of the same file.
+        """
+        for col, other_samples in other._string_samples.items():
+            samples = self._string_samples.setdefault(col, [])
+            remaining = 1_000 - len(samples)
+            if remaining > 0:
+                samples.extend(other_samples[:remaining])
 
     def evaluate(self, profiles: Dict[str, dict]) -> Dict[str, List[str]]:
         """
@@ -45,7 +56,7 @@ class InconsistencyDetector:
                 col_issues.append("High cardinality categorical values (entropy explosion).")
 
             # Date format inconsistencies (heuristic)
-            samples = self._string_samples.get(col, [])[:1000]
+            samples = self._string_samples.get(col, [])
             if samples:
                 dt = pd.to_datetime(samples, errors="coerce", infer_datetime_format=True)
                 parse_rate = dt.notna().mean()
@@ -58,24 +69,14 @@ class InconsistencyDetector:
                 if lengths.std() > 10 and inferred_type == "categorical":
                     col_issues.append("Inconsistent text patterns detected in categorical data.")
 
-            # Categorical rare-value anomalies: values appearing only 1-2 times.
-            # We look at the frequency distribution over our sampled strings and flag
-            # columns where a significant proportion of values are extremely rare.
-            if inferred_type == "categorical":
-                cat_samples = self._string_samples.get(col, [])[:5000]
-                if cat_samples:
-                    value_counts = pd.Series(cat_samples).value_counts()
-                    rare_mask = value_counts <= 2
-                    rare_count = int(value_counts[rare_mask].sum())
-                    total_count = int(value_counts.sum())
-                    if total_count > 0:
-                        rare_ratio = rare_count / total_count
-                        # Heuristic: if more than 20% of occurrences are from very rare values,
-                        # treat this as a potential categorical anomaly.
-                        if rare_ratio > 0.2:
-                            col_issues.append(
-                                "Rare categorical values detected (values appearing only 1-2 times)."
-                            )
+            # Categorical rare-value anomalies: the profiler's share of rows in
+            # values appearing only 1-2 times per 5,000 rows. Heuristic: if more
+            # than 20% of occurrences are from very rare values, treat this as a
+            # potential categorical anomaly.
+            if inferred_type == "categorical" and metrics.get("rare_value_ratio", 0.0) > 0.2:
+                col_issues.append(
+                    "Rare categorical values detected (values appearing only 1-2 times per 5,000 rows)."
+                )
 
             if col_issues:
                 issues[col] = col_issues
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class MinHasher:
+    """
+    Character n-gram MinHash signatures with LSH banding.
+
+    Each string is shingled into lower-cased character n-grams, the shingles
+    are hashed to 64 bits and every signature slot keeps the minimum of a
+    multiply-shift hash ``(a * x + b) >> 32`` over the shingles. The fraction
+    of equal slots between two signatures is an unbiased estimate of the
+    Jaccard similarity of their n-gram sets.
+
+    Candidate pairs are found by LSH banding: signatures are cut into
+    ``bands`` bands of ``num_perm // bands`` rows and only strings sharing at
+    least one band are compared, which keeps the work near-linear in the
+    number of strings. Pairs with similarity ``s`` become candidates with
+    probability ``1 - (1 - s**rows) ** bands``.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        ngram: int = 2,
+        seed: int = 42,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, value: str) -> list[str]:
+        value = value.lower()
+        if len(value) <= self.ngram:
+            return [value]
+        return [value[i:i + self.ngram] for i in range(len(value) - self.ngram + 1)]
+
+    def signatures(self, values: Sequence[str], max_shingles: int = 65_536) -> np.ndarray:
+        """
+        Compute MinHash signatures, one row of ``num_perm`` uint32 per value.
+
+        Values are processed in batches of roughly ``max_shingles`` n-grams to
+        bound the size of the intermediate hash matrix.
+        """
+        result = np.empty((len(values), self.num_perm), dtype=np.uint32)
+        shingles: list[str] = []
+        counts: list[int] = []
+        batch_start = 0
+        for idx, value in enumerate(values):
+            grams = self._shingles(value)
+            shingles.extend(grams)
+            counts.append(len(grams))
+            if len(shingles) >= max_shingles or idx == len(values) - 1:
+                result[batch_start:idx + 1] = self._min_hashes(shingles, counts)
+                shingles, counts = [], []
+                batch_start = idx + 1
+        return result
+
+    def _min_hashes(self, shingles: list[str], counts: list[int]) -> np.ndarray:
+        hashed = pd.util.hash_array(np.array(shingles, dtype=object))
+        # Multiply-shift hashing relies on uint64 wrap-around.
+        with np.errstate(over="ignore"):
+            permuted = (hashed[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return np.minimum.reduceat(permuted, offsets, axis=0).astype(np.uint32)
+
+    def candidate_pairs(
+        self,
+        signatures: np.ndarray,
+        max_bucket: int = 64,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return index arrays ``(i, j)`` with ``i < j`` of strings that share at
+        least one LSH band.
+
+        Buckets larger than ``max_bucket`` are scanned with a sliding window
+        of that size instead of all pairs, bounding the work per band to
+        O(n * max_bucket).
+        """
+        n = signatures.shape[0]
+        if n < 2:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        weights = np.uint64(0x9E3779B97F4A7C15) ** np.arange(self.rows, dtype=np.uint64)
+        pair_ids = []
+        for band in range(self.bands):
+            rows = signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            with np.errstate(over="ignore"):
+                keys = (rows * weights).sum(axis=1, dtype=np.uint64)
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            for dist in range(1, min(max_bucket, n)):
+                same = sorted_keys[:-dist] == sorted_keys[dist:]
+                if not same.any():
+                    break
+                left = order[:-dist][same]
+                right = order[dist:][same]
+                lo = np.minimum(left, right).astype(np.uint64)
+                hi = np.maximum(left, right).astype(np.uint64)
+                pair_ids.append(lo * np.uint64(n) + hi)
+
+        if not pair_ids:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        unique_ids = np.unique(np.concatenate(pair_ids))
+        return (
+            (unique_ids // np.uint64(n)).astype(np.int64),
+            (unique_ids % np.uint64(n)).astype(np.int64),
+        )
+
+    @staticmethod
+    def similarity(
+        signatures: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        batch_size: int = 100_000,
+    ) -> np.ndarray:
+        """
+        Estimated Jaccard similarity for each ``(left[k], right[k])`` pair.
+        """
+        result = np.empty(left.size, dtype=np.float64)
+        for start in range(0, left.size, batch_size):
+            stop = start + batch_size
+            result[start:stop] = (
+                signatures[left[start:stop]] == signatures[right[start:stop]]
+            ).mean(axis=1)
+        return result
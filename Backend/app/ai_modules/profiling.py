@@ -1,20 +1,59 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-from app.ai_modules.common import detect_mixed_types, infer_column_types
+from app.ai_modules.chunk_view import ChunkView
+from app.ai_modules.common import (
+    ReservoirSampler,
+    detect_mixed_types,
+    hash_values,
+    infer_column_types,
+)
+from app.ai_modules.sketches import CountMinSketch, HyperLogLog, KLLSketch, MisraGries
+
+
+SAMPLE_SIZE = 10_000
+# Values seen at most RARE_VALUE_MAX_COUNT times per RARE_VALUE_PER_ROWS
+# rows count as rare in ``rare_value_ratio``.
+RARE_VALUE_MAX_COUNT = 2
+RARE_VALUE_PER_ROWS = 5_000
+
+
+def _sample_dtype(dtype: object) -> np.dtype:
+    """
+    Buffer dtype for the sampled values of a column: numeric, boolean and
+    date/time values are stored natively, everything else as objects.
+    """
+    if not isinstance(dtype, np.dtype):
+        # Nullable extension dtypes (e.g. Int64) once their nulls are removed.
+        dtype = getattr(dtype, "numpy_dtype", np.dtype(object))
+    return dtype if dtype.kind in "biufM" else np.dtype(object)
+
+
+def _common_dtype(first: np.dtype, second: np.dtype) -> np.dtype:
+    """
+    Buffer dtype holding the samples of two chunks (or worksheets) whose
+    values were stored as different dtypes.
+    """
+    if first.kind in "iuf" and second.kind in "iuf":
+        return np.promote_types(first, second)
+    return np.dtype(object)
 
 
 class ColumnProfiler:
     """
     Incremental column profiler operating on DataFrame chunks.
 
-    For memory safety on very large datasets, this profiler keeps at most
-    10,000 sample values per column for approximate statistics such as
-    median and standard deviation.
+    For memory safety on very large datasets, this profiler keeps a uniform
+    sample of at most 10,000 non-null values per column, drawn over the
+    whole file, for approximate statistics such as mode and skewness.
+    Median and quartiles come from a KLL sketch of every numeric value,
+    distinct counts from a HyperLogLog sketch of every value, and top
+    values and entropy from heavy-hitter and count-min sketches of every
+    value. Rare values are measured on the sample.
 
     Phase 1 enhancements add:
     - Rich numeric distribution statistics (variance, skewness, kurtosis,
@@ -27,63 +66,142 @@ class ColumnProfiler:
         # Per-column aggregation
         self._counts: Dict[str, int] = {}
         self._missing_counts: Dict[str, int] = {}
-        self._unique_values: Dict[str, set] = {}
+        self._distinct: Dict[str, HyperLogLog] = {}
+        self._heavy_hitters: Dict[str, MisraGries] = {}
+        self._frequencies: Dict[str, CountMinSketch] = {}
 
         # Numeric statistics
         self._numeric_sum: Dict[str, float] = {}
         self._numeric_sumsq: Dict[str, float] = {}
         self._numeric_min: Dict[str, float] = {}
         self._numeric_max: Dict[str, float] = {}
+        self._quantiles: Dict[str, KLLSketch] = {}
 
         # Samples for median/std and type inference
-        self._samples: Dict[str, List[object]] = {}
+        self._samples: Dict[str, ReservoirSampler] = {}
 
-    def process_chunk(self, chunk: pd.DataFrame) -> None:
+    def process_chunk(self, chunk: pd.DataFrame, view: Optional[ChunkView] = None) -> None:
         """
         Update statistics from a single chunk.
+
+        ``view`` holds the chunk's decoded columns when the caller shares it
+        with other detectors; otherwise one is built here.
         """
+        if view is None:
+            view = ChunkView(chunk)
         for col in chunk.columns:
             series = chunk[col]
             total = len(series)
-            missing = series.isna().sum() + (series == "").sum()
+            # Parquet footer statistics answer some questions without
+            # looking at the values.
+            stats = view.footer_stats.get(col)
+            if stats is not None and stats.null_count == stats.num_rows:
+                self._counts[col] = self._counts.get(col, 0) + total
+                self._missing_counts[col] = self._missing_counts.get(col, 0) + total
+                continue
+            if stats is not None and stats.null_count == 0 and not view.is_text(col):
+                nulls = None
+                missing = 0
+            else:
+                nulls = view.null_mask(col)
+                missing = int(nulls.sum())
+                if view.is_text(col):
+                    missing += int((series == "").sum())
 
             self._counts[col] = self._counts.get(col, 0) + total
-            self._missing_counts[col] = self._missing_counts.get(col, 0) + int(missing)
-
-            # Unique tracking (cap set size to avoid memory explosion)
-            uniq_set = self._unique_values.setdefault(col, set())
-            if len(uniq_set) < 50_000:
-                uniq_set.update(series.dropna().astype(str).unique().tolist())
-
-            # Sample collection (cap per-column to 10,000 rows to bound memory)
-            col_samples = self._samples.setdefault(col, [])
-            if len(col_samples) < 10_000:
-                non_null_sample = series.dropna().tolist()
-                remaining_capacity = 10_000 - len(col_samples)
-                col_samples.extend(non_null_sample[:remaining_capacity])
+            self._missing_counts[col] = self._missing_counts.get(col, 0) + missing
+
+            # Distinct values and value frequencies, in fixed-size sketches
+            counts = view.string_counts(col)
+            hashes = hash_values(pd.Series(counts.index, dtype=object))
+            self._distinct.setdefault(col, HyperLogLog()).update(hashes)
+            self._frequencies.setdefault(col, CountMinSketch()).update(hashes, counts.to_numpy())
+            self._heavy_hitters.setdefault(col, MisraGries()).update(counts)
+
+            # Sample collection (10,000 values per column to bound memory)
+            non_null = series if nulls is None else series[~nulls]
+            dtype = _sample_dtype(non_null.dtype)
+            col_samples = self._samples.get(col)
+            if col_samples is None:
+                col_samples = ReservoirSampler(SAMPLE_SIZE, dtype=dtype)
+                self._samples[col] = col_samples
+            elif col_samples.dtype != dtype:
+                col_samples.cast(_common_dtype(col_samples.dtype, dtype))
+            col_samples.add(non_null.to_numpy(dtype=col_samples.dtype))
 
             # Numeric stats
-            numeric_series = pd.to_numeric(series, errors="coerce")
-            numeric_non_null = numeric_series.dropna()
-            if not numeric_non_null.empty:
+            numeric = view.numeric(col)
+            numeric_non_null = numeric[~np.isnan(numeric)]
+            if numeric_non_null.size:
                 s = numeric_non_null.sum()
-                sq = (numeric_non_null ** 2).sum()
-                mn = numeric_non_null.min()
-                mx = numeric_non_null.max()
-
+                sq = np.dot(numeric_non_null, numeric_non_null)
+                if stats is not None and stats.min is not None:
+                    # Row group bounds: every row of the group is profiled
+                    # in some chunk, so the overall bounds are the same.
+                    mn, mx = stats.min, stats.max
+                else:
+                    mn = numeric_non_null.min()
+                    mx = numeric_non_null.max()
+
+                self._quantiles.setdefault(col, KLLSketch()).update(numeric_non_null)
                 self._numeric_sum[col] = self._numeric_sum.get(col, 0.0) + float(s)
                 self._numeric_sumsq[col] = self._numeric_sumsq.get(col, 0.0) + float(sq)
                 self._numeric_min[col] = (
-                    mn
+                    float(mn)
                     if col not in self._numeric_min
                     else float(min(self._numeric_min[col], mn))
                 )
                 self._numeric_max[col] = (
-                    mx
+                    float(mx)
                     if col not in self._numeric_max
                     else float(max(self._numeric_max[col], mx))
                 )
 
+    def merge(self, other: "ColumnProfiler") -> None:
+        """
+        Combine with a profiler that processed later chunks of the same file.
+        """
+        for col, count in other._counts.items():
+            self._counts[col] = self._counts.get(col, 0) + count
+            self._missing_counts[col] = self._missing_counts.get(
+                col, 0
+            ) + other._missing_counts.get(col, 0)
+
+            if col in other._distinct:
+                self._distinct.setdefault(col, HyperLogLog()).merge(other._distinct[col])
+                self._frequencies.setdefault(col, CountMinSketch()).merge(other._frequencies[col])
+                self._heavy_hitters.setdefault(col, MisraGries()).merge(other._heavy_hitters[col])
+
+            other_samples = other._samples.get(col)
+            col_samples = self._samples.get(col)
+            if other_samples is None:
+                pass
+            elif col_samples is None:
+                self._samples[col] = other_samples
+            else:
+                if col_samples.dtype != other_samples.dtype:
+                    dtype = _common_dtype(col_samples.dtype, other_samples.dtype)
+                    col_samples.cast(dtype)
+                    other_samples.cast(dtype)
+                col_samples.merge(other_samples)
+
+        for col, s in other._numeric_sum.items():
+            sq = other._numeric_sumsq[col]
+            self._numeric_sum[col] = self._numeric_sum.get(col, 0.0) + s
+            self._numeric_sumsq[col] = self._numeric_sumsq.get(col, 0.0) + sq
+            mn = other._numeric_min[col]
+            mx = other._numeric_max[col]
+            self._numeric_min[col] = (
+                mn if col not in self._numeric_min else float(min(self._numeric_min[col], mn))
+            )
+            self._numeric_max[col] = (
+                mx if col not in self._numeric_max else float(max(self._numeric_max[col], mx))
+            )
+            if col in self._quantiles:
+                self._quantiles[col].merge(other._quantiles[col])
+            else:
+                self._quantiles[col] = other._quantiles[col]
+
     def _infer_distribution_type(self, numeric_sample: pd.Series) -> str:
         """
         Heuristic distribution type classification based on skewness and kurtosis.
@@ -104,33 +222,75 @@ class ColumnProfiler:
             return "heavy_tailed"
         return "non_normal"
 
-    def _compute_categorical_stats(self, sample_series: pd.Series) -> Dict[str, object]:
+    def _compute_categorical_stats(
+        self,
+        col: str,
+        sample_series: pd.Series,
+        unique_count: int,
+    ) -> Dict[str, object]:
         """
-        Compute categorical intelligence metrics from a sample.
+        Compute categorical intelligence metrics over every value.
+
+        The heavy-hitter summary holds every frequent value, so their
+        count-min frequencies give the top values. Entropy adds the heavy
+        hitters' terms to those of the remaining mass spread evenly over
+        the other distinct values. Rare categories are listed from the
+        sample, as there can be arbitrarily many.
+
+        ``rare_value_ratio`` is the share of sampled rows whose value occurs
+        at most ``RARE_VALUE_MAX_COUNT`` times per ``RARE_VALUE_PER_ROWS``
+        rows of the uniform sample. A count rather than a share of the
+        rows keeps an evenly spread column with many categories (each
+        below the rare threshold) from counting as rare.
+
+        The ratio comes from the sample rather than the sketches: a value
+        is rare at 0.04% of the rows, while the heavy-hitter summary only
+        keeps values above 1/65 of the rows and count-min counts can be
+        off by 1/750 of the rows. The sample is drawn uniformly over the
+        whole file, so the ratio is an unbiased estimate of the full-data
+        share.
         """
-        if sample_series.empty:
+        rare_threshold = 0.02
+        heavy_hitters = self._heavy_hitters.get(col)
+        if heavy_hitters is None or not heavy_hitters.n:
             return {
+                "top_values": {},
                 "cardinality": 0,
                 "entropy": 0.0,
                 "rare_categories": [],
-                "rare_threshold": 0.02,
+                "rare_threshold": rare_threshold,
+                "rare_value_ratio": 0.0,
             }
 
-        value_counts = sample_series.value_counts()
-        total = float(value_counts.sum())
-        probs = value_counts / total
+        total = heavy_hitters.n
+        values = heavy_hitters.candidates()
+        hashes = hash_values(pd.Series(values, dtype=object))
+        estimates = np.minimum(self._frequencies[col].estimate(hashes), total)
+        frequent = pd.Series(estimates, index=values).sort_values(ascending=False, kind="stable")
+        probs = frequent / float(total)
+
         # Shannon entropy in bits
         entropy = float(-(probs * np.log2(probs)).sum())
-
-        rare_threshold = 0.02
-        rare_mask = probs < rare_threshold
-        rare_categories = value_counts[rare_mask].index.tolist()
+        tail = max(0.0, 1.0 - float(probs.sum()))
+        tail_values = max(unique_count - len(probs), 1)
+        if tail > 0:
+            entropy -= tail * np.log2(tail / tail_values)
+
+        sample_counts = sample_series.value_counts()
+        sample_probs = sample_counts / max(len(sample_series), 1)
+        max_count = max(
+            RARE_VALUE_MAX_COUNT,
+            RARE_VALUE_MAX_COUNT * len(sample_series) / RARE_VALUE_PER_ROWS,
+        )
+        rare_rows = int(sample_counts[sample_counts <= max_count].sum())
 
         return {
-            "cardinality": int(len(value_counts)),
+            "top_values": {key: int(count) for key, count in frequent.head(5).items()},
+            "cardinality": unique_count,
             "entropy": entropy,
-            "rare_categories": rare_categories,
+            "rare_categories": sample_probs[sample_probs < rare_threshold].index.tolist(),
             "rare_threshold": rare_threshold,
+            "rare_value_ratio": rare_rows / len(sample_series) if len(sample_series) else 0.0,
         }
 
     def build_profiles(self) -> Tuple[Dict[str, dict], int]:
@@ -142,14 +302,18 @@ class ColumnProfiler:
 
         for col, count in self._counts.items():
             missing = self._missing_counts.get(col, 0)
-            uniq_values = self._unique_values.get(col, set())
-            unique_count = len(uniq_values)
+            distinct = self._distinct.get(col)
+            # The estimate can overshoot the number of rows.
+            unique_count = min(distinct.count(), count) if distinct else 0
 
             missing_pct = (missing / count) * 100 if count > 0 else 0.0
             unique_ratio = (unique_count / count) if count > 0 else 0.0
 
-            samples = self._samples.get(col, [])
-            sample_series = pd.Series(samples) if samples else pd.Series([], dtype=object)
+            samples = self._samples.get(col)
+            sample_series = (
+                pd.Series(samples.values) if samples is not None and len(samples)
+                else pd.Series([], dtype=object)
+            )
 
             col_type = infer_column_types(sample_series)
             mixed_types_flag = detect_mixed_types(sample_series)
@@ -180,29 +344,26 @@ class ColumnProfiler:
                 numeric_min = self._numeric_min[col]
                 numeric_max = self._numeric_max[col]
 
+                # Full-data quartiles, within the sketch's rank error.
+                q1, numeric_median, q3 = self._quantiles[col].quantiles([0.25, 0.5, 0.75])
+                iqr = float(q3 - q1)
+
                 numeric_sample = pd.to_numeric(sample_series, errors="coerce").dropna()
                 if not numeric_sample.empty:
-                    numeric_median = float(numeric_sample.median())
                     try:
                         numeric_mode_val = numeric_sample.mode().iloc[0]
                         numeric_mode = float(numeric_mode_val)
                     except Exception:
                         numeric_mode = None
 
-                    q1 = float(numeric_sample.quantile(0.25))
-                    q3 = float(numeric_sample.quantile(0.75))
-                    iqr = float(q3 - q1)
                     skewness = float(numeric_sample.skew())
                     kurtosis = float(numeric_sample.kurtosis())
                     distribution_type = self._infer_distribution_type(numeric_sample)
 
-            # Top 5 frequent values from samples
-            top_values = (
-                sample_series.value_counts().head(5).to_dict() if not sample_series.empty else {}
+            categorical_stats = self._compute_categorical_stats(
+                col, sample_series.astype(str), unique_count
             )
 
-            categorical_stats = self._compute_categorical_stats(sample_series.astype(str))
-
             profiles[col] = {
                 # Core metrics
                 "missing_percentage": float(missing_pct),
@@ -210,7 +371,7 @@ class ColumnProfiler:
                 "unique_count": unique_count,
                 "inferred_type": col_type,
                 "mixed_types": mixed_types_flag,
-                "top_values": top_values,
+                "top_values": categorical_stats["top_values"],
                 # Numeric distribution statistics
                 "mean": float(numeric_mean) if numeric_mean is not None else None,
                 "median": float(numeric_median) if numeric_median is not None else None,
@@ -230,6 +391,7 @@ class ColumnProfiler:
                 "entropy": categorical_stats["entropy"],
                 "rare_categories": categorical_stats["rare_categories"],
                 "rare_category_threshold": categorical_stats["rare_threshold"],
+                "rare_value_ratio": categorical_stats["rare_value_ratio"],
             }
 
         return profiles, total_rows
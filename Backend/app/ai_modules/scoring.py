@@ -43,6 +43,22 @@ def compute_reliability_score(
     # Duplicate penalty: duplicate_ratio (0-1) scaled to 0-100
     duplicate_ratio = float(duplicate_stats.get("duplicate_ratio", 0.0))
     duplicate_penalty = duplicate_ratio * 100
+    duplicate_summary = f"Duplicate ratio: {duplicate_ratio:.4f}"
+    if duplicate_stats.get("is_approximate"):
+        expected = float(duplicate_stats.get("duplicate_expected_error", 0.0))
+        error_bound = float(duplicate_stats.get("duplicate_error_bound", 0.0))
+        duplicate_summary += (
+            f" (approximate, over-estimated by {expected:.4f} on average"
+            f" and by at most {error_bound:.4f} with 95% confidence)"
+        )
+
+    linkage = duplicate_stats.get("record_linkage")
+    if linkage:
+        duplicate_summary += (
+            f"; near-duplicate records: {linkage.get('fuzzy_record_pairs', 0)} pairs"
+            f" involving {linkage.get('fuzzy_record_duplicates', 0)}"
+            f" of {linkage.get('linked_rows', 0)} linked rows"
+        )
 
     # Dimension scores (0-100, higher is better)
     completeness_score = max(0.0, 100.0 - missing_penalty)
@@ -90,7 +106,7 @@ def compute_reliability_score(
         "missing": f"Average missing percentage: {missing_penalty:.2f}%",
         "anomalies": f"Anomaly ratio: {anomaly_ratio:.4f}",
         "inconsistencies": f"Columns with issues: {cols_with_issues}/{total_cols}",
-        "duplicates": f"Duplicate ratio: {duplicate_ratio:.4f}",
+        "duplicates": duplicate_summary,
         "dimensions": dimension_scores,
     }
 
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import weakref
+from typing import List, Optional
+
+import numpy as np
+
+
+class HashSeenSet:
+    """
+    Exact set of 64-bit hashes with bounded memory.
+
+    Hashes are partitioned by their top bits and each partition is kept as a
+    sorted, de-duplicated numpy array (8 bytes per distinct value instead of
+    a Python object per value). New batches are buffered per partition and
+    merged once the buffer outgrows the sorted array, which keeps the
+    amortized cost at O(n log n).
+
+    When the in-memory size exceeds ``memory_budget_bytes`` every partition
+    is appended to its own file on disk (partitioned external hashing).
+    Distinct counting then loads one partition at a time, so peak memory is
+    the budget plus the largest partition regardless of input size.
+
+    Sets built over different parts of a stream can be combined with
+    :meth:`merge`. Pickling hands ownership of any spill files to the
+    unpickled copy, so a set can be returned from a worker process.
+    """
+
+    _COMPACT_MIN = 4_096
+
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        num_partitions: int = 256,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        if num_partitions < 1 or num_partitions & (num_partitions - 1):
+            raise ValueError("num_partitions must be a power of two")
+
+        self._memory_budget_bytes = memory_budget_bytes
+        self._num_partitions = num_partitions
+        self._spill_root = spill_dir or None
+
+        bits = num_partitions.bit_length() - 1
+        shift = np.uint64(64 - bits) if bits else np.uint64(0)
+        self._partition_starts = (
+            np.arange(num_partitions, dtype=np.uint64) << shift
+            if bits
+            else np.zeros(1, dtype=np.uint64)
+        )
+
+        self._sorted: List[np.ndarray] = [
+            np.empty(0, dtype=np.uint64) for _ in range(num_partitions)
+        ]
+        self._pending: List[List[np.ndarray]] = [[] for _ in range(num_partitions)]
+        self._pending_size: List[int] = [0] * num_partitions
+        self._in_memory: int = 0
+        self._total: int = 0
+
+        # Spill state, created lazily on the first spill.
+        self._spill_dir: Optional[str] = None
+        self._spilled_sizes: List[int] = [0] * num_partitions
+        self._finalizer: Optional[weakref.finalize] = None
+
+    @property
+    def total_count(self) -> int:
+        """
+        Number of hashes added, including repeats.
+        """
+        return self._total
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._spill_dir is not None
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._in_memory * 8
+
+    def add(self, hashes: np.ndarray) -> None:
+        """
+        Add a batch of 64-bit hashes.
+        """
+        if hashes.size == 0:
+            return
+        self._total += int(hashes.size)
+
+        unique = np.unique(hashes.astype(np.uint64, copy=False))
+        bounds = np.searchsorted(unique, self._partition_starts)
+        bounds = np.append(bounds, unique.size)
+        for p in range(self._num_partitions):
+            lo, hi = bounds[p], bounds[p + 1]
+            if lo == hi:
+                continue
+            self._pending[p].append(unique[lo:hi].copy())
+            self._pending_size[p] += int(hi - lo)
+            self._in_memory += int(hi - lo)
+            if self._pending_size[p] >= max(self._sorted[p].size, self._COMPACT_MIN):
+                self._compact(p)
+
+        if (
+            self._memory_budget_bytes is not None
+            and self.memory_bytes > self._memory_budget_bytes
+        ):
+            self._spill()
+
+    def merge(self, other: "HashSeenSet") -> None:
+        """
+        Add every hash of ``other`` to this set. ``other`` is consumed.
+        """
+        if other._num_partitions != self._num_partitions:
+            raise ValueError("Cannot merge seen-sets with different partitioning")
+        self._total += other._total
+        for p in range(other._num_partitions):
+            parts = [other._sorted[p], *other._pending[p]]
+            if other._spilled_sizes[p]:
+                parts.append(np.fromfile(other._partition_path(p), dtype=np.uint64))
+            parts = [part for part in parts if part.size]
+            if not parts:
+                continue
+            merged = np.concatenate(parts)
+            self._pending[p].append(merged)
+            self._pending_size[p] += int(merged.size)
+            self._in_memory += int(merged.size)
+            self._compact(p)
+            if (
+                self._memory_budget_bytes is not None
+                and self.memory_bytes > self._memory_budget_bytes
+            ):
+                self._spill()
+        other.close()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if self._finalizer is not None:
+            # The unpickled copy becomes responsible for the spill files.
+            self._finalizer.detach()
+            self._finalizer = None
+        state["_finalizer"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self._spill_dir is not None:
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, self._spill_dir, True
+            )
+
+    def snapshot(self, directory: str) -> dict:
+        """
+        Return picklable state for a checkpoint without giving up ownership.
+
+        Spill files are copied into ``directory`` because this set keeps
+        appending to its own files after the snapshot is taken.
+        """
+        state = self.__dict__.copy()
+        state["_finalizer"] = None
+        state["_sorted"] = list(self._sorted)
+        state["_pending"] = [list(pending) for pending in self._pending]
+        state["_pending_size"] = list(self._pending_size)
+        state["_spilled_sizes"] = list(self._spilled_sizes)
+        if self._spill_dir is not None:
+            os.makedirs(directory, exist_ok=True)
+            for p, size in enumerate(self._spilled_sizes):
+                if size:
+                    shutil.copyfile(
+                        self._partition_path(p),
+                        os.path.join(directory, os.path.basename(self._partition_path(p))),
+                    )
+            state["_spill_dir"] = directory
+        return state
+
+    @classmethod
+    def restore(cls, state: dict) -> "HashSeenSet":
+        """
+        Rebuild a set from :meth:`snapshot` state. Spill files are copied to a
+        fresh spill directory so the checkpoint itself is never modified.
+        """
+        seen_set = cls.__new__(cls)
+        seen_set.__dict__.update(state)
+        if seen_set._spill_dir is not None:
+            source = seen_set._spill_dir
+            seen_set._spill_dir = tempfile.mkdtemp(prefix="seen_set_", dir=seen_set._spill_root)
+            seen_set._finalizer = weakref.finalize(
+                seen_set, shutil.rmtree, seen_set._spill_dir, True
+            )
+            for name in os.listdir(source):
+                shutil.copyfile(
+                    os.path.join(source, name), os.path.join(seen_set._spill_dir, name)
+                )
+        return seen_set
+
+    def distinct_count(self) -> int:
+        """
+        Exact number of distinct hashes added so far.
+        """
+        distinct = 0
+        for p in range(self._num_partitions):
+            if self._spilled_sizes[p]:
+                distinct += self._compact_on_disk(p)
+            else:
+                self._compact(p)
+                distinct += int(self._sorted[p].size)
+        return distinct
+
+    def close(self) -> None:
+        """
+        Remove any spill files. The set must not be used afterwards.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._spill_dir = None
+
+    def _compact(self, p: int) -> None:
+        if not self._pending[p]:
+            return
+        before = int(self._sorted[p].size) + self._pending_size[p]
+        merged = np.unique(np.concatenate([self._sorted[p], *self._pending[p]]))
+        self._sorted[p] = merged
+        self._pending[p] = []
+        self._pending_size[p] = 0
+        self._in_memory -= before - int(merged.size)
+
+    def _partition_path(self, p: int) -> str:
+        assert self._spill_dir is not None
+        return os.path.join(self._spill_dir, f"part-{p:05d}.u64")
+
+    def _spill(self) -> None:
+        """
+        Append every in-memory partition to its spill file and free it.
+        """
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="seen_set_", dir=self._spill_root)
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, self._spill_dir, True
+            )
+
+        for p in range(self._num_partitions):
+            self._compact(p)
+            part = self._sorted[p]
+            if part.size == 0:
+                continue
+            with open(self._partition_path(p), "ab") as handle:
+                part.tofile(handle)
+            self._spilled_sizes[p] += int(part.size)
+            self._sorted[p] = np.empty(0, dtype=np.uint64)
+        self._in_memory = 0
+
+    def _compact_on_disk(self, p: int) -> int:
+        """
+        De-duplicate a spilled partition together with its in-memory part and
+        rewrite it, so repeated counts only pay for new data.
+        """
+        path = self._partition_path(p)
+        on_disk = np.fromfile(path, dtype=np.uint64)
+        merged = np.unique(np.concatenate([on_disk, self._sorted[p], *self._pending[p]]))
+        merged.tofile(path)
+
+        self._in_memory -= int(self._sorted[p].size) + self._pending_size[p]
+        self._sorted[p] = np.empty(0, dtype=np.uint64)
+        self._pending[p] = []
+        self._pending_size[p] = 0
+        self._spilled_sizes[p] = int(merged.size)
+        return int(merged.size)
+
+
+# Number of set bits for every possible byte value, used to measure fill.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class BloomSeenSet:
+    """
+    Approximate set of 64-bit hashes backed by a Bloom filter.
+
+    The bit array is sized once from ``capacity`` and ``false_positive_rate``
+    and never grows, so memory is fixed up front regardless of row count.
+    Membership uses ``k`` bit positions derived from the two 32-bit halves
+    of each hash (double hashing), checked and set for a whole batch at once.
+
+    A false positive makes a new value look already seen, so duplicate
+    counts derived from this set can only be over-estimated; see
+    :meth:`expected_false_positives` and :meth:`false_positive_bound`.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0.0 < false_positive_rate < 1.0:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+
+        ln2 = np.log(2.0)
+        num_bits = int(np.ceil(-capacity * np.log(false_positive_rate) / ln2**2))
+        num_bits = max(64, (num_bits + 63) // 64 * 64)
+        self._num_bits = num_bits
+        self._num_hashes = max(1, int(round(num_bits / capacity * ln2)))
+        self._bits = np.zeros(num_bits // 8, dtype=np.uint8)
+        self._inserted: int = 0
+        self._total: int = 0
+        self._expected_false_positives: float = 0.0
+
+    @property
+    def total_count(self) -> int:
+        return self._total
+
+    @property
+    def memory_bytes(self) -> int:
+        return int(self._bits.nbytes)
+
+    def add(self, hashes: np.ndarray) -> None:
+        """
+        Add a batch of 64-bit hashes.
+        """
+        if hashes.size == 0:
+            return
+        self._total += int(hashes.size)
+
+        # Repeats inside the batch are exact; only new values hit the filter.
+        unique = np.unique(hashes.astype(np.uint64, copy=False))
+        positions = self._positions(unique)
+        byte_idx = positions >> np.uint64(3)
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+
+        present = np.all(self._bits[byte_idx] & masks, axis=1)
+        np.bitwise_or.at(self._bits, byte_idx.ravel(), masks.ravel())
+        inserted = int(np.count_nonzero(~present))
+        # The batch was checked against the filter as it was before it:
+        # truly new values collided with that state's false-positive rate.
+        fpr = self._expected_fill() ** self._num_hashes
+        if fpr < 1.0:
+            self._expected_false_positives += fpr * inserted / (1.0 - fpr)
+        self._inserted += inserted
+
+    def distinct_count(self) -> int:
+        """
+        Number of values the filter accepted as new (a lower bound on the
+        true distinct count).
+        """
+        return self._inserted
+
+    def merge(self, other: "BloomSeenSet") -> None:
+        """
+        Union with a filter of the same size built over another part of the
+        stream. The distinct count becomes an estimate from the bit fill.
+        """
+        if other._num_bits != self._num_bits or other._num_hashes != self._num_hashes:
+            raise ValueError("Cannot merge Bloom filters with different sizes")
+        self._bits |= other._bits
+        self._total += other._total
+        self._expected_false_positives += other._expected_false_positives
+        fill = int(_POPCOUNT[self._bits].sum(dtype=np.int64)) / self._num_bits
+        if fill >= 1.0:
+            self._inserted = self._inserted + other._inserted
+        else:
+            self._inserted = int(
+                round(-self._num_bits / self._num_hashes * np.log1p(-fill))
+            )
+
+    def false_positive_rate(self) -> float:
+        """
+        Current false-positive probability estimated from the bit fill ratio.
+        """
+        set_bits = int(_POPCOUNT[self._bits].sum(dtype=np.int64))
+        return float((set_bits / self._num_bits) ** self._num_hashes)
+
+    def _expected_fill(self) -> float:
+        # Fraction of bits set by the distinct values seen so far, counting
+        # the ones hidden by false positives.
+        distinct = self._inserted + self._expected_false_positives
+        return -np.expm1(-self._num_hashes * distinct / self._num_bits)
+
+    def expected_false_positives(self) -> float:
+        """
+        Expected number of new values wrongly reported as already seen,
+        accumulated batch by batch from the false-positive rate the filter
+        had when each batch was checked.
+        """
+        return min(self._expected_false_positives, float(self._total))
+
+    def false_positive_bound(self, confidence: float = 0.95) -> float:
+        """
+        Upper bound on the number of false positives that holds with the
+        given ``confidence`` (Bernstein's inequality for a sum of
+        independent Bernoulli trials with mean
+        :meth:`expected_false_positives`), capped at the values added.
+        """
+        mean = self.expected_false_positives()
+        log_term = np.log(1.0 / (1.0 - confidence))
+        slack = log_term / 3.0 + np.sqrt((log_term / 3.0) ** 2 + 2.0 * mean * log_term)
+        return float(min(mean + slack, self._total))
+
+    def close(self) -> None:
+        return None
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self._num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self._num_bits)
@@ -26,8 +26,69 @@ class Settings(BaseSettings):
     mongodb_db: str = Field(alias="MONGO_DB_NAME")
     file_storage_root: str = "data/uploads"
 
-    # CSV processing
+    # CSV processing ("pandas" or "arrow"; arrow needs pyarrow installed)
     csv_chunk_size: int = 100_000
+    csv_engine: str = "pandas"
+
+    # Audit worker processes (CPU-bound audit work runs outside the event loop)
+    audit_worker_processes: int = 2
+
+    # Parallel CSV parsing: CSV files of at least csv_parallel_min_mb are
+    # split into record-aligned byte ranges audited by this many processes
+    # each (1 disables; ranges are parsed with csv_engine)
+    csv_parallel_workers: int = 1
+    csv_parallel_min_mb: int = 64
+
+    # Audit job queue: audits running at once per instance, job lease length
+    # (renewed by heartbeats), queue poll interval and retries after a lost lease
+    max_concurrent_audits: int = 2
+    audit_job_lease_seconds: int = 60
+    audit_queue_poll_interval_seconds: float = 2.0
+    audit_job_max_attempts: int = 3
+
+    # Audit checkpoints: detector state is saved every N chunks so a retried
+    # audit resumes instead of starting over (0 disables; empty dir means
+    # next to the uploaded file)
+    audit_checkpoint_interval_chunks: int = 10
+    audit_checkpoint_dir: str = ""
+
+    # Schema inference: rows sampled from the head of a file and from this
+    # many points spread over it (uncompressed CSV only) to type columns
+    schema_sample_rows: int = 1_000
+    schema_sample_offsets: int = 16
+
+    # Read uncompressed CSV, Parquet and Arrow IPC files through memory maps
+    # so concurrent readers of a dataset share the OS page cache
+    memory_map_reads: bool = True
+
+    # Columnar copy: the first audit of a CSV file also writes a Parquet
+    # copy next to it, which later audits and visualizations read instead
+    columnar_cache_enabled: bool = True
+    columnar_cache_compression: str = "zstd"
+
+    # Duplicate detection: memory budget for exact seen-sets before they
+    # spill to disk (empty spill dir means the system temp directory)
+    duplicate_memory_budget_mb: int = 256
+    duplicate_spill_dir: str = ""
+
+    # Duplicate detection mode: "exact" or "approximate" (fixed-size Bloom
+    # filters sized from the expected distinct count and false-positive rate)
+    duplicate_mode: str = "exact"
+    duplicate_bloom_capacity: int = 10_000_000
+    duplicate_bloom_fpr: float = 0.01
+
+    # Fuzzy duplicates: distinct values sampled per column for MinHash-LSH
+    # and the n-gram Jaccard similarity at which two values count as a pair
+    fuzzy_sample_size: int = 20_000
+    fuzzy_similarity_threshold: float = 0.7
+
+    # Record linkage: fuzzy row matching on key-like columns with blocking
+    # keys; rows beyond the cap are not linked
+    record_linkage_enabled: bool = False
+    record_linkage_max_rows: int = 1_000_000
+    record_linkage_window: int = 10
+    record_linkage_threshold: float = 0.8
+    record_linkage_sample_pairs: int = 20
 
     # Scoring weights
     reliability_weight_missing: float = 1.0
@@ -61,6 +122,80 @@ class Settings(BaseSettings):
         return value
 
 
+    @field_validator("csv_engine")
+    @classmethod
+    def validate_csv_engine(cls, value: str) -> str:
+        """
+        Only the pandas and Arrow CSV readers are supported.
+        """
+        value = value.lower()
+        if value not in {"pandas", "arrow"}:
+            raise ValueError("csv_engine must be 'pandas' or 'arrow'")
+        return value
+
+    @field_validator("audit_worker_processes")
+    @classmethod
+    def validate_audit_worker_processes(cls, value: int) -> int:
+        """
+        At least one worker process is required to run audits.
+        """
+        if value < 1:
+            raise ValueError("audit_worker_processes must be at least 1")
+        return value
+
+    @field_validator("csv_parallel_workers", "csv_parallel_min_mb")
+    @classmethod
+    def validate_csv_parallel(cls, value: int) -> int:
+        """
+        Parallel parsing needs at least one worker and a positive size floor.
+        """
+        if value < 1:
+            raise ValueError("csv_parallel_workers and csv_parallel_min_mb must be at least 1")
+        return value
+
+    @field_validator("max_concurrent_audits", "audit_job_lease_seconds", "audit_job_max_attempts")
+    @classmethod
+    def validate_audit_queue_limits(cls, value: int) -> int:
+        """
+        Queue limits must allow at least one audit, attempt and lease second.
+        """
+        if value < 1:
+            raise ValueError("audit queue limits must be at least 1")
+        return value
+
+    @field_validator("columnar_cache_compression")
+    @classmethod
+    def validate_columnar_cache_compression(cls, value: str) -> str:
+        """
+        Only codecs every pyarrow build can write are accepted.
+        """
+        value = value.lower()
+        if value not in {"zstd", "snappy", "gzip", "none"}:
+            raise ValueError("columnar_cache_compression must be zstd, snappy, gzip or none")
+        return value
+
+    @field_validator("audit_checkpoint_interval_chunks")
+    @classmethod
+    def validate_audit_checkpoint_interval(cls, value: int) -> int:
+        """
+        A negative interval is meaningless; 0 turns checkpointing off.
+        """
+        if value < 0:
+            raise ValueError("audit_checkpoint_interval_chunks must be 0 or greater")
+        return value
+
+    @field_validator("duplicate_mode")
+    @classmethod
+    def validate_duplicate_mode(cls, value: str) -> str:
+        """
+        Only exact and approximate duplicate detection are supported.
+        """
+        value = value.lower()
+        if value not in {"exact", "approximate"}:
+            raise ValueError("duplicate_mode must be 'exact' or 'approximate'")
+        return value
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
@@ -2,6 +2,7 @@ from fastapi import Depends
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.database.mongo import get_database
+from app.repositories.audit_job_repository import AuditJobRepository
 from app.repositories.audit_report_repository import AuditReportRepository
 from app.repositories.column_profile_repository import ColumnProfileRepository
 from app.repositories.dataset_repository import DatasetRepository
@@ -29,6 +30,12 @@ def get_audit_report_repository(
     return AuditReportRepository(db)
 
 
+def get_audit_job_repository(
+    db: AsyncIOMotorDatabase = Depends(get_db),
+) -> AuditJobRepository:
+    return AuditJobRepository(db)
+
+
 def get_upload_service(
     dataset_repo: DatasetRepository = Depends(get_dataset_repository),
 ) -> UploadService:
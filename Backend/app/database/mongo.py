@@ -74,3 +74,5 @@ async def _create_indexes() -> None:
 
     await db["audit_reports"].create_index("dataset_id", unique=True)
 
+    await db["audit_jobs"].create_index([("status", 1), ("priority", -1), ("created_at", 1)])
+    await db["audit_jobs"].create_index([("dataset_id", 1), ("status", 1)])
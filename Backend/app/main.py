@@ -17,6 +17,8 @@ from app.core.config import settings
 from app.core.exceptions import register_exception_handlers
 from app.core.logging import setup_logging
 from app.database.mongo import close_mongo_connection, connect_to_mongo
+from app.services.audit_executor import shutdown_audit_executor
+from app.services.audit_scheduler import get_audit_scheduler
 from app.routers import datasets, visualization, telemetry, simple_upload
 
 
@@ -39,6 +41,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             # Perform indexing in background
             from app.database.mongo import _create_indexes
             await _create_indexes()
+            await get_audit_scheduler().start()
             logger.info("/// DATA_CLUSTER_SYNCHRONIZATION_COMPLETE")
         except Exception as e:
             logger.error(f"/// SYSTEM_DEGRADED: Database synchronization failed: {e}")
@@ -51,6 +54,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     finally:
         logger.info("/// INITIATING_SHUTDOWN_PROTOCOL")
         db_task.cancel()
+        await get_audit_scheduler().stop()
+        shutdown_audit_executor()
         try:
             await close_mongo_connection()
         except:
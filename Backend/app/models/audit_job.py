@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+
+
+@dataclass
+class AuditJob:
+    """
+    Domain model representing a queued or running audit job.
+    """
+
+    id: ObjectId
+    dataset_id: ObjectId
+    status: str
+    priority: int
+    created_at: datetime
+    attempts: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+    worker_id: Optional[str] = None
+    error_message: Optional[str] = None
@@ -23,4 +23,7 @@ class AuditReport:
     error_message: Optional[str] = None
     is_sampled: bool = False
     sample_size: int = 0
+    is_approximate: bool = False
+    duplicate_error_bound: float = 0.0
+    record_linkage: Optional[Dict[str, Any]] = None
 
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from bson import ObjectId
 
@@ -21,4 +21,7 @@ class Dataset:
     uploaded_at: datetime
     processed_at: Optional[datetime]
     name: Optional[str] = None
+    sheet_names: Optional[List[str]] = None
+    columnar_path: Optional[str] = None
+    column_schema: Optional[Dict[str, str]] = None
 
@@ -0,0 +1,195 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from app.models.audit_job import AuditJob
+
+
+ACTIVE_JOB_STATUSES = ["queued", "running"]
+
+
+class AuditJobRepository:
+    """
+    Repository for the durable audit job queue.
+
+    Jobs are claimed atomically with ``find_one_and_update`` and hold a lease
+    that the running worker renews with heartbeats. Jobs whose lease expires
+    (e.g. after a crash or restart) are put back in the queue.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self._collection = db["audit_jobs"]
+
+    async def enqueue(self, dataset_id: str, priority: int = 0) -> AuditJob:
+        """
+        Queue an audit for a dataset, reusing an already active job if any.
+        """
+        oid = ObjectId(dataset_id)
+        existing = await self._collection.find_one(
+            {"dataset_id": oid, "status": {"$in": ACTIVE_JOB_STATUSES}}
+        )
+        if existing:
+            return self._document_to_model(existing)
+
+        doc = {
+            "dataset_id": oid,
+            "status": "queued",
+            "priority": priority,
+            "attempts": 0,
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None,
+            "lease_expires_at": None,
+            "worker_id": None,
+            "error_message": None,
+        }
+        result = await self._collection.insert_one(doc)
+        doc["_id"] = result.inserted_id
+        return self._document_to_model(doc)
+
+    async def claim_next(self, worker_id: str, lease_seconds: int) -> Optional[AuditJob]:
+        """
+        Atomically take the highest-priority, oldest queued job.
+        """
+        now = datetime.utcnow()
+        doc = await self._collection.find_one_and_update(
+            {"status": "queued"},
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", -1), ("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            return None
+        return self._document_to_model(doc)
+
+    async def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """
+        Extend the lease of a running job. Returns False if the lease was lost.
+        """
+        result = await self._collection.update_one(
+            {"_id": ObjectId(job_id), "status": "running", "worker_id": worker_id},
+            {
+                "$set": {
+                    "lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)
+                }
+            },
+        )
+        return result.matched_count == 1
+
+    async def finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        """
+        Record the outcome of a running job. Returns False, leaving the job
+        untouched, if ``worker_id`` lost its lease (the job was re-queued
+        and possibly claimed by another worker).
+        """
+        result = await self._collection.update_one(
+            {"_id": ObjectId(job_id), "status": "running", "worker_id": worker_id},
+            {
+                "$set": {
+                    "status": status,
+                    "finished_at": datetime.utcnow(),
+                    "lease_expires_at": None,
+                    "error_message": error_message,
+                }
+            },
+        )
+        return result.matched_count == 1
+
+    async def cancel(self, job_id: str) -> Optional[AuditJob]:
+        """
+        Cancel a job that has not started yet. Returns None if it is not queued.
+        """
+        doc = await self._collection.find_one_and_update(
+            {"_id": ObjectId(job_id), "status": "queued"},
+            {"$set": {"status": "cancelled", "finished_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            return None
+        return self._document_to_model(doc)
+
+    async def requeue_expired(self, max_attempts: int) -> List[AuditJob]:
+        """
+        Return running jobs with an expired lease to the queue, or fail them
+        once they have used up ``max_attempts``.
+        """
+        now = datetime.utcnow()
+        cursor = self._collection.find(
+            {"status": "running", "lease_expires_at": {"$lt": now}}
+        )
+        recovered: List[AuditJob] = []
+        async for doc in cursor:
+            exhausted = doc.get("attempts", 0) >= max_attempts
+            update = (
+                {
+                    "status": "failed",
+                    "finished_at": now,
+                    "error_message": "Audit worker lost its lease too many times.",
+                }
+                if exhausted
+                else {"status": "queued", "worker_id": None}
+            )
+            update["lease_expires_at"] = None
+            result = await self._collection.update_one(
+                # Guard against a heartbeat renewing the lease meanwhile.
+                {"_id": doc["_id"], "status": "running", "lease_expires_at": {"$lt": now}},
+                {"$set": update},
+            )
+            if result.modified_count:
+                doc.update(update)
+                recovered.append(self._document_to_model(doc))
+        return recovered
+
+    async def has_active_job(self, dataset_id: str) -> bool:
+        doc = await self._collection.find_one(
+            {"dataset_id": ObjectId(dataset_id), "status": {"$in": ACTIVE_JOB_STATUSES}}
+        )
+        return doc is not None
+
+    async def get_by_id(self, job_id: str) -> Optional[AuditJob]:
+        doc = await self._collection.find_one({"_id": ObjectId(job_id)})
+        if not doc:
+            return None
+        return self._document_to_model(doc)
+
+    async def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[AuditJob]:
+        query = {"status": status} if status else {}
+        cursor = (
+            self._collection.find(query)
+            .sort([("priority", -1), ("created_at", 1)])
+            .limit(limit)
+        )
+        docs = await cursor.to_list(length=limit)
+        return [self._document_to_model(doc) for doc in docs]
+
+    def _document_to_model(self, doc: dict) -> AuditJob:
+        return AuditJob(
+            id=doc["_id"],
+            dataset_id=doc["dataset_id"],
+            status=doc["status"],
+            priority=doc.get("priority", 0),
+            created_at=doc["created_at"],
+            attempts=doc.get("attempts", 0),
+            started_at=doc.get("started_at"),
+            finished_at=doc.get("finished_at"),
+            lease_expires_at=doc.get("lease_expires_at"),
+            worker_id=doc.get("worker_id"),
+            error_message=doc.get("error_message"),
+        )
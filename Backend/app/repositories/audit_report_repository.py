@@ -28,6 +28,9 @@ class AuditReportRepository:
         error_message: Optional[str] = None,
         is_sampled: bool = False,
         sample_size: int = 0,
+        is_approximate: bool = False,
+        duplicate_error_bound: float = 0.0,
+        record_linkage: Optional[dict] = None,
     ) -> AuditReport:
         oid = ObjectId(dataset_id)
         now = datetime.utcnow()
@@ -43,6 +46,9 @@ class AuditReportRepository:
             "error_message": error_message,
             "is_sampled": is_sampled,
             "sample_size": sample_size,
+            "is_approximate": is_approximate,
+            "duplicate_error_bound": duplicate_error_bound,
+            "record_linkage": record_linkage,
         }
         await self._collection.update_one(
             {"dataset_id": oid},
@@ -73,5 +79,8 @@ class AuditReportRepository:
             error_message=doc.get("error_message"),
             is_sampled=doc.get("is_sampled", False),
             sample_size=doc.get("sample_size", 0),
+            is_approximate=doc.get("is_approximate", False),
+            duplicate_error_bound=doc.get("duplicate_error_bound", 0.0),
+            record_linkage=doc.get("record_linkage"),
         )
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -21,6 +21,7 @@ class DatasetRepository:
         file_size: int,
         storage_path: str,
         name: Optional[str] = None,
+        sheet_names: Optional[List[str]] = None,
     ) -> Dataset:
         now = datetime.utcnow()
         doc = {
@@ -33,6 +34,9 @@ class DatasetRepository:
             "status": "uploaded",
             "uploaded_at": now,
             "processed_at": None,
+            "sheet_names": sheet_names,
+            "columnar_path": None,
+            "column_schema": None,
         }
         result = await self._collection.insert_one(doc)
         doc["_id"] = result.inserted_id
@@ -68,11 +72,34 @@ class DatasetRepository:
             },
         )
 
+    async def update_metadata(self, dataset_id: str, rows: int, columns: int) -> None:
+        # Counts read at upload time; unlike update_stats the status is kept.
+        oid = ObjectId(dataset_id)
+        await self._collection.update_one(
+            {"_id": oid}, {"$set": {"rows": rows, "columns": columns}}
+        )
+
+    async def set_columnar_path(self, dataset_id: str, columnar_path: str) -> None:
+        oid = ObjectId(dataset_id)
+        await self._collection.update_one(
+            {"_id": oid}, {"$set": {"columnar_path": columnar_path}}
+        )
+
+    async def set_column_schema(self, dataset_id: str, column_schema: Dict[str, str]) -> None:
+        oid = ObjectId(dataset_id)
+        await self._collection.update_one(
+            {"_id": oid}, {"$set": {"column_schema": column_schema}}
+        )
+
     async def list_all(self, limit: int = 20) -> list[Dataset]:
         cursor = self._collection.find().sort("uploaded_at", -1).limit(limit)
         docs = await cursor.to_list(length=limit)
         return [self._document_to_model(doc) for doc in docs]
 
+    async def list_by_status(self, status: str) -> list[Dataset]:
+        cursor = self._collection.find({"status": status})
+        return [self._document_to_model(doc) async for doc in cursor]
+
     def _document_to_model(self, doc: dict) -> Dataset:
         return Dataset(
             id=doc["_id"],
@@ -85,5 +112,8 @@ class DatasetRepository:
             uploaded_at=doc["uploaded_at"],
             processed_at=doc.get("processed_at"),
             name=doc.get("name"),
+            sheet_names=doc.get("sheet_names"),
+            columnar_path=doc.get("columnar_path"),
+            column_schema=doc.get("column_schema"),
         )
 
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, UploadFile, status, Query
+from typing import Optional
+import zipfile
 
-from app.core.dependencies import get_audit_service, get_upload_service
+from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, status, Query
+
+from app.core.dependencies import get_audit_job_repository, get_audit_service, get_upload_service
+from app.models.audit_job import AuditJob
+from app.repositories.audit_job_repository import AuditJobRepository
+from app.schemas.audit_job import AuditJobResponse, AuditJobStatusLiteral
 from app.schemas.dataset import AuditRequestResponse, DatasetStatusResponse, UploadResponse
 from app.schemas.report import AuditReportResponse
+from app.services.audit_scheduler import get_audit_scheduler
 from app.services.audit_service import AuditService
 from app.services.upload_service import UploadService
+from app.utils.compression import COMPRESSION_SUFFIXES, STREAMABLE_EXTENSIONS, split_compression
 
 import logging
 
@@ -38,20 +46,43 @@ async def list_reports(
 async def upload_dataset(
     file: UploadFile,
     name: str = Form(...),
+    sheets: Optional[str] = Form(None),
     upload_service: UploadService = Depends(get_upload_service),
 ) -> UploadResponse:
     """
-    Upload a CSV dataset for later auditing.
+    Upload a dataset (CSV, JSON/NDJSON, XLSX, Parquet or Arrow IPC/Feather)
+    for later auditing.
+
+    For .xlsx files ``sheets`` is a comma-separated list of worksheets to
+    audit ("*" for all); the first sheet is used by default.
+
+    CSV and JSON/NDJSON files may be uploaded gzip, zstd, bz2 or ZIP
+    compressed (``data.csv.gz``, ``data.zip``); they stay compressed on disk.
     """
-    allowed_extensions = {".csv", ".json", ".xlsx"}
-    ext = file.filename.lower()[file.filename.rfind("."):]
-    if ext not in allowed_extensions:
+    allowed_extensions = {
+        ".csv", ".json", ".ndjson", ".jsonl", ".xlsx", ".parquet", ".feather", ".arrow"
+    }
+    ext, compression = split_compression(file.filename)
+    if compression:
+        # A bare .zip is checked against its member once it is saved.
+        supported = ext in STREAMABLE_EXTENSIONS or (compression == "zip" and not ext)
+    else:
+        supported = ext in allowed_extensions
+    if not supported:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported file format. Allowed: {', '.join(allowed_extensions)}",
+            detail=(
+                f"Unsupported file format. Allowed: {', '.join(sorted(allowed_extensions))}; "
+                f"{', '.join(STREAMABLE_EXTENSIONS)} may also be compressed "
+                f"({', '.join(COMPRESSION_SUFFIXES)})"
+            ),
         )
 
-    return await upload_service.handle_upload(file, name=name)
+    sheet_names = [s.strip() for s in sheets.split(",") if s.strip()] if sheets else None
+    try:
+        return await upload_service.handle_upload(file, name=name, sheet_names=sheet_names)
+    except (ValueError, zipfile.BadZipFile) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.post(
@@ -60,21 +91,82 @@ async def upload_dataset(
 )
 async def trigger_audit(
     dataset_id: str,
-    background_tasks: BackgroundTasks,
+    priority: int = Query(0, ge=-10, le=10),
     audit_service: AuditService = Depends(get_audit_service),
+    job_repo: AuditJobRepository = Depends(get_audit_job_repository),
 ) -> AuditRequestResponse:
     """
-    Trigger a background audit for a dataset.
+    Queue an audit for a dataset. Higher priority jobs run first.
     """
-    background_tasks.add_task(audit_service.run_audit, dataset_id=dataset_id)
     dataset = await audit_service.get_dataset_status(dataset_id)
+    job = await job_repo.enqueue(dataset_id, priority=priority)
+    get_audit_scheduler().wake()
     return AuditRequestResponse(
-        message="Audit started",
+        message="Audit queued",
         dataset_id=str(dataset.id),
         status=dataset.status,
+        job_id=str(job.id),
+    )
+
+
+def _job_to_response(job: AuditJob) -> AuditJobResponse:
+    return AuditJobResponse(
+        job_id=str(job.id),
+        dataset_id=str(job.dataset_id),
+        status=job.status,
+        priority=job.priority,
+        attempts=job.attempts,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        lease_expires_at=job.lease_expires_at,
+        worker_id=job.worker_id,
+        error_message=job.error_message,
     )
 
 
+@router.get(
+    "/audit/jobs",
+    response_model=list[AuditJobResponse],
+)
+async def list_audit_jobs(
+    job_status: Optional[AuditJobStatusLiteral] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=200),
+    job_repo: AuditJobRepository = Depends(get_audit_job_repository),
+) -> list[AuditJobResponse]:
+    """
+    List audit jobs in queue order, optionally filtered by status.
+    """
+    jobs = await job_repo.list_jobs(status=job_status, limit=limit)
+    return [_job_to_response(job) for job in jobs]
+
+
+@router.delete(
+    "/audit/jobs/{job_id}",
+    response_model=AuditJobResponse,
+)
+async def cancel_audit_job(
+    job_id: str,
+    job_repo: AuditJobRepository = Depends(get_audit_job_repository),
+) -> AuditJobResponse:
+    """
+    Cancel an audit job that has not started yet.
+    """
+    job = await job_repo.cancel(job_id)
+    if job is None:
+        existing = await job_repo.get_by_id(job_id)
+        if existing is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Audit job not found.",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only queued audit jobs can be cancelled (job is {existing.status}).",
+        )
+    return _job_to_response(job)
+
+
 @router.get(
     "/report/{dataset_id}",
     response_model=AuditReportResponse,
@@ -123,5 +215,6 @@ async def get_status(
         error_message=error_msg,
         uploaded_at=dataset.uploaded_at,
         processed_at=dataset.processed_at,
+        column_schema=dataset.column_schema,
     )
 
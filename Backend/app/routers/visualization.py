@@ -1,8 +1,10 @@
-from typing import Any, Dict, List
+import asyncio
+from collections.abc import Generator
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.dependencies import (
     get_audit_report_repository,
@@ -11,6 +13,7 @@ from app.core.dependencies import (
 )
 from app.repositories.audit_report_repository import AuditReportRepository
 from app.repositories.column_profile_repository import ColumnProfileRepository
+from app.models.dataset import Dataset
 from app.repositories.dataset_repository import DatasetRepository
 from app.schemas.visualization import (
     AnomaliesVisualizationResponse,
@@ -20,13 +23,101 @@ from app.schemas.visualization import (
     QualityReportResponse,
     DatasetSummary,
 )
-from app.services.csv_processing_service import CsvChunkProcessor
-from app.ai_modules.common import select_numeric_columns
+from app.services.columnar_cache import find_columnar_cache
+from app.services.data_processing_service import DataProcessor
+from app.ai_modules.common import ReservoirSampler, select_numeric_columns
+from app.ai_modules.sketches import KLLSketch
 
 
 router = APIRouter(tags=["visualization"])
 
 
+def _iter_dataset_chunks(
+    dataset: Dataset,
+    columns: Optional[str],
+) -> Generator[pd.DataFrame, None, None]:
+    """
+    Stream the chunks of a dataset file, or of its columnar copy once an
+    audit has written one, reading only ``columns`` (a comma-separated
+    list) when given.
+    """
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    path = find_columnar_cache(dataset.storage_path, dataset.columnar_path) or dataset.storage_path
+    processor = DataProcessor(path, sheet_names=dataset.sheet_names, columns=selected)
+    try:
+        yield from processor.iter_chunks()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _sample_distributions(
+    dataset: Dataset,
+    columns: Optional[str],
+) -> Tuple[Dict[str, ReservoirSampler], Dict[str, KLLSketch], Dict[str, ReservoirSampler]]:
+    """
+    Scan the whole dataset once, sampling numeric and categorical values
+    per column and sketching the quantiles of numeric columns.
+    """
+    numeric_samples: Dict[str, ReservoirSampler] = {}
+    numeric_sketches: Dict[str, KLLSketch] = {}
+    categorical_samples: Dict[str, ReservoirSampler] = {}
+
+    max_numeric_samples = 20_000
+    max_categorical_samples = 5_000
+
+    for chunk in _iter_dataset_chunks(dataset, columns):
+        # Determine numeric columns on first relevant chunk
+        num_cols = select_numeric_columns(chunk)
+
+        # Numeric sampling
+        for col in num_cols:
+            series = pd.to_numeric(chunk[col], errors="coerce").dropna()
+            if series.empty:
+                continue
+            values = series.to_numpy(dtype=float)
+            if col not in numeric_samples:
+                numeric_samples[col] = ReservoirSampler(max_numeric_samples)
+                numeric_sketches[col] = KLLSketch()
+            numeric_samples[col].add(values)
+            numeric_sketches[col].update(values)
+
+        # Categorical sampling (for non-numeric/object-like)
+        for col in chunk.columns:
+            if col in num_cols:
+                continue
+            series = chunk[col].astype(str)
+            if col not in categorical_samples:
+                categorical_samples[col] = ReservoirSampler(max_categorical_samples, dtype=object)
+            non_null = series[series.notna() & (series != "")]
+            categorical_samples[col].add(non_null.to_numpy(dtype=object))
+
+    return numeric_samples, numeric_sketches, categorical_samples
+
+
+def _sample_rows(
+    dataset: Dataset,
+    columns: Optional[str],
+) -> Tuple[Optional[List[str]], Optional[ReservoirSampler]]:
+    """
+    Scan the whole dataset once, keeping a uniform sample of its rows.
+    Returns the sampled columns and the sampler, or ``(None, None)`` for
+    a dataset without chunks.
+    """
+    max_rows = 5_000
+    sample_columns: Optional[List[str]] = None
+    sampler: Optional[ReservoirSampler] = None
+
+    for chunk in _iter_dataset_chunks(dataset, columns):
+        # Rows keep the columns of the first chunk; chunks of other
+        # worksheets contribute missing values for columns they lack.
+        if sampler is None:
+            sample_columns = list(chunk.columns)
+            sampler = ReservoirSampler(max_rows, width=len(sample_columns), dtype=object)
+        sampler.add(chunk.reindex(columns=sample_columns).to_numpy(dtype=object))
+
+    return sample_columns, sampler
+
+
 @router.post(
     "/visualization/profile/{dataset_id}",
     response_model=ProfileVisualizationResponse,
@@ -97,62 +188,34 @@ async def get_profile_visualization(
 )
 async def get_distributions(
     dataset_id: str,
+    columns: Optional[str] = Query(None, description="Comma-separated columns to read"),
     dataset_repo: DatasetRepository = Depends(get_dataset_repository),
 ) -> DistributionsResponse:
     """
     Compute distribution data (histograms/box-plots for numeric,
-    pie/bar charts for categoricals) from a bounded sample of the CSV.
+    pie/bar charts for categoricals) from a uniform sample of every
+    column across the whole dataset. Box plots use full-data quartiles
+    from a quantile sketch.
     """
     dataset = await dataset_repo.get_by_id(dataset_id)
     if dataset is None:
         raise HTTPException(status_code=404, detail="Dataset not found.")
 
-    processor = CsvChunkProcessor(dataset.storage_path)
-
-    numeric_samples: Dict[str, List[float]] = {}
-    categorical_samples: Dict[str, List[str]] = {}
-
-    max_numeric_samples = 20_000
-    max_categorical_samples = 5_000
-
-    for chunk in processor.iter_chunks():
-        # Determine numeric columns on first relevant chunk
-        num_cols = select_numeric_columns(chunk)
-
-        # Numeric sampling
-        for col in num_cols:
-            series = pd.to_numeric(chunk[col], errors="coerce").dropna()
-            if series.empty:
-                continue
-            samples = numeric_samples.setdefault(col, [])
-            remaining = max_numeric_samples - len(samples)
-            if remaining <= 0:
-                continue
-            samples.extend(series.tolist()[:remaining])
-
-        # Categorical sampling (for non-numeric/object-like)
-        for col in chunk.columns:
-            if col in num_cols:
-                continue
-            series = chunk[col].astype(str)
-            samples = categorical_samples.setdefault(col, [])
-            remaining = max_categorical_samples - len(samples)
-            if remaining <= 0:
-                continue
-            non_null = series[series.notna() & (series != "")]
-            samples.extend(non_null.tolist()[:remaining])
+    # Sampling reads every chunk, so keep it off the event loop.
+    numeric_samples, numeric_sketches, categorical_samples = await asyncio.to_thread(
+        _sample_distributions, dataset, columns
+    )
 
     numeric_distributions: List[Dict[str, Any]] = []
-    for col, values in numeric_samples.items():
-        if not values:
+    for col, sampler in numeric_samples.items():
+        if not len(sampler):
             continue
-        arr = np.array(values, dtype=float)
+        arr = sampler.values
         bins = 20
         hist, bin_edges = np.histogram(arr, bins=bins)
 
-        q1 = float(np.percentile(arr, 25))
-        median = float(np.percentile(arr, 50))
-        q3 = float(np.percentile(arr, 75))
+        sketch = numeric_sketches[col]
+        q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
         iqr = q3 - q1
         lower = q1 - 1.5 * iqr
         upper = q3 + 1.5 * iqr
@@ -166,21 +229,21 @@ async def get_distributions(
                     "frequencies": hist.tolist(),
                 },
                 "box_plot": {
-                    "min": float(np.min(arr)),
+                    "min": sketch.min,
                     "q1": q1,
                     "median": median,
                     "q3": q3,
-                    "max": float(np.max(arr)),
+                    "max": sketch.max,
                     "outliers": outliers,
                 },
             }
         )
 
     categorical_distributions: List[Dict[str, Any]] = []
-    for col, values in categorical_samples.items():
-        if not values:
+    for col, sampler in categorical_samples.items():
+        if not len(sampler):
             continue
-        series = pd.Series(values)
+        series = pd.Series(sampler.values)
         value_counts = series.value_counts()
         total = float(value_counts.sum())
 
@@ -287,27 +350,21 @@ def _compute_cramers_v(table: pd.DataFrame) -> float:
 )
 async def get_correlations(
     dataset_id: str,
+    columns: Optional[str] = Query(None, description="Comma-separated columns to read"),
     dataset_repo: DatasetRepository = Depends(get_dataset_repository),
 ) -> CorrelationsResponse:
     """
-    Compute correlation and association metrics from a bounded sample
-    of the dataset.
+    Compute correlation and association metrics from a uniform sample
+    of rows across the whole dataset.
     """
     dataset = await dataset_repo.get_by_id(dataset_id)
     if dataset is None:
         raise HTTPException(status_code=404, detail="Dataset not found.")
 
-    processor = CsvChunkProcessor(dataset.storage_path)
-
-    sample_rows: List[pd.DataFrame] = []
-    max_rows = 5_000
-
-    for chunk in processor.iter_chunks():
-        if len(sample_rows) * len(chunk) >= max_rows:
-            break
-        sample_rows.append(chunk)
+    # Sampling reads every chunk, so keep it off the event loop.
+    sample_columns, sampler = await asyncio.to_thread(_sample_rows, dataset, columns)
 
-    if not sample_rows:
+    if sampler is None or not len(sampler):
         numeric_correlations: Dict[str, Any] = {
             "columns": [],
             "correlation_matrix": [],
@@ -319,7 +376,7 @@ async def get_correlations(
             categorical_associations=categorical_associations,
         )
 
-    sample_df = pd.concat(sample_rows, ignore_index=True)
+    sample_df = pd.DataFrame(sampler.values, columns=sample_columns).infer_objects()
 
     # Numeric correlations
     numeric_cols = select_numeric_columns(sample_df)
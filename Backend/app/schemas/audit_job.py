@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+AuditJobStatusLiteral = Literal["queued", "running", "completed", "failed", "cancelled"]
+
+
+class AuditJobResponse(BaseModel):
+    job_id: str
+    dataset_id: str
+    status: AuditJobStatusLiteral
+    priority: int
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+    worker_id: Optional[str] = None
+    error_message: Optional[str] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 from bson import ObjectId
 from pydantic import BaseModel, Field
@@ -66,10 +66,12 @@ class DatasetStatusResponse(BaseModel):
     error_message: Optional[str] = None
     uploaded_at: datetime
     processed_at: Optional[datetime] = None
+    column_schema: Optional[Dict[str, str]] = None
 
 
 class AuditRequestResponse(BaseModel):
     message: str
     dataset_id: str
     status: DatasetStatusLiteral
+    job_id: Optional[str] = None
 
@@ -22,5 +22,8 @@ class AuditReportResponse(BaseModel):
     error_message: Optional[str] = None
     is_sampled: bool = False
     sample_size: int = 0
+    is_approximate: bool = False
+    duplicate_error_bound: float = 0.0
+    record_linkage: Optional[Dict[str, Any]] = None
     columns: List[ColumnProfileSchema] = []
 
@@ -0,0 +1,136 @@
+from collections.abc import Generator, Iterable
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from app.services.csv_ranges import open_csv_range, read_csv_header
+from app.utils.compression import open_input, split_compression
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+logger = logging.getLogger(__name__)
+
+
+def require_pyarrow():
+    """
+    Import pyarrow on demand so the pandas engine works without it.
+    """
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError(
+            "The arrow CSV engine requires pyarrow. Install it or set CSV_ENGINE=pandas."
+        ) from exc
+    return pyarrow
+
+
+def rebatch(
+    batches: Iterable["pa.RecordBatch"],
+    batch_size: int,
+) -> Generator["pa.RecordBatch", None, None]:
+    """
+    Regroup record batches into batches of exactly ``batch_size`` rows
+    (the last one may be shorter).
+    """
+    pa = require_pyarrow()
+    pending: List["pa.RecordBatch"] = []
+    pending_rows = 0
+    for batch in batches:
+        while batch.num_rows:
+            take = min(batch_size - pending_rows, batch.num_rows)
+            pending.append(batch.slice(0, take))
+            pending_rows += take
+            batch = batch.slice(take)
+            if pending_rows == batch_size:
+                yield pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+                pending, pending_rows = [], 0
+    if pending_rows:
+        yield pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+
+
+def iter_csv_record_batches(
+    file_path: str,
+    batch_size: int,
+    skip_rows: int = 0,
+    columns: Optional[Sequence[str]] = None,
+    byte_range: Optional[Tuple[int, int]] = None,
+    memory_map: bool = False,
+    column_types: Optional[Dict[str, "pa.DataType"]] = None,
+) -> Generator["pa.RecordBatch", None, None]:
+    """
+    Stream a CSV file as Arrow record batches of ``batch_size`` rows.
+
+    Blocks are parsed by Arrow's multi-threaded CSV reader into Arrow string
+    columns, so no Python object is created per cell. Every column is read
+    as a string to match the ``dtype=object`` pandas path, unless
+    ``column_types`` gives its type: per-block type inference could
+    otherwise fail half-way through a file. The same null
+    markers as ``pd.read_csv`` (empty, NA, null, NaN, ...) become nulls and
+    malformed rows are skipped with a warning, like ``on_bad_lines="warn"``.
+    Only ``columns`` are converted when given. With ``byte_range`` only
+    the records in that byte range (from :func:`split_csv_ranges`) are
+    read, using the header of the file. Compressed files are decompressed
+    as a stream. With ``memory_map`` an uncompressed file is parsed straight
+    from a memory map instead of being copied through read buffers.
+    """
+    pa = require_pyarrow()
+    from pyarrow import csv as pa_csv
+
+    header = read_csv_header(file_path)
+    if columns is not None:
+        missing = [col for col in columns if col not in header]
+        if missing:
+            raise ValueError(f"Column(s) not found: {', '.join(missing)}")
+    skipped_lines: List[int] = []
+
+    def skip_invalid_row(row) -> str:
+        skipped_lines.append(row.number)
+        return "skip"
+
+    if split_compression(file_path)[1]:
+        source = open_input(file_path)
+    elif memory_map:
+        source = pa.memory_map(file_path)
+        if byte_range:
+            start, end = byte_range
+            source.seek(start)
+            # A zero-copy slice of the mapping; it keeps the map alive.
+            mapped, source = source, pa.BufferReader(source.read_buffer(end - start))
+            mapped.close()
+    elif byte_range:
+        source = open_csv_range(file_path, *byte_range)
+    else:
+        source = file_path
+    try:
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(
+                use_threads=True,
+                block_size=8 << 20,
+                column_names=header,
+                skip_rows=0 if byte_range else 1,
+                skip_rows_after_names=skip_rows,
+            ),
+            parse_options=pa_csv.ParseOptions(
+                newlines_in_values=True,
+                invalid_row_handler=skip_invalid_row,
+            ),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types or {name: pa.string() for name in header},
+                strings_can_be_null=True,
+                include_columns=list(columns) if columns is not None else None,
+            ),
+        )
+        yield from rebatch(reader, batch_size)
+    finally:
+        if source is not file_path:
+            source.close()
+
+    if skipped_lines:
+        logger.warning(
+            "Skipped malformed CSV rows file_path=%s count=%d first_line=%s",
+            file_path,
+            len(skipped_lines),
+            skipped_lines[0],
+        )
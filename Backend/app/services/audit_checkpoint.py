@@ -0,0 +1,220 @@
+import io
+import logging
+import os
+import pickle
+import shutil
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.ai_modules.seen_set import HashSeenSet
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 9
+_STATE_FILE = "state.pkl"
+_LEASE_SUFFIX = ".lease"
+
+
+@dataclass
+class AuditCheckpoint:
+    """
+    Detector state after the first ``chunks_done`` chunks (``rows_done``
+    rows) of a dataset file.
+
+    Audits of CSV byte ranges also record ``byte_offset``, the end of the
+    last range merged, so a resume seeks there instead of skipping rows.
+    ``schema`` is the column schema the chunks were read with, which a
+    resume must keep.
+    """
+
+    chunks_done: int
+    rows_done: int
+    detectors: Dict[str, Any]
+    file_size: int
+    file_mtime_ns: int
+    chunk_size: int
+    byte_offset: Optional[int] = None
+    schema: Optional[Dict[str, str]] = None
+    version: int = CHECKPOINT_VERSION
+
+
+class AuditLeaseLostError(RuntimeError):
+    """
+    A newer attempt of the audit job took over the file: its checkpoints
+    and columnar copy are no longer this worker's to write.
+    """
+
+    def __init__(self, lease: str, owner: Optional[str]) -> None:
+        super().__init__(f"Audit lease {lease} lost to {owner or 'a finished attempt'}")
+        self.lease = lease
+        self.owner = owner
+
+    def __reduce__(self):
+        # Raised in audit worker processes and re-raised in the app.
+        return type(self), (self.lease, self.owner)
+
+
+class _CheckpointPickler(pickle.Pickler):
+    """
+    Pickler that stores spilled seen-sets as copies of their spill files
+    inside the checkpoint directory instead of taking them over.
+    """
+
+    def __init__(self, file: io.BufferedWriter, directory: str) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._directory = directory
+        self._seen_sets = 0
+
+    def persistent_id(self, obj: Any) -> Optional[tuple]:
+        if isinstance(obj, HashSeenSet):
+            self._seen_sets += 1
+            spill_copy = os.path.join(self._directory, f"seen-{self._seen_sets}")
+            return ("HashSeenSet", obj.snapshot(spill_copy))
+        return None
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: tuple) -> Any:
+        kind, state = pid
+        if kind != "HashSeenSet":
+            raise pickle.UnpicklingError(f"Unknown checkpoint object: {kind}")
+        return HashSeenSet.restore(state)
+
+
+def checkpoint_dir_for(file_path: str) -> str:
+    """
+    Directory holding the checkpoints of the audit of ``file_path``.
+    """
+    if settings.audit_checkpoint_dir:
+        return os.path.join(
+            settings.audit_checkpoint_dir, os.path.basename(file_path) + ".checkpoint"
+        )
+    return file_path + ".checkpoint"
+
+
+def _lease_path_for(file_path: str) -> str:
+    return checkpoint_dir_for(file_path) + _LEASE_SUFFIX
+
+
+def claim_audit_lease(file_path: str, lease: str) -> None:
+    """
+    Make ``lease`` (one attempt of an audit job) the owner of the
+    checkpoints and columnar copy of ``file_path``.
+
+    A worker of an earlier attempt that is still running sees the change
+    in ``check_audit_lease`` and stops before writing anything shared.
+    """
+    path = _lease_path_for(file_path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{lease}.tmp"
+    with open(tmp_path, "w") as handle:
+        handle.write(lease)
+    os.replace(tmp_path, path)
+
+
+def check_audit_lease(file_path: str, lease: Optional[str]) -> None:
+    """
+    Raise ``AuditLeaseLostError`` unless ``lease`` still owns ``file_path``.
+    Audits run without a lease are never stopped.
+    """
+    if lease is None:
+        return
+    try:
+        with open(_lease_path_for(file_path)) as handle:
+            owner: Optional[str] = handle.read()
+    except FileNotFoundError:
+        owner = None
+    if owner != lease:
+        raise AuditLeaseLostError(lease, owner)
+
+
+def release_audit_lease(file_path: str, lease: Optional[str]) -> None:
+    if lease is None:
+        return
+    try:
+        os.remove(_lease_path_for(file_path))
+    except FileNotFoundError:
+        pass
+
+
+def save_checkpoint(
+    file_path: str, checkpoint: AuditCheckpoint, lease: Optional[str] = None
+) -> None:
+    """
+    Write a checkpoint generation and drop the older ones.
+
+    Each generation lives in its own sub-directory and ``state.pkl`` is
+    renamed into place last, so a crash mid-write leaves the previous
+    generation intact. Generations are named after the ``lease`` of the
+    attempt writing them, so two attempts never write the same directory.
+    """
+    check_audit_lease(file_path, lease)
+    root = checkpoint_dir_for(file_path)
+    name = f"{checkpoint.chunks_done:09d}"
+    if lease is not None:
+        name = f"{name}-{lease}"
+    generation = os.path.join(root, name)
+    shutil.rmtree(generation, ignore_errors=True)
+    os.makedirs(generation)
+
+    tmp_path = os.path.join(generation, _STATE_FILE + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        _CheckpointPickler(handle, generation).dump(checkpoint)
+    os.replace(tmp_path, os.path.join(generation, _STATE_FILE))
+
+    for name in os.listdir(root):
+        if name != os.path.basename(generation):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    logger.info(
+        "Audit checkpoint saved file_path=%s chunks_done=%d rows_done=%d",
+        file_path,
+        checkpoint.chunks_done,
+        checkpoint.rows_done,
+    )
+
+
+def load_checkpoint(file_path: str) -> Optional[AuditCheckpoint]:
+    """
+    Load the latest complete checkpoint for ``file_path``.
+
+    Checkpoints written for a different file version, chunk size or format
+    version are discarded.
+    """
+    root = checkpoint_dir_for(file_path)
+    if not os.path.isdir(root):
+        return None
+
+    generations = sorted(
+        name
+        for name in os.listdir(root)
+        if os.path.isfile(os.path.join(root, name, _STATE_FILE))
+    )
+    if not generations:
+        return None
+
+    try:
+        with open(os.path.join(root, generations[-1], _STATE_FILE), "rb") as handle:
+            checkpoint = _CheckpointUnpickler(handle).load()
+    except Exception as exc:
+        logger.warning("Discarding unreadable audit checkpoint file_path=%s error=%s", file_path, exc)
+        clear_checkpoint(file_path)
+        return None
+
+    stat = os.stat(file_path)
+    if (
+        not isinstance(checkpoint, AuditCheckpoint)
+        or checkpoint.version != CHECKPOINT_VERSION
+        or checkpoint.file_size != stat.st_size
+        or checkpoint.file_mtime_ns != stat.st_mtime_ns
+        or checkpoint.chunk_size != settings.csv_chunk_size
+    ):
+        logger.info("Discarding stale audit checkpoint file_path=%s", file_path)
+        clear_checkpoint(file_path)
+        return None
+    return checkpoint
+
+
+def clear_checkpoint(file_path: str) -> None:
+    shutil.rmtree(checkpoint_dir_for(file_path), ignore_errors=True)
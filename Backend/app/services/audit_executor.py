@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _init_worker() -> None:
+    """
+    Configure logging in freshly spawned audit worker processes.
+    """
+    setup_logging()
+
+
+def create_worker_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create a process pool of spawned, logging-configured workers.
+
+    Workers are spawned rather than forked so they never inherit the event
+    loop, the Mongo client or its background threads.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def get_audit_executor() -> ProcessPoolExecutor:
+    """
+    Lazily create the process pool that runs CPU-bound audit work.
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = create_worker_pool(settings.audit_worker_processes)
+        logger.info(
+            "Audit executor started worker_processes=%d",
+            settings.audit_worker_processes,
+        )
+    return _executor
+
+
+def shutdown_audit_executor() -> None:
+    """
+    Stop the audit worker pool, cancelling work that has not started yet.
+    """
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+async def run_in_audit_executor(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run ``func(*args)`` in the audit worker pool and await its result
+    without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_audit_executor(), func, *args)
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Optional, Set
+
+from app.core.config import settings
+from app.database.mongo import get_database
+from app.models.audit_job import AuditJob
+from app.repositories.audit_job_repository import AuditJobRepository
+from app.repositories.audit_report_repository import AuditReportRepository
+from app.repositories.column_profile_repository import ColumnProfileRepository
+from app.repositories.dataset_repository import DatasetRepository
+from app.services.audit_service import AuditService
+
+
+logger = logging.getLogger(__name__)
+
+
+class AuditScheduler:
+    """
+    Runs queued audit jobs with a bounded number of concurrent audits.
+
+    Jobs live in the ``audit_jobs`` collection so the queue survives restarts.
+    Each running job holds a lease renewed by a heartbeat; jobs whose lease
+    expires (the instance running them died) are put back in the queue and
+    the dataset they left in ``processing`` is reset before the retry.
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._running: Set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def _job_repo(self) -> AuditJobRepository:
+        return AuditJobRepository(get_database())
+
+    def _audit_service(self) -> AuditService:
+        db = get_database()
+        return AuditService(
+            DatasetRepository(db),
+            ColumnProfileRepository(db),
+            AuditReportRepository(db),
+        )
+
+    async def start(self) -> None:
+        if self._loop_task is not None:
+            return
+        await self.recover_orphaned_datasets()
+        self._loop_task = asyncio.create_task(self._run_loop())
+        logger.info(
+            "Audit scheduler started worker_id=%s max_concurrent_audits=%d",
+            self.worker_id,
+            settings.max_concurrent_audits,
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop claiming jobs. Audits still running keep their jobs in
+        ``running``; their leases expire and another instance retries them.
+        """
+        tasks = list(self._running)
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._running.clear()
+        self._loop_task = None
+
+    def wake(self) -> None:
+        """
+        Check the queue now instead of waiting for the next poll.
+        """
+        self._wake.set()
+
+    async def recover_orphaned_datasets(self) -> None:
+        """
+        Re-queue datasets stuck in ``processing`` without an active job, e.g.
+        audits started before the queue existed or whose job was lost.
+        """
+        job_repo = self._job_repo()
+        dataset_repo = DatasetRepository(get_database())
+        await job_repo.requeue_expired(settings.audit_job_max_attempts)
+        for dataset in await dataset_repo.list_by_status("processing"):
+            dataset_id = str(dataset.id)
+            if await job_repo.has_active_job(dataset_id):
+                continue
+            await dataset_repo.update_status(dataset_id, "uploaded")
+            await job_repo.enqueue(dataset_id)
+            logger.warning("Recovered orphaned audit dataset_id=%s", dataset_id)
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await self._job_repo().requeue_expired(settings.audit_job_max_attempts)
+                await self._fill_slots()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Audit scheduler poll failed")
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(),
+                    timeout=settings.audit_queue_poll_interval_seconds,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fill_slots(self) -> None:
+        job_repo = self._job_repo()
+        while len(self._running) < settings.max_concurrent_audits:
+            job = await job_repo.claim_next(self.worker_id, settings.audit_job_lease_seconds)
+            if job is None:
+                return
+            task = asyncio.create_task(self._run_job(job))
+            self._running.add(task)
+            task.add_done_callback(self._on_job_done)
+
+    def _on_job_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        # A slot freed up: pick the next job without waiting for the poll.
+        self._wake.set()
+
+    async def _heartbeat(self, job: AuditJob, audit: asyncio.Task) -> None:
+        """
+        Renew the lease of ``job`` until cancelled. Once the lease is lost
+        the job may be retried elsewhere, so ``audit`` is cancelled before
+        it writes over the results of the new attempt.
+        """
+        job_repo = self._job_repo()
+        interval = settings.audit_job_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not await job_repo.heartbeat(
+                str(job.id), self.worker_id, settings.audit_job_lease_seconds
+            ):
+                logger.warning("Audit job lease lost, cancelling audit job_id=%s", job.id)
+                audit.cancel()
+                return
+
+    async def _run_job(self, job: AuditJob) -> None:
+        job_id = str(job.id)
+        dataset_id = str(job.dataset_id)
+        job_repo = self._job_repo()
+        audit_service = self._audit_service()
+        logger.info(
+            "Audit job started job_id=%s dataset_id=%s attempt=%d",
+            job_id,
+            dataset_id,
+            job.attempts,
+        )
+
+        heartbeat = asyncio.create_task(self._heartbeat(job, asyncio.current_task()))
+        try:
+            dataset = await audit_service.get_dataset_status(dataset_id)
+            if job.attempts > 1 and dataset.status == "processing":
+                # A previous attempt died mid-audit; its claim on the dataset
+                # is stale because this job now holds the lease.
+                await DatasetRepository(get_database()).update_status(dataset_id, "uploaded")
+
+            # The worker of an abandoned attempt may still be running; the
+            # lease lets it see that this attempt owns the file now.
+            await audit_service.run_audit(
+                dataset_id=dataset_id, lease=f"{job_id}-{job.attempts}"
+            )
+
+            dataset = await audit_service.get_dataset_status(dataset_id)
+            if dataset.status == "completed":
+                finished = await job_repo.finish(job_id, self.worker_id, "completed")
+            else:
+                report = await audit_service.get_audit_report(dataset_id)
+                finished = await job_repo.finish(
+                    job_id,
+                    self.worker_id,
+                    "failed",
+                    error_message=report.error_message if report else None,
+                )
+            if not finished:
+                logger.warning(
+                    "Audit job lease lost before finishing job_id=%s dataset_id=%s",
+                    job_id,
+                    dataset_id,
+                )
+                return
+            logger.info(
+                "Audit job finished job_id=%s dataset_id=%s dataset_status=%s",
+                job_id,
+                dataset_id,
+                dataset.status,
+            )
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.exception() is None:
+                # Cancelled by the heartbeat: the job belongs to its next
+                # attempt now, which resets the dataset and reruns the audit.
+                logger.warning(
+                    "Audit job abandoned after losing its lease job_id=%s dataset_id=%s",
+                    job_id,
+                    dataset_id,
+                )
+                return
+            raise
+        except Exception as exc:
+            logger.exception("Audit job failed job_id=%s dataset_id=%s", job_id, dataset_id)
+            await job_repo.finish(
+                job_id, self.worker_id, "failed", error_message=f"{type(exc).__name__}: {exc}"
+            )
+        finally:
+            heartbeat.cancel()
+
+
+_scheduler: Optional[AuditScheduler] = None
+
+
+def get_audit_scheduler() -> AuditScheduler:
+    global _scheduler
+
+    if _scheduler is None:
+        _scheduler = AuditScheduler()
+    return _scheduler
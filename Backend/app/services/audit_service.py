@@ -1,15 +1,20 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import logging
+import os
 from bson import ObjectId
 
 from app.ai_modules.anomalies import AnomalyDetector
+from app.ai_modules.chunk_view import ChunkView
+from app.ai_modules.common import merge_states
 from app.ai_modules.consistency import ConsistencyChecker
 from app.ai_modules.duplicates import DuplicateDetector
 from app.ai_modules.inconsistencies import InconsistencyDetector
 from app.ai_modules.profiling import ColumnProfiler
 from app.ai_modules.scoring import compute_reliability_score
+from app.core.config import settings
 from app.core.exceptions import InvalidDatasetStateError
 from app.models.dataset import Dataset
 from app.repositories.audit_report_repository import AuditReportRepository
@@ -17,7 +22,27 @@ from app.repositories.column_profile_repository import ColumnProfileRepository
 from app.repositories.dataset_repository import DatasetRepository
 from app.schemas.dataset import DatasetStatusResponse
 from app.schemas.report import AuditReportResponse, ColumnProfileSchema
+from app.services.audit_checkpoint import (
+    AuditCheckpoint,
+    check_audit_lease,
+    claim_audit_lease,
+    clear_checkpoint,
+    load_checkpoint,
+    release_audit_lease,
+    save_checkpoint,
+)
+from app.services.audit_executor import create_worker_pool, run_in_audit_executor
+from app.services.columnar_cache import (
+    ColumnarCachePart,
+    columnar_cache_path,
+    columnar_staging_path,
+    discard_columnar_cache,
+    find_columnar_cache,
+    publish_columnar_cache,
+)
+from app.services.csv_ranges import read_csv_header
 from app.services.data_processing_service import DataProcessor
+from app.services.schema_inference import SchemaMismatchError, demote_schema, infer_schema
 
 
 logger = logging.getLogger(__name__)
@@ -38,9 +63,12 @@ class AuditService:
         self._column_repo = column_repo
         self._report_repo = report_repo
 
-    async def run_audit(self, dataset_id: str) -> None:
+    async def run_audit(self, dataset_id: str, lease: Optional[str] = None) -> None:
         """
         Execute the audit pipeline for a dataset.
+
+        ``lease`` names the attempt of the audit job running it (see
+        ``compute_audit``).
         """
         dataset = await self._dataset_repo.get_by_id(dataset_id)
         if dataset is None:
@@ -60,125 +88,65 @@ class AuditService:
         await self._dataset_repo.update_status(dataset_id, "processing")
         logger.info("Audit started dataset_id=%s status=processing", dataset_id)
 
-        profiler = ColumnProfiler()
-        inconsistency_detector = InconsistencyDetector()
-        consistency_checker = ConsistencyChecker()
-        duplicate_detector = DuplicateDetector()
-        anomaly_detector = AnomalyDetector()
-
-        processor = DataProcessor(dataset.storage_path)
-
         try:
-            total_rows = 0
-            columns_count = 0
-
-            logger.info(
-                "Audit processing started dataset_id=%s file_path=%s",
-                dataset_id,
-                dataset.storage_path,
-            )
-
-            for chunk in processor.iter_chunks():
-                profiler.process_chunk(chunk)
-                inconsistency_detector.process_chunk(chunk)
-                consistency_checker.process_chunk(chunk)
-                duplicate_detector.process_chunk(chunk)
-                anomaly_detector.process_chunk_for_sampling(chunk)
-
-            profiles, total_rows = profiler.build_profiles()
-            columns_count = len(profiles)
-            logger.info(
-                "Profiling completed dataset_id=%s total_rows=%d columns=%d",
-                dataset_id,
-                total_rows,
-                columns_count,
-            )
-
-            inconsistency_issues = inconsistency_detector.evaluate(profiles)
-            consistency_issues = consistency_checker.evaluate(profiles)
-            # Merge consistency issues into inconsistency issues so that
-            # downstream scoring and storage see a unified view.
-            for col, msgs in consistency_issues.items():
-                existing = inconsistency_issues.get(col, [])
-                inconsistency_issues[col] = existing + msgs
-            logger.info(
-                "Inconsistency detection completed dataset_id=%s columns_with_issues=%d",
-                dataset_id,
-                len(inconsistency_issues),
+            # Parsing, detection and scoring are CPU-bound and run in a worker
+            # process so the event loop stays free to serve other requests.
+            # Later audits read the columnar copy written by the first one.
+            source_path = (
+                find_columnar_cache(dataset.storage_path, dataset.columnar_path)
+                or dataset.storage_path
             )
-
-            duplicate_stats = duplicate_detector.get_stats()
-            logger.info(
-                "Duplicate detection completed dataset_id=%s duplicates=%d ratio=%.6f",
+            result = await run_in_audit_executor(
+                compute_audit,
                 dataset_id,
-                int(duplicate_stats.get("duplicate_count", 0)),
-                float(duplicate_stats.get("duplicate_ratio", 0.0)),
-            )
-
-            anomaly_stats = anomaly_detector.compute_anomalies()
-            sample_size = int(anomaly_stats.get("sample_size", 0))
-            is_sampled = bool(total_rows and sample_size and total_rows > sample_size)
-            logger.info(
-                "Anomaly detection completed dataset_id=%s anomalies=%d ratio=%.6f sample_size=%d is_sampled=%s",
-                dataset_id,
-                int(anomaly_stats.get("anomaly_count", 0)),
-                float(anomaly_stats.get("anomaly_ratio", 0.0)),
-                sample_size,
-                is_sampled,
-            )
-
-            score, status, issue_summary = compute_reliability_score(
-                profiles=profiles,
-                inconsistency_issues=inconsistency_issues,
-                anomaly_stats=anomaly_stats,
-                duplicate_stats=duplicate_stats,
-            )
-            logger.info(
-                "Scoring completed dataset_id=%s reliability_score=%.2f status=%s",
-                dataset_id,
-                score,
-                status,
+                source_path,
+                dataset.sheet_names,
+                dataset.column_schema,
+                lease,
             )
+            if result.columnar_path:
+                await self._dataset_repo.set_columnar_path(dataset_id, result.columnar_path)
+            if result.schema != dataset.column_schema:
+                await self._dataset_repo.set_column_schema(dataset_id, result.schema)
 
             await self._column_repo.replace_for_dataset(
                 dataset_id=dataset_id,
-                profiles=profiles,
-                issues=inconsistency_issues,
+                profiles=result.profiles,
+                issues=result.inconsistency_issues,
             )
             logger.info(
                 "Column profiles persisted dataset_id=%s column_count=%d",
                 dataset_id,
-                columns_count,
-            )
-
-            recommendations = _build_recommendations(
-                profiles, inconsistency_issues, anomaly_stats, duplicate_stats
+                result.columns_count,
             )
 
             await self._report_repo.upsert_report(
                 dataset_id=dataset_id,
-                reliability_score=score,
-                status=status,
-                issue_summary=issue_summary,
-                anomaly_count=int(anomaly_stats.get("anomaly_count", 0)),
-                duplicate_count=int(duplicate_stats.get("duplicate_count", 0)),
-                recommendations=recommendations,
+                reliability_score=result.reliability_score,
+                status=result.status,
+                issue_summary=result.issue_summary,
+                anomaly_count=result.anomaly_count,
+                duplicate_count=result.duplicate_count,
+                recommendations=result.recommendations,
                 error_message=None,
-                is_sampled=is_sampled,
-                sample_size=sample_size,
+                is_sampled=result.is_sampled,
+                sample_size=result.sample_size,
+                is_approximate=result.is_approximate,
+                duplicate_error_bound=result.duplicate_error_bound,
+                record_linkage=result.record_linkage,
             )
             logger.info("Audit report persisted dataset_id=%s", dataset_id)
 
             await self._dataset_repo.update_stats(
                 dataset_id=dataset_id,
-                rows=total_rows,
-                columns=columns_count,
+                rows=result.total_rows,
+                columns=result.columns_count,
             )
             logger.info(
                 "Audit completed dataset_id=%s final_status=completed rows=%d columns=%d",
                 dataset_id,
-                total_rows,
-                columns_count,
+                result.total_rows,
+                result.columns_count,
             )
         except Exception as exc:
             error_message = f"{type(exc).__name__}: {str(exc)}"
@@ -267,10 +235,465 @@ class AuditService:
             error_message=report.error_message,
             is_sampled=report.is_sampled,
             sample_size=report.sample_size,
+            is_approximate=report.is_approximate,
+            duplicate_error_bound=report.duplicate_error_bound,
+            record_linkage=report.record_linkage,
             columns=columns,
         )
 
 
+@dataclass
+class AuditResult:
+    """
+    Outcome of the CPU-bound part of an audit, returned from a worker process.
+    """
+
+    profiles: Dict[str, dict]
+    inconsistency_issues: Dict[str, List[str]]
+    total_rows: int
+    columns_count: int
+    reliability_score: float
+    status: str
+    issue_summary: Dict[str, Any]
+    anomaly_count: int
+    duplicate_count: int
+    recommendations: List[str]
+    is_sampled: bool
+    sample_size: int
+    is_approximate: bool
+    duplicate_error_bound: float
+    record_linkage: Optional[Dict[str, Any]] = None
+    columnar_path: Optional[str] = None
+    schema: Optional[Dict[str, str]] = None
+
+
+def _new_detectors() -> Dict[str, Any]:
+    return {
+        "profiler": ColumnProfiler(),
+        "inconsistency": InconsistencyDetector(),
+        "consistency": ConsistencyChecker(),
+        "duplicate": DuplicateDetector(),
+        "anomaly": AnomalyDetector(),
+    }
+
+
+def _process_view(detectors: Dict[str, Any], view: ChunkView) -> None:
+    """
+    Feed one chunk to every detector. Its columns are decoded once in the
+    view shared by all of them.
+    """
+    chunk = view.frame
+    detectors["profiler"].process_chunk(chunk, view)
+    detectors["inconsistency"].process_chunk(chunk, view)
+    detectors["consistency"].process_chunk(chunk, view)
+    detectors["duplicate"].process_chunk(chunk, view)
+    detectors["anomaly"].process_chunk_for_sampling(chunk, view)
+
+
+def audit_csv_range(
+    file_path: str,
+    byte_range: Tuple[int, int],
+    staging_path: Optional[str] = None,
+    part: int = 0,
+    schema: Optional[Dict[str, str]] = None,
+) -> Tuple[Dict[str, Any], int, int]:
+    """
+    Run every detector over one byte range of a CSV file.
+
+    Runs in a range worker process and returns the detector states with
+    the number of chunks and rows processed. Spill files of the returned
+    seen-sets are handed over to the receiving process. With ``staging_path``
+    the range is also written as part ``part`` of the columnar copy.
+    Columns are read with the types of ``schema``.
+    """
+    detectors = _new_detectors()
+    cache = (
+        ColumnarCachePart(staging_path, part, read_csv_header(file_path), schema)
+        if staging_path
+        else None
+    )
+    chunks = rows = 0
+    try:
+        processor = DataProcessor(file_path, byte_range=byte_range, schema=schema)
+        for view in processor.iter_views():
+            _process_view(detectors, view)
+            if cache is not None:
+                cache.write(view)
+            chunks += 1
+            rows += len(view)
+    finally:
+        if cache is not None:
+            cache.close()
+    return detectors, chunks, rows
+
+
+def _use_byte_ranges(processor: DataProcessor, checkpoint: Optional[AuditCheckpoint]) -> bool:
+    if (
+        processor.extension != ".csv"
+        or processor.compression
+        or settings.csv_parallel_workers < 2
+    ):
+        return False
+    if checkpoint is not None and checkpoint.byte_offset is None:
+        # A checkpoint of a serial run can only be resumed serially.
+        return False
+    return os.path.getsize(processor.file_path) >= settings.csv_parallel_min_mb << 20
+
+
+def _audit_byte_ranges(
+    dataset_id: str,
+    processor: DataProcessor,
+    checkpoint: Optional[AuditCheckpoint],
+    interval: int,
+    staging_path: Optional[str] = None,
+    lease: Optional[str] = None,
+) -> Tuple[Dict[str, Any], int, int]:
+    """
+    Audit a CSV file as record-aligned byte ranges in a pool of
+    ``csv_parallel_workers`` processes, each range also writing its part
+    of the columnar copy when ``staging_path`` is given.
+
+    Range states are merged in file order with ``merge_states``, so the
+    result matches a serial run. After each merged range a checkpoint
+    records the byte offset reached, and a resumed audit only splits and
+    parses the rest of the file.
+    """
+    file_path = processor.file_path
+    workers = settings.csv_parallel_workers
+    # More ranges than workers keeps every worker busy until the end.
+    ranges = processor.split_ranges(workers * 4)
+    if checkpoint is not None:
+        detectors = checkpoint.detectors
+        chunks_done, rows_done = checkpoint.chunks_done, checkpoint.rows_done
+        ranges = [
+            (max(start, checkpoint.byte_offset), end)
+            for start, end in ranges
+            if end > checkpoint.byte_offset
+        ]
+    else:
+        detectors = None
+        chunks_done = rows_done = 0
+
+    logger.info(
+        "Audit parsing CSV byte ranges dataset_id=%s ranges=%d workers=%d",
+        dataset_id,
+        len(ranges),
+        workers,
+    )
+    pool = create_worker_pool(workers)
+    try:
+        futures = [
+            pool.submit(
+                audit_csv_range, file_path, byte_range, staging_path, part, processor.schema
+            )
+            for part, byte_range in enumerate(ranges)
+        ]
+        for (_, end), future in zip(ranges, futures):
+            states, chunks, rows = future.result()
+            check_audit_lease(file_path, lease)
+            if detectors is None:
+                detectors = states
+            else:
+                for name, detector in detectors.items():
+                    merge_states([detector, states[name]])
+            chunks_done += chunks
+            rows_done += rows
+            if interval:
+                stat = os.stat(file_path)
+                save_checkpoint(
+                    file_path,
+                    AuditCheckpoint(
+                        chunks_done=chunks_done,
+                        rows_done=rows_done,
+                        detectors=detectors,
+                        file_size=stat.st_size,
+                        file_mtime_ns=stat.st_mtime_ns,
+                        chunk_size=processor.chunk_size,
+                        byte_offset=end,
+                        schema=processor.schema,
+                    ),
+                    lease,
+                )
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    if detectors is None:
+        detectors = _new_detectors()
+    return detectors, chunks_done, rows_done
+
+
+def _read_dataset(
+    dataset_id: str,
+    processor: DataProcessor,
+    detectors: Dict[str, Any],
+    checkpoint: Optional[AuditCheckpoint],
+    interval: int,
+    staging_path: Optional[str],
+    lease: Optional[str] = None,
+) -> Tuple[Dict[str, Any], int, int]:
+    """
+    Feed the whole file (or, after a checkpoint, the rest of it) to the
+    detectors, as byte ranges in parallel or chunk by chunk. Reading stops
+    with ``AuditLeaseLostError`` once ``lease`` is taken over.
+    """
+    if _use_byte_ranges(processor, checkpoint):
+        return _audit_byte_ranges(
+            dataset_id, processor, checkpoint, interval, staging_path, lease
+        )
+
+    file_path = processor.file_path
+    chunks_done, rows_done = (
+        (checkpoint.chunks_done, checkpoint.rows_done) if checkpoint is not None else (0, 0)
+    )
+    if checkpoint is not None:
+        logger.info(
+            "Audit resuming from checkpoint dataset_id=%s chunks_done=%d rows_done=%d",
+            dataset_id,
+            chunks_done,
+            rows_done,
+        )
+    cache = (
+        ColumnarCachePart(staging_path, 0, read_csv_header(file_path), processor.schema)
+        if staging_path
+        else None
+    )
+    try:
+        for view in processor.iter_views(start_row=rows_done):
+            check_audit_lease(file_path, lease)
+            _process_view(detectors, view)
+            if cache is not None:
+                cache.write(view)
+
+            chunks_done += 1
+            rows_done += len(view)
+            if interval and chunks_done % interval == 0:
+                stat = os.stat(file_path)
+                save_checkpoint(
+                    file_path,
+                    AuditCheckpoint(
+                        chunks_done=chunks_done,
+                        rows_done=rows_done,
+                        detectors=detectors,
+                        file_size=stat.st_size,
+                        file_mtime_ns=stat.st_mtime_ns,
+                        chunk_size=processor.chunk_size,
+                        schema=processor.schema,
+                    ),
+                    lease,
+                )
+    finally:
+        if cache is not None:
+            cache.close()
+    return detectors, chunks_done, rows_done
+
+
+def compute_audit(
+    dataset_id: str,
+    file_path: str,
+    sheet_names: Optional[List[str]] = None,
+    schema: Optional[Dict[str, str]] = None,
+    lease: Optional[str] = None,
+) -> AuditResult:
+    """
+    Stream a dataset file through every detector and score the result.
+
+    This function is pure CPU work with no database access, so it can run in
+    an audit worker process. Detector state is checkpointed every
+    ``audit_checkpoint_interval_chunks`` chunks; if a previous run of the same
+    file left a checkpoint, processing resumes from it. ``sheet_names``
+    selects the worksheets of an .xlsx file. Large CSV files are split into
+    byte ranges audited in parallel when ``csv_parallel_workers`` > 1.
+
+    An audit of a CSV file that starts from scratch also writes its
+    columnar copy (see ``columnar_cache``); its path is returned in
+    ``AuditResult.columnar_path``.
+
+    CSV columns are read with the types of ``schema``, which is inferred
+    from sampled rows when not given and returned in ``AuditResult.schema``.
+    If a value does not parse, the audit starts over with the failing
+    column read as text.
+
+    ``lease`` identifies the attempt of the audit job running this call.
+    The worker of an abandoned attempt keeps running after its job is
+    retried, so each attempt claims the file on start, stages its own
+    columnar copy and checkpoints, and checks it still owns the file
+    before writing anything the retry reads; once it does not, it stops
+    with ``AuditLeaseLostError``.
+    """
+    if lease is not None:
+        claim_audit_lease(file_path, lease)
+    interval = settings.audit_checkpoint_interval_chunks
+    checkpoint = load_checkpoint(file_path) if interval else None
+    if checkpoint is not None:
+        # A resume must read the rest of the file as the first run did.
+        schema = checkpoint.schema
+    elif schema is None:
+        schema = infer_schema(file_path, sheet_names)
+
+    processor = DataProcessor(file_path, sheet_names=sheet_names, schema=schema)
+    cache_path = staging_path = None
+    if settings.columnar_cache_enabled and processor.extension == ".csv" and checkpoint is None:
+        # A resumed audit has not seen the skipped rows, so only a full
+        # pass writes the copy.
+        cache_path = columnar_cache_path(file_path)
+        staging_path = columnar_staging_path(cache_path, lease)
+
+    detectors = checkpoint.detectors if checkpoint is not None else _new_detectors()
+    try:
+        logger.info(
+            "Audit processing started dataset_id=%s file_path=%s",
+            dataset_id,
+            file_path,
+        )
+
+        while True:
+            try:
+                detectors, chunks_done, rows_done = _read_dataset(
+                    dataset_id, processor, detectors, checkpoint, interval, staging_path, lease
+                )
+                break
+            except SchemaMismatchError as exc:
+                # The samples missed a value the inferred type cannot hold:
+                # start over reading that column (or all typed columns) as text.
+                logger.warning(
+                    "Typed read failed, restarting audit dataset_id=%s column=%s error=%s",
+                    dataset_id,
+                    exc.column,
+                    exc,
+                )
+                detectors["duplicate"].close()
+                check_audit_lease(file_path, lease)
+                clear_checkpoint(file_path)
+                if staging_path:
+                    discard_columnar_cache(staging_path)
+                schema = demote_schema(schema, exc.column)
+                processor = DataProcessor(file_path, sheet_names=sheet_names, schema=schema)
+                detectors, checkpoint = _new_detectors(), None
+
+        profiler: ColumnProfiler = detectors["profiler"]
+        inconsistency_detector: InconsistencyDetector = detectors["inconsistency"]
+        consistency_checker: ConsistencyChecker = detectors["consistency"]
+        duplicate_detector: DuplicateDetector = detectors["duplicate"]
+        anomaly_detector: AnomalyDetector = detectors["anomaly"]
+
+        profiles, total_rows = profiler.build_profiles()
+        columns_count = len(profiles)
+        logger.info(
+            "Profiling completed dataset_id=%s total_rows=%d columns=%d",
+            dataset_id,
+            total_rows,
+            columns_count,
+        )
+
+        inconsistency_issues = inconsistency_detector.evaluate(profiles)
+        consistency_issues = consistency_checker.evaluate(profiles)
+        # Merge consistency issues into inconsistency issues so that
+        # downstream scoring and storage see a unified view.
+        for col, msgs in consistency_issues.items():
+            existing = inconsistency_issues.get(col, [])
+            inconsistency_issues[col] = existing + msgs
+        logger.info(
+            "Inconsistency detection completed dataset_id=%s columns_with_issues=%d",
+            dataset_id,
+            len(inconsistency_issues),
+        )
+
+        duplicate_stats = duplicate_detector.get_stats()
+        for col, pairs in duplicate_stats.get("fuzzy_duplicate_pairs_by_column", {}).items():
+            if col in profiles:
+                profiles[col]["fuzzy_duplicate_pairs"] = pairs
+        key_error_bounds = duplicate_stats.get("key_duplicate_error_bounds", {})
+        for col, count in duplicate_stats.get("key_duplicate_counts", {}).items():
+            if col in profiles:
+                profiles[col]["key_duplicate_count"] = int(count)
+                profiles[col]["key_duplicate_error_bound"] = float(key_error_bounds.get(col, 0.0))
+        is_approximate = bool(duplicate_stats.get("is_approximate", False))
+        duplicate_error_bound = float(duplicate_stats.get("duplicate_error_bound", 0.0))
+        logger.info(
+            "Duplicate detection completed dataset_id=%s duplicates=%d ratio=%.6f is_approximate=%s expected_error=%.6f error_bound=%.6f",
+            dataset_id,
+            int(duplicate_stats.get("duplicate_count", 0)),
+            float(duplicate_stats.get("duplicate_ratio", 0.0)),
+            is_approximate,
+            float(duplicate_stats.get("duplicate_expected_error", 0.0)),
+            duplicate_error_bound,
+        )
+
+        record_linkage = duplicate_stats.get("record_linkage")
+        if record_linkage is not None:
+            logger.info(
+                "Record linkage completed dataset_id=%s linked_rows=%d skipped_rows=%d candidate_pairs=%d matched_pairs=%d matched_rows=%d",
+                dataset_id,
+                record_linkage["linked_rows"],
+                record_linkage["skipped_rows"],
+                record_linkage["candidate_pairs"],
+                record_linkage["fuzzy_record_pairs"],
+                record_linkage["fuzzy_record_duplicates"],
+            )
+
+        anomaly_stats = anomaly_detector.compute_anomalies(profiles)
+        sample_size = int(anomaly_stats.get("sample_size", 0))
+        is_sampled = bool(total_rows and sample_size and total_rows > sample_size)
+        logger.info(
+            "Anomaly detection completed dataset_id=%s anomalies=%d ratio=%.6f sample_size=%d is_sampled=%s",
+            dataset_id,
+            int(anomaly_stats.get("anomaly_count", 0)),
+            float(anomaly_stats.get("anomaly_ratio", 0.0)),
+            sample_size,
+            is_sampled,
+        )
+
+        score, status, issue_summary = compute_reliability_score(
+            profiles=profiles,
+            inconsistency_issues=inconsistency_issues,
+            anomaly_stats=anomaly_stats,
+            duplicate_stats=duplicate_stats,
+        )
+        logger.info(
+            "Scoring completed dataset_id=%s reliability_score=%.2f status=%s",
+            dataset_id,
+            score,
+            status,
+        )
+
+        recommendations = _build_recommendations(
+            profiles, inconsistency_issues, anomaly_stats, duplicate_stats
+        )
+
+        result = AuditResult(
+            profiles=profiles,
+            inconsistency_issues=inconsistency_issues,
+            total_rows=total_rows,
+            columns_count=columns_count,
+            reliability_score=score,
+            status=status,
+            issue_summary=issue_summary,
+            anomaly_count=int(anomaly_stats.get("anomaly_count", 0)),
+            duplicate_count=int(duplicate_stats.get("duplicate_count", 0)),
+            recommendations=recommendations,
+            is_sampled=is_sampled,
+            sample_size=sample_size,
+            is_approximate=is_approximate,
+            duplicate_error_bound=duplicate_error_bound,
+            record_linkage=record_linkage,
+            schema=schema,
+        )
+        check_audit_lease(file_path, lease)
+        if cache_path:
+            result.columnar_path = publish_columnar_cache(cache_path, staging_path)
+        # Only a finished audit drops its checkpoint; a failed one keeps it
+        # so the retry can resume.
+        clear_checkpoint(file_path)
+        release_audit_lease(file_path, lease)
+        return result
+    except Exception:
+        if staging_path:
+            discard_columnar_cache(staging_path)
+        raise
+    finally:
+        detectors["duplicate"].close()
+
+
 def _build_recommendations(
     profiles: dict,
     inconsistency_issues: dict,
@@ -309,6 +732,13 @@ def _build_recommendations(
             "Significant duplicate records found; consider de-duplication strategies."
         )
 
+    linkage = duplicate_stats.get("record_linkage") or {}
+    if linkage.get("fuzzy_record_pairs", 0) > 0:
+        recs.append(
+            f"{linkage['fuzzy_record_pairs']} near-duplicate record pairs found on "
+            f"{', '.join(linkage.get('key_columns', []))}; review them for entity resolution."
+        )
+
     if not recs:
         recs.append("Dataset quality is generally good; monitor periodically.")
 
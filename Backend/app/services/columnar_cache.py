@@ -0,0 +1,108 @@
+import logging
+import os
+import shutil
+from typing import Dict, List, Optional
+
+from app.ai_modules.chunk_view import ChunkView
+from app.core.config import settings
+from app.services.arrow_csv import require_pyarrow
+from app.services.columnar_stream import parquet_parts
+from app.services.schema_inference import arrow_types
+
+
+logger = logging.getLogger(__name__)
+
+_STAGING_SUFFIX = ".tmp"
+
+
+def columnar_cache_path(storage_path: str) -> str:
+    """
+    Location of the columnar copy of an uploaded file: a directory of
+    Parquet part files next to it.
+    """
+    return storage_path + ".parquet"
+
+
+def columnar_staging_path(cache_path: str, lease: Optional[str] = None) -> str:
+    """
+    Directory the columnar copy is written to before it is published.
+    Each attempt of an audit job (``lease``) stages its own copy.
+    """
+    if lease is None:
+        return cache_path + _STAGING_SUFFIX
+    return f"{cache_path}.{lease}{_STAGING_SUFFIX}"
+
+
+def find_columnar_cache(storage_path: str, columnar_path: Optional[str]) -> Optional[str]:
+    """
+    The columnar copy to read instead of ``storage_path``, if it exists.
+    """
+    if columnar_path and os.path.isdir(columnar_path) and parquet_parts(columnar_path):
+        return columnar_path
+    return None
+
+
+class ColumnarCachePart:
+    """
+    Writes the chunks of one stretch of a dataset file to a Parquet part
+    file in ``staging_path``, the staging directory of its columnar copy.
+
+    Columns are stored with the types the CSV readers hand to the
+    detectors (int and float columns of ``schema``, strings otherwise), so
+    an audit of the copy matches an audit of the original. Dictionary
+    encoding and zstd keep the copy small.
+    """
+
+    def __init__(
+        self,
+        staging_path: str,
+        index: int,
+        column_names: List[str],
+        schema: Optional[Dict[str, str]] = None,
+    ) -> None:
+        pa = require_pyarrow()
+        import pyarrow.parquet as pq
+
+        self._schema = pa.schema(list(arrow_types(column_names, schema).items()))
+        os.makedirs(staging_path, exist_ok=True)
+        self.path = os.path.join(staging_path, f"part-{index:05d}.parquet")
+        self._writer = pq.ParquetWriter(
+            self.path, self._schema, compression=settings.columnar_cache_compression
+        )
+
+    def write(self, view: ChunkView) -> None:
+        pa = require_pyarrow()
+        batch = view.record_batch
+        if batch is None:
+            batch = pa.RecordBatch.from_pandas(
+                view.frame, schema=self._schema, preserve_index=False
+            )
+        elif batch.schema != self._schema:
+            batch = pa.RecordBatch.from_arrays(
+                [
+                    column.cast(field.type)
+                    for column, field in zip(batch.columns, self._schema)
+                ],
+                schema=self._schema,
+            )
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def publish_columnar_cache(cache_path: str, staging_path: str) -> str:
+    """
+    Move a fully written staging directory into place and return its path.
+    """
+    shutil.rmtree(cache_path, ignore_errors=True)
+    os.replace(staging_path, cache_path)
+    logger.info("Columnar copy written cache_path=%s", cache_path)
+    return cache_path
+
+
+def discard_columnar_cache(staging_path: str) -> None:
+    """
+    Drop a partly written columnar copy.
+    """
+    shutil.rmtree(staging_path, ignore_errors=True)
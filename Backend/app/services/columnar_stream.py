@@ -0,0 +1,212 @@
+from collections.abc import Generator
+from dataclasses import dataclass
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from app.services.arrow_csv import rebatch, require_pyarrow
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+logger = logging.getLogger(__name__)
+
+PARQUET_EXTENSIONS = (".parquet",)
+IPC_EXTENSIONS = (".feather", ".arrow")
+COLUMNAR_EXTENSIONS = PARQUET_EXTENSIONS + IPC_EXTENSIONS
+
+
+@dataclass
+class FooterStats:
+    """
+    Statistics of one column chunk, read from a Parquet row group footer.
+
+    ``min``/``max`` are only set for integer and floating point columns,
+    where they equal the minimum/maximum of the decoded numeric values.
+    """
+
+    num_rows: int
+    null_count: Optional[int] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+def parquet_parts(file_path: str) -> List[str]:
+    """
+    The files of a Parquet dataset: the file itself, or the ``*.parquet``
+    part files of a directory in name order.
+    """
+    if not os.path.isdir(file_path):
+        return [file_path]
+    return [
+        os.path.join(file_path, name)
+        for name in sorted(os.listdir(file_path))
+        if name.endswith(".parquet")
+    ]
+
+
+def _check_columns(available: Sequence[str], columns: Optional[Sequence[str]]) -> None:
+    if columns is None:
+        return
+    missing = [col for col in columns if col not in available]
+    if missing:
+        raise ValueError(f"Column(s) not found: {', '.join(missing)}")
+
+
+def _row_group_stats(
+    metadata: "pa.parquet.FileMetaData",
+    row_group: int,
+    columns: Sequence[str],
+) -> Dict[str, FooterStats]:
+    """
+    Collect the footer statistics of the flat columns of one row group.
+    """
+    pa = require_pyarrow()
+    group = metadata.row_group(row_group)
+    schema = metadata.schema.to_arrow_schema()
+    wanted = set(columns)
+    stats: Dict[str, FooterStats] = {}
+    for i in range(group.num_columns):
+        chunk = group.column(i)
+        # Nested columns have one entry per leaf (``a.list.element``).
+        name = chunk.path_in_schema
+        if name not in wanted or chunk.statistics is None:
+            continue
+        raw = chunk.statistics
+        entry = FooterStats(num_rows=group.num_rows)
+        if raw.has_null_count:
+            entry.null_count = raw.null_count
+        field_type = schema.field(name).type
+        numeric = pa.types.is_integer(field_type) or pa.types.is_floating(field_type)
+        if numeric and raw.has_min_max:
+            entry.min, entry.max = float(raw.min), float(raw.max)
+        stats[name] = entry
+    return stats
+
+
+def iter_parquet_batches(
+    file_path: str,
+    batch_size: int,
+    columns: Optional[Sequence[str]] = None,
+    start_row: int = 0,
+    memory_map: bool = True,
+) -> Generator[Tuple["pa.RecordBatch", Dict[str, FooterStats]], None, None]:
+    """
+    Stream a Parquet file (or a directory of part files, see
+    :func:`parquet_parts`) one row group at a time.
+
+    Each row group is read with only the requested ``columns`` and split
+    into record batches of at most ``batch_size`` rows, which are yielded
+    with the footer statistics of their row group. Row groups that lie
+    wholly before ``start_row`` are skipped without being read. With
+    ``memory_map`` column chunks are decoded straight from the mapped file.
+    """
+    require_pyarrow()
+    import pyarrow.parquet as pq
+
+    to_skip = start_row
+    for path in parquet_parts(file_path):
+        parquet_file = pq.ParquetFile(path, memory_map=memory_map)
+        metadata = parquet_file.metadata
+        names = parquet_file.schema_arrow.names
+        _check_columns(names, columns)
+        selected = list(columns) if columns is not None else names
+
+        for row_group in range(metadata.num_row_groups):
+            group_rows = metadata.row_group(row_group).num_rows
+            if to_skip >= group_rows:
+                to_skip -= group_rows
+                continue
+            table = parquet_file.read_row_group(row_group, columns=selected)
+            if to_skip:
+                table = table.slice(to_skip)
+                to_skip = 0
+            stats = _row_group_stats(metadata, row_group, selected)
+            for batch in table.combine_chunks().to_batches(max_chunksize=batch_size):
+                yield batch, stats
+
+
+def _open_ipc(file_path: str, memory_map: bool = True) -> Tuple[Any, Any]:
+    """
+    Open an Arrow IPC file (Feather V2) or, failing that, an IPC stream
+    over a memory map (or a plain file). Returns the reader and the source.
+    """
+    pa = require_pyarrow()
+    source = pa.memory_map(file_path) if memory_map else pa.OSFile(file_path)
+    try:
+        return pa.ipc.open_file(source), source
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source), source
+
+
+def _iter_ipc_source(reader: Any) -> Generator["pa.RecordBatch", None, None]:
+    if hasattr(reader, "get_batch"):
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+    else:
+        yield from reader
+
+
+def iter_ipc_batches(
+    file_path: str,
+    batch_size: int,
+    columns: Optional[Sequence[str]] = None,
+    start_row: int = 0,
+    memory_map: bool = True,
+) -> Generator["pa.RecordBatch", None, None]:
+    """
+    Stream an Arrow IPC / Feather V2 file as record batches of
+    ``batch_size`` rows.
+
+    With ``memory_map`` the batches of an uncompressed file reference the
+    mapped pages directly, so concurrent readers share the page cache and
+    columns that are not selected are never paged in. Otherwise every
+    batch is read into process memory. Compressed files are decompressed
+    batch by batch.
+    """
+    reader, source = _open_ipc(file_path, memory_map)
+    try:
+        names = reader.schema.names
+        _check_columns(names, columns)
+
+        def projected() -> Generator["pa.RecordBatch", None, None]:
+            to_skip = start_row
+            for batch in _iter_ipc_source(reader):
+                if to_skip >= batch.num_rows:
+                    to_skip -= batch.num_rows
+                    continue
+                if to_skip:
+                    batch = batch.slice(to_skip)
+                    to_skip = 0
+                yield batch.select(list(columns)) if columns is not None else batch
+
+        yield from rebatch(projected(), batch_size)
+    finally:
+        source.close()
+
+
+def read_columnar_metadata(file_path: str) -> Tuple[int, List[str]]:
+    """
+    Return the row count and column names of a Parquet or IPC file from
+    its footer (IPC streams without a footer are scanned batch by batch).
+    """
+    require_pyarrow()
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+
+        rows, names = 0, []
+        for path in parquet_parts(file_path):
+            parquet_file = pq.ParquetFile(path)
+            rows += parquet_file.metadata.num_rows
+            names = parquet_file.schema_arrow.names
+        return rows, names
+
+    reader, source = _open_ipc(file_path)
+    try:
+        rows = sum(batch.num_rows for batch in _iter_ipc_source(reader))
+        return rows, reader.schema.names
+    finally:
+        source.close()
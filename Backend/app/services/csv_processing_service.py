@@ -5,6 +5,8 @@ import logging
 import pandas as pd
 
 from app.core.config import settings
+from app.services.arrow_csv import iter_csv_record_batches
+from app.services.csv_ranges import count_csv_rows, read_csv_header
 
 
 logger = logging.getLogger(__name__)
@@ -30,8 +32,14 @@ class CsvChunkProcessor:
         Iterate over the CSV file yielding DataFrame chunks.
 
         Uses dtype=object to avoid unintended type coercion and on_bad_lines="warn"
-        to gracefully handle malformed rows.
+        to gracefully handle malformed rows. With the arrow engine the file is
+        parsed by Arrow's multi-threaded reader into the same object columns.
         """
+        if settings.csv_engine == "arrow":
+            for batch in iter_csv_record_batches(self.file_path, self.chunk_size):
+                yield batch.to_pandas()
+            return
+
         reader = pd.read_csv(
             self.file_path,
             chunksize=self.chunk_size,
@@ -44,13 +52,8 @@ class CsvChunkProcessor:
 
     def get_basic_stats(self) -> Tuple[int, List[str]]:
         """
-        Return total row count and column names by iterating over all chunks.
+        Return total row count and column names from the header record and
+        a quote-aware count of record ends, without parsing the rows.
         """
-        total_rows = 0
-        columns: List[str] = []
-        for i, chunk in enumerate(self.iter_chunks()):
-            if i == 0:
-                columns = list(chunk.columns)
-            total_rows += len(chunk)
-        return total_rows, columns
+        return count_csv_rows(self.file_path), read_csv_header(self.file_path)
 
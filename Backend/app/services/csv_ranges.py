@@ -0,0 +1,233 @@
+import csv
+import io
+import mmap
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+from app.utils.column_names import dedupe_column_names
+from app.utils.compression import open_input, open_text_input
+
+
+# Characters of lines that pd.read_csv skips as blank.
+_BLANK = b" \t\r"
+_BLANK_BYTES = np.frombuffer(_BLANK, dtype=np.uint8)
+
+
+def read_csv_header(file_path: str) -> List[str]:
+    """
+    Column names of a CSV file, de-duplicated like ``pd.read_csv`` does.
+    """
+    with open_text_input(file_path, newline="") as handle:
+        return dedupe_column_names(next(csv.reader(handle), []))
+
+
+def _even_newlines(block: bytes, quotes_before: int) -> np.ndarray:
+    """
+    Offsets in ``block`` of newlines that end a record, i.e. that are not
+    inside a quoted field given ``quotes_before`` quotes earlier in the file.
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord("\n"))
+    if not newlines.size:
+        return newlines
+    quotes = np.flatnonzero(data == ord('"'))
+    parity = (quotes_before + np.searchsorted(quotes, newlines)) % 2
+    return newlines[parity == 0]
+
+
+def count_csv_rows(file_path: str, block_size: int = 8 << 20) -> int:
+    """
+    Count the data rows of a CSV file from its raw bytes, without parsing
+    any field.
+
+    Records end at newlines outside quoted fields (see
+    :func:`_even_newlines`); the header record and blank lines (empty or
+    holding only spaces, tabs and carriage returns) are not counted, like
+    ``pd.read_csv`` does. Malformed rows that the readers would skip are
+    counted. Compressed files are decompressed as a stream.
+    """
+    records = 0
+    quotes_before = 0
+    # Offset just past the previous record end, and whether the record
+    # being read so far holds anything besides blank characters.
+    record_start = 0
+    pending = False
+    offset = 0
+    with open_input(file_path) as handle:
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            ends = _even_newlines(block, quotes_before)
+            if ends.size:
+                # The first record may have started in an earlier block,
+                # whose part of it is summed up in ``pending``.
+                starts = np.concatenate(([max(record_start - offset, 0)], ends[:-1] + 1))
+                non_blank = ends > starts
+                # Only a record starting with a blank character can be
+                # blank throughout; those few are checked one by one.
+                data = np.frombuffer(block, dtype=np.uint8)
+                maybe_blank = non_blank & np.isin(data[starts], _BLANK_BYTES)
+                for i in np.flatnonzero(maybe_blank):
+                    non_blank[i] = bool(block[starts[i] : ends[i]].strip(_BLANK))
+                non_blank[0] |= pending
+                records += int(non_blank.sum())
+                record_start = offset + int(ends[-1]) + 1
+                pending = False
+            tail = block[record_start - offset :] if record_start > offset else block
+            pending = pending or bool(tail.strip(_BLANK))
+            quotes_before += block.count(b'"')
+            offset += len(block)
+    # A last record without a trailing newline.
+    records += pending
+    return max(records - 1, 0)
+
+
+def csv_records_end(file_path: str, records: int, block_size: int = 1 << 20) -> int:
+    """
+    Byte offset just past the first ``records`` records (the header
+    included) of an uncompressed CSV file, or its size if it has fewer.
+    Blank lines count as records here.
+    """
+    offset = 0
+    quotes_before = 0
+    with open(file_path, "rb") as handle:
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                return offset
+            ends = _even_newlines(block, quotes_before)
+            if ends.size >= records:
+                return offset + int(ends[records - 1]) + 1
+            records -= int(ends.size)
+            quotes_before += block.count(b'"')
+            offset += len(block)
+
+
+def split_csv_ranges(
+    file_path: str,
+    parts: int,
+    block_size: int = 8 << 20,
+) -> List[Tuple[int, int]]:
+    """
+    Split the data rows of a CSV file into about ``parts`` byte ranges that
+    each start and end on a record boundary.
+
+    A newline ends a record only outside a quoted field, i.e. when an even
+    number of quote characters precede it (an escaped quote is written as
+    two quotes, which keeps the parity). The file is scanned once counting
+    quotes; only blocks holding a split point are inspected newline by
+    newline. The first range starts after the header record.
+    """
+    size = os.path.getsize(file_path)
+    targets = [size * i // parts for i in range(1, parts)] if parts > 1 else []
+    boundaries: List[int] = []
+    header_end = None
+
+    with open(file_path, "rb") as handle:
+        offset = 0
+        quotes_before = 0
+        while header_end is None or targets:
+            block = handle.read(block_size)
+            if not block:
+                break
+            wanted = header_end is None or (targets and targets[0] < offset + len(block))
+            if wanted:
+                ends = _even_newlines(block, quotes_before) + offset + 1
+                if header_end is None and ends.size:
+                    header_end = int(ends[0])
+                    targets = [t for t in targets if t > header_end]
+                while targets and header_end is not None:
+                    idx = np.searchsorted(ends, targets[0] + 1)
+                    if idx == ends.size:
+                        break
+                    end = int(ends[idx])
+                    if not boundaries or end > boundaries[-1]:
+                        boundaries.append(end)
+                    targets = [t for t in targets if t >= end]
+            quotes_before += block.count(b'"')
+            offset += len(block)
+
+    if header_end is None:
+        # A header without a trailing newline and no data rows.
+        return []
+    starts = [header_end] + [b for b in boundaries if b < size]
+    ends = starts[1:] + [size]
+    return [(start, end) for start, end in zip(starts, ends) if end > start]
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """
+    Read-only file object exposing bytes ``[start, end)`` of a file.
+    """
+
+    def __init__(self, file_path: str, start: int, end: int) -> None:
+        self._handle = open(file_path, "rb")
+        self._handle.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        view = memoryview(buffer)[: self._remaining]
+        read = self._handle.readinto(view)
+        self._remaining -= read
+        return read
+
+    def close(self) -> None:
+        self._handle.close()
+        super().close()
+
+
+class _MappedRangeReader(io.RawIOBase):
+    """
+    Read-only file object exposing bytes ``[start, end)`` of a
+    memory-mapped file, so readers of the same file share its page cache.
+    """
+
+    def __init__(self, file_path: str, start: int, end: int) -> None:
+        with open(file_path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._position = start
+        self._end = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._end - self._position)
+        if size <= 0:
+            return 0
+        with memoryview(self._map) as mapped:
+            memoryview(buffer)[:size] = mapped[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        self._map.close()
+        super().close()
+
+
+def open_csv_range(
+    file_path: str,
+    start: int,
+    end: int,
+    memory_map: bool = False,
+) -> io.BufferedReader:
+    """
+    Open bytes ``[start, end)`` of a file as a buffered binary stream,
+    read through a memory map when ``memory_map`` is set.
+
+    An empty range or file is read without a memory map, as ``mmap``
+    cannot map an empty file.
+    """
+    if memory_map and end > start and os.path.getsize(file_path) > 0:
+        reader_cls = _MappedRangeReader
+    else:
+        reader_cls = _ByteRangeReader
+    return io.BufferedReader(reader_cls(file_path, start, end), buffer_size=1 << 20)
@@ -1,71 +1,364 @@
 from collections.abc import Generator
-from typing import List, Tuple
-import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+import itertools
+import json
 import logging
+import os
 import pandas as pd
 
+from app.ai_modules.chunk_view import ChunkView
 from app.core.config import settings
+from app.services.arrow_csv import iter_csv_record_batches
+from app.services.columnar_stream import (
+    IPC_EXTENSIONS,
+    PARQUET_EXTENSIONS,
+    iter_ipc_batches,
+    iter_parquet_batches,
+    read_columnar_metadata,
+)
+from app.services.csv_ranges import (
+    count_csv_rows,
+    open_csv_range,
+    read_csv_header,
+    split_csv_ranges,
+)
+from app.services.json_stream import iter_json_array, records_to_frames, sniff_json_layout
+from app.services.schema_inference import (
+    TYPED_READ_TYPES,
+    SchemaMismatchError,
+    arrow_types,
+    pandas_dtypes,
+    schema_mismatch,
+)
+from app.services.xlsx_stream import iter_xlsx_frames
+from app.utils.compression import (
+    STREAMABLE_EXTENSIONS,
+    data_extension,
+    open_input,
+    open_text_input,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
 class DataProcessor:
     """
-    Universal data utility to stream CSV, JSON, or XLSX files using pandas.
+    Universal data utility to stream CSV, JSON/NDJSON, XLSX, Parquet or
+    Arrow IPC/Feather files.
+
+    ``columns`` restricts chunks to those columns. Parquet and IPC files
+    only read the selected columns from disk; for CSV the other fields are
+    tokenized but not converted.
+
+    ``byte_range`` limits a CSV file to the records in one range from
+    :meth:`split_ranges`, so ranges can be parsed by separate processes.
+
+    CSV and JSON/NDJSON files may be gzip, zstd, bz2 or single-file ZIP
+    compressed (``data.csv.gz``); they are decompressed as a stream while
+    chunks are read, never to disk.
+
+    ``schema`` (from :func:`infer_schema`) parses the int and float columns
+    of a CSV file natively instead of as strings. A value that does not
+    parse raises :class:`SchemaMismatchError`.
+
+    Uncompressed CSV, Parquet and IPC files are read through memory maps
+    when ``memory_map_reads`` is set, so concurrent readers of a dataset
+    share the page cache instead of each holding read buffers.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(
+        self,
+        file_path: str,
+        sheet_names: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        byte_range: Optional[Tuple[int, int]] = None,
+        schema: Optional[Dict[str, str]] = None,
+    ):
         self.file_path = file_path
+        self.sheet_names = sheet_names
+        self.columns = list(columns) if columns is not None else None
+        self.byte_range = byte_range
+        self.schema = schema
         self.chunk_size = settings.csv_chunk_size
-        self.extension = os.path.splitext(file_path)[1].lower()
+        self.extension, self.compression = data_extension(file_path)
+        self.csv_engine = settings.csv_engine
+        # Compressed input has to be decompressed into process memory.
+        self.memory_map = settings.memory_map_reads and not self.compression
+        if self.compression and self.extension not in STREAMABLE_EXTENSIONS:
+            raise ValueError(
+                f"Compressed {self.extension or 'archive'} files are not supported; "
+                f"only {', '.join(STREAMABLE_EXTENSIONS)} can be compressed"
+            )
         
         logger.info(
-            "Initializing DataProcessor file_path=%s ext=%s chunk_size=%d",
+            "Initializing DataProcessor file_path=%s ext=%s compression=%s chunk_size=%d csv_engine=%s",
             self.file_path,
             self.extension,
+            self.compression,
             self.chunk_size,
+            self.csv_engine,
         )
 
-    def iter_chunks(self) -> Generator[pd.DataFrame, None, None]:
+    def iter_views(self, start_row: int = 0) -> Generator[ChunkView, None, None]:
+        """
+        Iterate over the file yielding a decoded ChunkView per chunk.
+
+        With the arrow CSV engine and for Parquet/IPC files the views wrap
+        Arrow record batches directly (Parquet batches with their row group
+        footer statistics); every other path wraps the chunks of
+        :meth:`iter_chunks`.
+        """
+        if self.extension in PARQUET_EXTENSIONS:
+            for batch, stats in iter_parquet_batches(
+                self.file_path,
+                self.chunk_size,
+                columns=self.columns,
+                start_row=start_row,
+                memory_map=self.memory_map,
+            ):
+                yield ChunkView.from_record_batch(batch, footer_stats=stats)
+            return
+
+        if self.extension in IPC_EXTENSIONS:
+            for batch in iter_ipc_batches(
+                self.file_path,
+                self.chunk_size,
+                columns=self.columns,
+                start_row=start_row,
+                memory_map=self.memory_map,
+            ):
+                yield ChunkView.from_record_batch(batch)
+            return
+
+        if self.extension == '.csv' and self.csv_engine == "arrow":
+            for batch in self._iter_arrow_csv_batches(start_row):
+                yield ChunkView.from_record_batch(batch)
+            return
+
+        for chunk in self.iter_chunks(start_row=start_row):
+            yield ChunkView(chunk)
+
+    def iter_chunks(self, start_row: int = 0) -> Generator[pd.DataFrame, None, None]:
         """
         Iterate over the file yielding DataFrame chunks.
+
+        ``start_row`` skips that many data rows, used to resume an audit from
+        a checkpoint. For CSV the skipped records are tokenized but never
+        turned into DataFrames. Lines dropped by ``on_bad_lines`` are not
+        counted as rows, so a resume after bad lines restarts slightly early.
         """
         try:
-            if self.extension == '.csv':
-                reader = pd.read_csv(
+            if self.extension == '.csv' and self.csv_engine == "arrow":
+                for batch in self._iter_arrow_csv_batches(start_row):
+                    yield batch.to_pandas()
+
+            elif self.extension == '.csv':
+                yield from self._iter_csv_chunks(start_row)
+
+            elif self.extension in PARQUET_EXTENSIONS:
+                for batch, _ in iter_parquet_batches(
                     self.file_path,
-                    chunksize=self.chunk_size,
-                    iterator=True,
-                    dtype=object,
-                    on_bad_lines="warn",
-                )
-                for chunk in reader:
-                    yield chunk
-            
-            elif self.extension == '.json':
-                # For JSON, we might have different formats. Assuming records format.
-                # read_json doesn't support chunksize directly for all orientations.
-                # If it's small (max 5MB), we can read all and yield.
-                df = pd.read_json(self.file_path, orient='records', dtype=object)
-                for i in range(0, len(df), self.chunk_size):
-                    yield df.iloc[i:i + self.chunk_size]
-            
-            elif self.extension == '.xlsx':
-                # Similar to JSON, read_excel doesn't support chunksize.
-                df = pd.read_excel(self.file_path, dtype=object)
-                for i in range(0, len(df), self.chunk_size):
-                    yield df.iloc[i:i + self.chunk_size]
-            
+                    self.chunk_size,
+                    columns=self.columns,
+                    start_row=start_row,
+                    memory_map=self.memory_map,
+                ):
+                    yield batch.to_pandas()
+
+            elif self.extension in IPC_EXTENSIONS:
+                for batch in iter_ipc_batches(
+                    self.file_path,
+                    self.chunk_size,
+                    columns=self.columns,
+                    start_row=start_row,
+                    memory_map=self.memory_map,
+                ):
+                    yield batch.to_pandas()
+
+            elif self.extension in ('.ndjson', '.jsonl', '.json', '.xlsx'):
+                for chunk in self._iter_document_chunks(start_row):
+                    yield chunk if self.columns is None else self._project(chunk)
+
             else:
                 raise ValueError(f"Unsupported file format: {self.extension}")
-                
+
         except Exception as e:
             logger.error(f"Failed to process data stream: {e}")
             raise
 
+    def _check_typed_read(self) -> bool:
+        """
+        Whether CSV columns are parsed with types from :attr:`schema`.
+        Projected columns are checked up front, so that any later parse
+        error can be blamed on a typed column.
+        """
+        if not any(kind in TYPED_READ_TYPES for kind in (self.schema or {}).values()):
+            return False
+        if self.columns is not None:
+            header = read_csv_header(self.file_path)
+            missing = [col for col in self.columns if col not in header]
+            if missing:
+                raise ValueError(f"Column(s) not found: {', '.join(missing)}")
+        return True
+
+    def _iter_arrow_csv_batches(self, start_row: int) -> Generator["pa.RecordBatch", None, None]:
+        typed = self._check_typed_read()
+        header = read_csv_header(self.file_path)
+        try:
+            yield from iter_csv_record_batches(
+                self.file_path,
+                self.chunk_size,
+                skip_rows=start_row,
+                columns=self.columns,
+                byte_range=self.byte_range,
+                memory_map=self.memory_map,
+                column_types=arrow_types(header, self.schema) if typed else None,
+            )
+        except ValueError as exc:
+            if not typed:
+                raise
+            raise schema_mismatch(exc, header) from exc
+
+    def _iter_csv_chunks(self, start_row: int) -> Generator[pd.DataFrame, None, None]:
+        typed = self._check_typed_read()
+        try:
+            yield from self._read_csv_chunks(start_row, typed)
+        except (ValueError, TypeError) as exc:
+            if not typed or isinstance(exc, SchemaMismatchError):
+                raise
+            raise schema_mismatch(exc, []) from exc
+
+    def _read_csv_chunks(self, start_row: int, typed: bool) -> Generator[pd.DataFrame, None, None]:
+        skiprows = range(1, start_row + 1) if start_row else None
+        if self.compression:
+            source, options = open_input(self.file_path), {}
+        elif self.byte_range is None:
+            # mmap cannot map an empty file.
+            memory_map = self.memory_map and os.path.getsize(self.file_path) > 0
+            source, options = self.file_path, dict(memory_map=memory_map)
+        else:
+            # A range holds no header line: name the columns from the file's.
+            source = open_csv_range(
+                self.file_path, *self.byte_range, memory_map=self.memory_map
+            )
+            options = dict(header=None, names=read_csv_header(self.file_path), index_col=False)
+            skiprows = range(start_row) if start_row else None
+        try:
+            reader = pd.read_csv(
+                source,
+                chunksize=self.chunk_size,
+                iterator=True,
+                dtype=pandas_dtypes(self.schema) if typed else object,
+                on_bad_lines="warn",
+                skiprows=skiprows,
+                usecols=self.columns,
+                **options,
+            )
+            for chunk in reader:
+                yield chunk if self.columns is None else chunk[self.columns]
+        finally:
+            if source is not self.file_path:
+                source.close()
+
+    def split_ranges(self, parts: int) -> List[Tuple[int, int]]:
+        """
+        Split a CSV file into about ``parts`` record-aligned byte ranges
+        for :attr:`byte_range`.
+        """
+        if self.extension != '.csv' or self.compression:
+            raise ValueError("Only uncompressed CSV files can be split into byte ranges")
+        return split_csv_ranges(self.file_path, parts)
+
+    def _project(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select ``self.columns`` from a chunk. JSON records need not all
+        share the same keys, so absent JSON columns come back empty.
+        """
+        if self.extension == '.xlsx':
+            missing = [col for col in self.columns if col not in chunk.columns]
+            if missing:
+                raise ValueError(f"Column(s) not found: {', '.join(missing)}")
+        return chunk.reindex(columns=self.columns)
+
+    def _iter_document_chunks(self, start_row: int) -> Generator[pd.DataFrame, None, None]:
+        """
+        Chunks of JSON/NDJSON and XLSX files, which are parsed row by row.
+        """
+        if self.extension in ('.ndjson', '.jsonl'):
+            yield from records_to_frames(
+                self._iter_json_lines(start_row), self.chunk_size
+            )
+
+        elif self.extension == '.json':
+            layout = sniff_json_layout(self.file_path)
+            if layout == "array":
+                records = itertools.islice(iter_json_array(self.file_path), start_row, None)
+                yield from records_to_frames(records, self.chunk_size)
+            elif layout == "lines":
+                yield from records_to_frames(
+                    self._iter_json_lines(start_row), self.chunk_size
+                )
+            else:
+                # Other layouts (e.g. a single object of columns) cannot
+                # be streamed and are loaded whole.
+                with open_text_input(self.file_path) as handle:
+                    df = pd.read_json(handle, orient='records', dtype=object)
+                for i in range(start_row, len(df), self.chunk_size):
+                    yield df.iloc[i:i + self.chunk_size]
+
+        else:
+            yield from iter_xlsx_frames(
+                self.file_path,
+                self.chunk_size,
+                sheet_names=self.sheet_names,
+                start_row=start_row,
+            )
+
+    def _iter_json_lines(self, start_row: int = 0) -> Generator[object, None, None]:
+        """
+        Decode newline-delimited JSON one record at a time, skipping blank
+        lines and the first ``start_row`` records without parsing them.
+        """
+        with open_text_input(self.file_path) as handle:
+            skipped = 0
+            for line in handle:
+                if not line.strip():
+                    continue
+                if skipped < start_row:
+                    skipped += 1
+                    continue
+                yield json.loads(line)
+
+    @property
+    def has_fast_stats(self) -> bool:
+        """
+        Whether :meth:`get_basic_stats` answers from metadata and raw bytes
+        alone, quickly enough to run at upload time.
+        """
+        if self.extension in PARQUET_EXTENSIONS + IPC_EXTENSIONS:
+            return True
+        return self.extension == '.csv' and not self.compression
+
     def get_basic_stats(self) -> Tuple[int, List[str]]:
         """
         Return total row count and column names.
+
+        Parquet and IPC files answer this from their footer and CSV files
+        from their header record and a quote-aware count of record ends
+        (:func:`count_csv_rows`), without parsing any data. JSON and XLSX
+        files are read chunk by chunk.
         """
+        if self.extension in PARQUET_EXTENSIONS + IPC_EXTENSIONS:
+            total_rows, columns = read_columnar_metadata(self.file_path)
+            return total_rows, columns if self.columns is None else list(self.columns)
+        if self.extension == '.csv' and self.byte_range is None:
+            columns = read_csv_header(self.file_path)
+            return (
+                count_csv_rows(self.file_path),
+                columns if self.columns is None else list(self.columns),
+            )
         total_rows = 0
         columns: List[str] = []
         for i, chunk in enumerate(self.iter_chunks()):
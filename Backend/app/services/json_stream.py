@@ -0,0 +1,128 @@
+from collections.abc import Generator, Iterable
+import json
+from typing import Any, List
+
+import pandas as pd
+
+from app.utils.compression import open_text_input
+
+
+_WHITESPACE = " \t\n\r"
+
+
+def sniff_json_layout(file_path: str, probe_size: int = 1 << 20) -> str:
+    """
+    Classify a ``.json`` file as ``"array"`` (a top-level JSON array),
+    ``"lines"`` (newline-delimited JSON) or ``"document"`` (anything else,
+    e.g. a single object).
+    """
+    with open_text_input(file_path) as handle:
+        head = handle.read(probe_size)
+
+    text = head.lstrip(_WHITESPACE)
+    if text.startswith("["):
+        return "array"
+    if not text.startswith("{"):
+        return "document"
+
+    # Several objects, one per line, means NDJSON; a single object does not.
+    first_line = text.split("\n", 1)
+    try:
+        json.loads(first_line[0])
+    except json.JSONDecodeError:
+        return "document"
+    rest = first_line[1].lstrip(_WHITESPACE) if len(first_line) > 1 else ""
+    return "lines" if rest.startswith("{") else "document"
+
+
+def iter_json_array(
+    file_path: str,
+    read_size: int = 1 << 20,
+) -> Generator[Any, None, None]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    The file is read in ``read_size`` blocks into a sliding buffer and each
+    element is decoded with ``json.JSONDecoder.raw_decode``. Consumed text
+    is dropped from the buffer, so memory is bounded by the block size plus
+    the largest single element, not by the file size.
+    """
+    decoder = json.JSONDecoder()
+    with open_text_input(file_path) as handle:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            block = handle.read(read_size)
+            if not block:
+                eof = True
+                return False
+            buffer = buffer[pos:] + block
+            pos = 0
+            return True
+
+        def skip(chars: str) -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in chars:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip(_WHITESPACE)
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise ValueError("JSON file does not contain a top-level array")
+        pos += 1
+
+        expect_value = True
+        first = True
+        while True:
+            skip(_WHITESPACE)
+            if pos >= len(buffer):
+                raise ValueError("Unexpected end of JSON array")
+            char = buffer[pos]
+            if char == "]" and (not expect_value or first):
+                return
+            if char == "," and not expect_value:
+                expect_value = True
+                pos += 1
+                continue
+            if not expect_value or char in ",]":
+                raise ValueError(f"Unexpected {char!r} in JSON array")
+
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                # A value ending exactly at the buffer edge may be cut short
+                # (e.g. the number 12 of 12345): read on before accepting it.
+                if end >= len(buffer) and not eof and fill():
+                    continue
+                break
+            yield value
+            pos = end
+            expect_value = False
+            first = False
+
+
+def records_to_frames(
+    records: Iterable[Any],
+    chunk_size: int,
+) -> Generator[pd.DataFrame, None, None]:
+    """
+    Group decoded JSON records into object-typed DataFrames of
+    ``chunk_size`` rows.
+    """
+    batch: List[Any] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == chunk_size:
+            yield pd.DataFrame(batch, dtype=object)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, dtype=object)
@@ -0,0 +1,241 @@
+import io
+import logging
+import os
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from app.ai_modules.common import infer_column_types
+from app.core.config import settings
+from app.services.csv_ranges import csv_records_end, read_csv_header
+from app.utils.compression import data_extension, open_input
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_TYPES = ("int", "float", "bool", "datetime", "category", "string")
+
+# Types the readers parse natively; every other column is read as text.
+TYPED_READ_TYPES = ("int", "float")
+
+# Integers written the way they print back: no sign but "-", no leading zeros.
+_INT_PATTERN = r"0|-?[1-9]\d*"
+_BOOL_VALUES = ("true", "false")
+_ARROW_COLUMN = re.compile(r"In CSV column #(\d+)")
+
+
+class SchemaMismatchError(ValueError):
+    """
+    A value of a typed column failed to parse as the type inferred from
+    the samples. ``column`` is None when the reader does not say which
+    column failed.
+    """
+
+    def __init__(self, column: Optional[str], message: str) -> None:
+        super().__init__(message)
+        self.column = column
+
+    def __reduce__(self):
+        # Raised in range worker processes and re-raised in the parent.
+        return type(self), (self.column, str(self))
+
+
+def infer_type(sample: pd.Series) -> str:
+    """
+    Infer the storage type of a column from a sample of its values.
+
+    Builds on ``infer_column_types``: numeric columns become ``int`` or
+    ``float`` when every sampled value round-trips, i.e. prints back as
+    the same text once parsed (otherwise ``string``, so "02134" and
+    "2134" or "1.50" and "1.5" stay different values). Categorical ones
+    become ``bool``, ``category`` (at most half of the sampled values
+    distinct) or ``string``.
+    """
+    kind = infer_column_types(sample)
+    non_null = sample.dropna()
+    if kind == "unknown":
+        return "string"
+    if kind == "datetime":
+        return "datetime"
+
+    if kind == "numeric":
+        if pd.api.types.is_integer_dtype(non_null.dtype):
+            return "int"
+        if pd.api.types.is_numeric_dtype(non_null.dtype):
+            return "float"
+        text = non_null.astype(str)
+        numeric = pd.to_numeric(text, errors="coerce")
+        if numeric.isna().any():
+            return "string"
+        if text.str.fullmatch(_INT_PATTERN).all() and numeric.abs().max() < 2**63:
+            return "int"
+        # Floats print back in Python's shortest form ("1.5", "2.0", "1e-07").
+        if (numeric.astype(float).astype(str) == text).all():
+            return "float"
+        return "string"
+
+    if pd.api.types.is_bool_dtype(non_null.dtype):
+        return "bool"
+    text = non_null.astype(str)
+    if text.str.lower().isin(_BOOL_VALUES).all():
+        return "bool"
+    if text.nunique() <= len(text) // 2:
+        return "category"
+    return "string"
+
+
+def _sample_csv_offsets(
+    file_path: str,
+    header: List[str],
+    offsets: int,
+    rows_per_offset: int,
+    start: int,
+) -> List[pd.DataFrame]:
+    """
+    Parse a few records at ``offsets`` points spread over a CSV file,
+    after byte ``start`` (the end of the head rows sampled already).
+
+    A point inside bytes an earlier read covered moves past them, so
+    records of small files are not sampled twice. A read at any other
+    point starts after the first newline past it; if that falls inside a
+    quoted field the records can be misaligned, and records with the
+    wrong number of fields are dropped.
+    """
+    size = os.path.getsize(file_path)
+    block_size = 64 << 10
+    sampled_end = start
+    frames = []
+    with open(file_path, "rb") as handle:
+        for i in range(1, offsets + 1):
+            position = max(size * i // (offsets + 1), sampled_end)
+            if position >= size:
+                break
+            handle.seek(position)
+            block = handle.read(block_size)
+            first = 0 if position == sampled_end else block.find(b"\n") + 1
+            end = block.rfind(b"\n") + 1
+            sampled_end = position + (end or len(block))
+            if end <= first:
+                continue
+            try:
+                frame = pd.read_csv(
+                    io.BytesIO(block[first:end]),
+                    header=None,
+                    names=header,
+                    index_col=False,
+                    dtype=object,
+                    nrows=rows_per_offset,
+                    on_bad_lines="skip",
+                )
+            except (ValueError, UnicodeDecodeError):
+                continue
+            frames.append(frame)
+    return frames
+
+
+def sample_rows(file_path: str, sheet_names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Sample rows of a dataset file for schema inference: the first
+    ``schema_sample_rows`` rows and, for uncompressed CSV files, as many
+    more spread over ``schema_sample_offsets`` points of the file.
+    """
+    from app.services.data_processing_service import DataProcessor
+
+    limit = settings.schema_sample_rows
+    extension, compression = data_extension(file_path)
+    if extension != ".csv":
+        chunk = next(DataProcessor(file_path, sheet_names=sheet_names).iter_chunks(), None)
+        return chunk.head(limit) if chunk is not None else pd.DataFrame()
+
+    source = open_input(file_path) if compression else file_path
+    try:
+        head = pd.read_csv(source, nrows=limit, dtype=object, on_bad_lines="skip")
+    finally:
+        if source is not file_path:
+            source.close()
+    offsets = settings.schema_sample_offsets
+    if compression or not offsets or len(head) < limit:
+        # A head shorter than the limit already holds the whole file.
+        return head
+    header = read_csv_header(file_path)
+    scattered = _sample_csv_offsets(
+        file_path,
+        header,
+        offsets,
+        max(1, limit // offsets),
+        start=csv_records_end(file_path, limit + 1),
+    )
+    return pd.concat([head, *scattered], ignore_index=True)
+
+
+def infer_schema(
+    file_path: str,
+    sheet_names: Optional[Sequence[str]] = None,
+) -> Dict[str, str]:
+    """
+    Infer the type of every column of a dataset file from sampled rows.
+    """
+    sample = sample_rows(file_path, sheet_names)
+    schema = {str(col): infer_type(sample[col]) for col in sample.columns}
+    logger.info(
+        "Schema inferred file_path=%s sample_rows=%d typed_columns=%d",
+        file_path,
+        len(sample),
+        sum(kind in TYPED_READ_TYPES for kind in schema.values()),
+    )
+    return schema
+
+
+def demote_schema(schema: Dict[str, str], column: Optional[str]) -> Dict[str, str]:
+    """
+    Read ``column`` (or, when unknown, every typed column) as text from
+    now on.
+    """
+    return {
+        col: "string" if kind in TYPED_READ_TYPES and column in (None, col) else kind
+        for col, kind in schema.items()
+    }
+
+
+def pandas_dtypes(schema: Optional[Dict[str, str]]) -> Dict[str, object]:
+    """
+    ``pd.read_csv`` dtypes for a schema: typed columns parse natively,
+    all others stay Python strings.
+    """
+    typed = {
+        col: "Int64" if kind == "int" else "float64"
+        for col, kind in (schema or {}).items()
+        if kind in TYPED_READ_TYPES
+    }
+    return defaultdict(lambda: object, typed)
+
+
+def arrow_types(
+    column_names: Sequence[str],
+    schema: Optional[Dict[str, str]],
+) -> Dict[str, "pa.DataType"]:
+    """
+    Arrow column types for a schema, strings for untyped columns.
+    """
+    import pyarrow as pa
+
+    kinds = schema or {}
+    types = {"int": pa.int64(), "float": pa.float64()}
+    return {name: types.get(kinds.get(name), pa.string()) for name in column_names}
+
+
+def schema_mismatch(exc: Exception, column_names: Sequence[str]) -> SchemaMismatchError:
+    """
+    Wrap a reader's parse error. Arrow names the failing column by index;
+    pandas does not.
+    """
+    match = _ARROW_COLUMN.search(str(exc))
+    column = None
+    if match and int(match.group(1)) < len(column_names):
+        column = column_names[int(match.group(1))]
+    return SchemaMismatchError(column, str(exc))
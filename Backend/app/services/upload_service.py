@@ -1,11 +1,32 @@
-from typing import Optional
+import asyncio
+import logging
+from typing import List, Optional, Tuple
 
 from fastapi import UploadFile
 
 from app.repositories.dataset_repository import DatasetRepository
+from app.services.data_processing_service import DataProcessor
 from app.utils.file_storage import save_upload_to_disk
 
 
+logger = logging.getLogger(__name__)
+
+
+def read_upload_metadata(
+    storage_path: str,
+    sheet_names: Optional[List[str]] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    Row and column counts of an uploaded file, if they can be read from
+    its metadata without parsing it (see ``DataProcessor.has_fast_stats``).
+    """
+    processor = DataProcessor(storage_path, sheet_names=sheet_names)
+    if not processor.has_fast_stats:
+        return None
+    rows, columns = processor.get_basic_stats()
+    return rows, len(columns)
+
+
 class UploadService:
     """
     Service handling dataset uploads.
@@ -14,9 +35,18 @@ class UploadService:
     def __init__(self, dataset_repo: DatasetRepository) -> None:
         self._dataset_repo = dataset_repo
 
-    async def handle_upload(self, file: UploadFile, name: Optional[str] = None):
+    async def handle_upload(
+        self,
+        file: UploadFile,
+        name: Optional[str] = None,
+        sheet_names: Optional[List[str]] = None,
+    ):
         """
         Persist the uploaded file and create a dataset record.
+
+        ``sheet_names`` selects the worksheets of an .xlsx file to audit.
+        Row and column counts are filled in right away for CSV, Parquet and
+        Arrow IPC files; other formats get them from their first audit.
         """
         storage_path, size = await save_upload_to_disk(file)
         dataset = await self._dataset_repo.create(
@@ -24,7 +54,21 @@ class UploadService:
             file_size=size,
             storage_path=storage_path,
             name=name,
+            sheet_names=sheet_names,
         )
+        try:
+            # Counting rows reads the whole file, so keep it off the event loop.
+            metadata = await asyncio.to_thread(read_upload_metadata, storage_path, sheet_names)
+        except Exception as exc:
+            # The audit reports unreadable files; the upload itself succeeded.
+            logger.warning(
+                "Reading upload metadata failed dataset_id=%s error=%s", dataset.id, exc
+            )
+            metadata = None
+        if metadata is not None:
+            dataset.rows, dataset.columns = metadata
+            await self._dataset_repo.update_metadata(str(dataset.id), *metadata)
+
         from app.schemas.dataset import UploadResponse  # local import to avoid cycles
 
         return UploadResponse(
@@ -39,4 +83,3 @@ class UploadService:
             error_message=None,
             created_at=dataset.uploaded_at,
         )
-
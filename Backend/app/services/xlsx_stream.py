@@ -0,0 +1,108 @@
+from collections.abc import Generator
+import logging
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+from app.utils.column_names import dedupe_column_names
+
+
+logger = logging.getLogger(__name__)
+
+ALL_SHEETS = "*"
+
+
+def _require_openpyxl():
+    try:
+        import openpyxl
+    except ImportError as exc:
+        raise RuntimeError("Reading .xlsx files requires openpyxl.") from exc
+    return openpyxl
+
+
+def resolve_sheet_names(
+    available: Sequence[str],
+    requested: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """
+    Pick the worksheets to read: the first sheet by default (like
+    ``pd.read_excel``), every sheet for ``["*"]``, or the named ones.
+    """
+    if not requested:
+        return list(available[:1])
+    if ALL_SHEETS in requested:
+        return list(available)
+    missing = [name for name in requested if name not in available]
+    if missing:
+        raise ValueError(
+            f"Worksheet(s) not found: {', '.join(missing)}. "
+            f"Available: {', '.join(available)}"
+        )
+    return list(requested)
+
+
+def iter_xlsx_frames(
+    file_path: str,
+    chunk_size: int,
+    sheet_names: Optional[Sequence[str]] = None,
+    start_row: int = 0,
+) -> Generator[pd.DataFrame, None, None]:
+    """
+    Stream worksheets of an .xlsx file as object-typed DataFrames of
+    ``chunk_size`` rows.
+
+    The workbook is opened in openpyxl's read-only mode, which parses the
+    sheet XML lazily while rows are iterated, so only the rows of the
+    current chunk are held in memory. The first row of each sheet is the
+    header and trailing empty rows are dropped, as ``pd.read_excel`` does.
+
+    When several sheets are selected their columns are prefixed with the
+    sheet name (``Sheet1!amount``) so they are profiled separately.
+    ``start_row`` counts rows across the selected sheets in order.
+    """
+    openpyxl = _require_openpyxl()
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        selected = resolve_sheet_names(workbook.sheetnames, sheet_names)
+        to_skip = start_row
+        for sheet_name in selected:
+            worksheet = workbook[sheet_name]
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            prefix = f"{sheet_name}!" if len(selected) > 1 else ""
+
+            def column_names(width: int) -> List[str]:
+                # Empty trailing header cells are not stored, but data below
+                # them still needs a column.
+                padded = tuple(header) + (None,) * (width - len(header))
+                return [prefix + name for name in dedupe_column_names(padded)]
+
+            width = max(len(header), worksheet.max_column or 0)
+            columns = column_names(width)
+
+            batch: List[tuple] = []
+            blank_rows = 0
+            for row in rows:
+                if all(value is None for value in row):
+                    # Only blank rows followed by data are kept.
+                    blank_rows += 1
+                    continue
+                for pending in [(None,) * width] * blank_rows + [row]:
+                    if to_skip:
+                        to_skip -= 1
+                        continue
+                    if len(pending) > width:
+                        width = len(pending)
+                        columns = column_names(width)
+                    batch.append(pending)
+                    if len(batch) == chunk_size:
+                        yield pd.DataFrame(batch, columns=columns, dtype=object)
+                        batch = []
+                blank_rows = 0
+            if batch:
+                yield pd.DataFrame(batch, columns=columns, dtype=object)
+            logger.info("Worksheet streamed file_path=%s sheet=%s", file_path, sheet_name)
+    finally:
+        workbook.close()
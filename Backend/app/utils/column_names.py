@@ -0,0 +1,24 @@
+from typing import Dict, List, Optional, Sequence
+
+
+def dedupe_column_names(raw: Sequence[Optional[object]]) -> List[str]:
+    """
+    Name header cells the way ``pd.read_csv`` does: blank names become
+    ``Unnamed: i`` and repeated names get ``.1``, ``.2`` suffixes.
+    """
+    names: List[str] = [
+        str(name) if name not in (None, "") else f"Unnamed: {idx}"
+        for idx, name in enumerate(raw)
+    ]
+    original = set(names)
+    counts: Dict[str, int] = {}
+    for idx, name in enumerate(names):
+        base = name
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in original else counts.get(name, 0)
+        names[idx] = name
+        counts[name] = count + 1
+    return names
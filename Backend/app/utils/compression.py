@@ -0,0 +1,113 @@
+import bz2
+import gzip
+import io
+import os
+import zipfile
+from typing import BinaryIO, Optional, TextIO, Tuple
+
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd", ".bz2": "bz2", ".zip": "zip"}
+
+# Only row-oriented text formats are worth wrapping: XLSX, Parquet and
+# Feather files are compressed internally and need random access.
+STREAMABLE_EXTENSIONS = (".csv", ".json", ".ndjson", ".jsonl")
+
+_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "zstd": b"\x28\xb5\x2f\xfd",
+    "bz2": b"BZh",
+    "zip": b"PK\x03\x04",
+}
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError("Reading .zst files requires the zstandard package.") from exc
+    return zstandard
+
+
+def split_compression(filename: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a file name into its data extension and compression codec:
+    ``"export.csv.gz"`` gives ``(".csv", "gzip")`` and ``"export.csv"``
+    gives ``(".csv", None)``. A bare ``"export.zip"`` has no data extension
+    until the archive member is looked at (see :func:`data_extension`).
+    """
+    root, ext = os.path.splitext(filename.lower())
+    compression = COMPRESSION_SUFFIXES.get(ext)
+    if compression is None:
+        return ext, None
+    return os.path.splitext(root)[1], compression
+
+
+def zip_member(file_path: str) -> zipfile.ZipInfo:
+    """
+    The single data file of a ZIP archive. Directories and macOS metadata
+    are ignored; archives with no or several data files are rejected.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        members = [
+            info
+            for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and not os.path.basename(info.filename).startswith(".")
+        ]
+    if len(members) != 1:
+        raise ValueError(
+            f"ZIP archives must contain exactly one data file, found {len(members)}"
+        )
+    return members[0]
+
+
+def data_extension(file_path: str) -> Tuple[str, Optional[str]]:
+    """
+    Like :func:`split_compression`, but resolves a bare ``.zip`` to the
+    extension of its member.
+    """
+    extension, compression = split_compression(file_path)
+    if compression == "zip" and not extension:
+        extension = os.path.splitext(zip_member(file_path).filename.lower())[1]
+    return extension, compression
+
+
+def check_magic(compression: str, head: bytes) -> None:
+    """
+    Reject data whose first bytes do not match the announced codec.
+    """
+    magic = _MAGIC[compression]
+    if not head.startswith(magic):
+        raise ValueError(f"File is not valid {compression} data")
+
+
+def open_input(file_path: str) -> BinaryIO:
+    """
+    Open a dataset file for binary reading, decompressing on the fly when
+    its name ends in a compression suffix. Nothing is decompressed to disk.
+    """
+    compression = split_compression(file_path)[1]
+    if compression is None:
+        return open(file_path, "rb")
+    if compression == "gzip":
+        return gzip.open(file_path, "rb")
+    if compression == "bz2":
+        return bz2.open(file_path, "rb")
+    if compression == "zstd":
+        zstandard = _require_zstandard()
+        raw = open(file_path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.BufferedReader(reader, buffer_size=1 << 20)
+    archive = zipfile.ZipFile(file_path)
+    member = archive.open(zip_member(file_path))
+    # The member stream keeps its own reference to the archive file.
+    archive.close()
+    return member
+
+
+def open_text_input(file_path: str, newline: Optional[str] = None) -> TextIO:
+    """
+    :func:`open_input` decoded as UTF-8 text (a leading BOM is dropped).
+    """
+    return io.TextIOWrapper(open_input(file_path), encoding="utf-8-sig", newline=newline)
@@ -1,10 +1,17 @@
 import os
+import zipfile
 from pathlib import Path
 from typing import Tuple
 
 from fastapi import UploadFile
 
 from app.core.config import settings
+from app.utils.compression import (
+    STREAMABLE_EXTENSIONS,
+    check_magic,
+    data_extension,
+    split_compression,
+)
 
 
 def ensure_storage_root() -> Path:
@@ -20,27 +27,47 @@ async def save_upload_to_disk(file: UploadFile) -> Tuple[str, int]:
     """
     Save an uploaded file to disk using chunked writes.
 
+    Compressed uploads (``.gz``, ``.zst``, ``.bz2``, ``.zip``) are stored
+    as uploaded; their first bytes must match the codec and a ZIP archive
+    must hold a single CSV/JSON/NDJSON file, otherwise the partial file is
+    removed and ValueError is raised.
+
     Returns the absolute file path and file size in bytes.
     """
     storage_root = ensure_storage_root()
     destination = storage_root / file.filename
+    compression = split_compression(file.filename)[1]
 
     # Avoid overwriting existing files by appending a counter if needed.
+    # For compressed files the counter goes before both suffixes, so
+    # "data.csv.gz" becomes "data_1.csv.gz".
     counter = 1
-    base_name = destination.stem
-    suffix = destination.suffix
+    suffix = "".join(destination.suffixes[-2:] if compression else destination.suffixes[-1:])
+    base_name = destination.name[: len(destination.name) - len(suffix)]
     while destination.exists():
         destination = storage_root / f"{base_name}_{counter}{suffix}"
         counter += 1
 
     size = 0
-    with destination.open("wb") as out_file:
-        while True:
-            chunk = await file.read(1024 * 1024)  # 1MB chunks
-            if not chunk:
-                break
-            out_file.write(chunk)
-            size += len(chunk)
+    try:
+        with destination.open("wb") as out_file:
+            while True:
+                chunk = await file.read(1024 * 1024)  # 1MB chunks
+                if not chunk:
+                    break
+                if size == 0 and compression:
+                    check_magic(compression, chunk)
+                out_file.write(chunk)
+                size += len(chunk)
+        if compression == "zip":
+            extension = data_extension(str(destination))[0]
+            if extension not in STREAMABLE_EXTENSIONS:
+                raise ValueError(
+                    f"ZIP archives must contain a {', '.join(STREAMABLE_EXTENSIONS)} file"
+                )
+    except (ValueError, zipfile.BadZipFile):
+        destination.unlink(missing_ok=True)
+        raise
 
     # Reset file pointer for potential re-use by FastAPI
     await file.seek(0)
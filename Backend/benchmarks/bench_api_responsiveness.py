@@ -0,0 +1,138 @@
+"""
+Measure /api/health latency while a large audit is running.
+
+Generates a synthetic CSV, starts an audit and keeps calling the health
+endpoint of the FastAPI app (through its ASGI interface, no server or
+database needed) until the audit finishes. Two modes are compared:
+
+- executor: the audit runs in the process pool, as AuditService does.
+- inline:   the audit runs directly on the event loop, as it used to.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_api_responsiveness.py --rows 300000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+from app.main import app
+from app.services.audit_executor import run_in_audit_executor, shutdown_audit_executor
+from app.services.audit_service import compute_audit
+
+
+def write_dataset(path: str, rows: int, seed: int = 3) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "quantity": rng.integers(1, 20, size=rows),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+        }
+    )
+    df.to_csv(path, index=False)
+
+
+async def call_health() -> float:
+    """
+    Call GET /api/health through the ASGI app and return latency in ms.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/health",
+        "raw_path": b"/api/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("benchmark", 0),
+        "server": ("benchmark", 80),
+    }
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    assert status.get("code") == 200, status
+    return (time.perf_counter() - start) * 1000
+
+
+async def measure(mode: str, path: str, interval: float) -> None:
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        while not done.is_set():
+            due = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            await call_health()
+            # Latency is measured from when the request was due, so it
+            # includes any time spent waiting for a blocked event loop.
+            latencies.append((time.perf_counter() - due) * 1000)
+
+    async def audit() -> None:
+        if mode == "executor":
+            await run_in_audit_executor(compute_audit, "benchmark", path)
+        else:
+            compute_audit("benchmark", path)
+        done.set()
+
+    # Warm the pool so process start-up is not counted as audit time.
+    if mode == "executor":
+        await run_in_audit_executor(int, "0")
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(interval)
+    scheduled = time.perf_counter()
+    await audit()
+    elapsed = time.perf_counter() - scheduled
+    await probe_task
+
+    worst = max(latencies) if latencies else 0.0
+    p95 = float(np.percentile(latencies, 95)) if latencies else 0.0
+    print(
+        f"mode={mode:<8} audit={elapsed:6.2f}s health_calls={len(latencies):4d} "
+        f"p95={p95:8.1f}ms max={worst:8.1f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.csv")
+        write_dataset(path, args.rows)
+        print(f"rows={args.rows} file_size={os.path.getsize(path) / 1e6:.1f}MB")
+        try:
+            for mode in ("executor", "inline"):
+                await measure(mode, path, args.interval)
+        finally:
+            shutdown_audit_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Benchmark per-chunk CPU time of the audit detectors with and without a
+shared ChunkView.
+
+- separate: every detector is called without a view and decodes the
+            columns it needs itself, as each detector used to.
+- shared:   one ChunkView is built per chunk and passed to every detector,
+            as compute_audit does.
+
+Both modes must produce the same profiles and duplicate counts.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_chunk_view.py --rows 500000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+from app.ai_modules.anomalies import AnomalyDetector
+from app.ai_modules.chunk_view import ChunkView
+from app.ai_modules.consistency import ConsistencyChecker
+from app.ai_modules.duplicates import DuplicateDetector
+from app.ai_modules.inconsistencies import InconsistencyDetector
+from app.ai_modules.profiling import ColumnProfiler
+from app.core.config import settings
+
+
+def make_chunks(rows: int, seed: int = 5) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "quantity": rng.integers(1, 20, size=rows),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+            "signup_date": rng.choice(pd.date_range("2020-01-01", periods=1000).astype(str), size=rows),
+        }
+    )
+    # Audits read CSVs as object columns of strings.
+    df = df.astype(str)
+    size = settings.csv_chunk_size
+    return [df.iloc[i:i + size] for i in range(0, rows, size)]
+
+
+def run(mode: str, chunks: list[pd.DataFrame]) -> tuple[float, dict, int]:
+    profiler = ColumnProfiler()
+    detectors = [InconsistencyDetector(), ConsistencyChecker()]
+    duplicates = DuplicateDetector()
+    anomalies = AnomalyDetector()
+
+    start = time.process_time()
+    for chunk in chunks:
+        view = ChunkView(chunk) if mode == "shared" else None
+        profiler.process_chunk(chunk, view)
+        for detector in detectors:
+            detector.process_chunk(chunk, view)
+        duplicates.process_chunk(chunk, view)
+        anomalies.process_chunk_for_sampling(chunk, view)
+    elapsed = time.process_time() - start
+
+    profiles, _ = profiler.build_profiles()
+    duplicate_count = int(duplicates.get_stats()["duplicate_count"])
+    duplicates.close()
+    return elapsed, profiles, duplicate_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.rows)
+    print(f"rows={args.rows} chunks={len(chunks)} chunk_size={settings.csv_chunk_size}")
+
+    results = {}
+    for mode in ("separate", "shared"):
+        best = None
+        for _ in range(args.repeat):
+            elapsed, profiles, duplicate_count = run(mode, chunks)
+            best = elapsed if best is None else min(best, elapsed)
+        results[mode] = (profiles, duplicate_count)
+        print(
+            f"mode={mode:<8} cpu={best:6.2f}s per_chunk={best / len(chunks) * 1000:7.1f}ms "
+            f"duplicates={duplicate_count}"
+        )
+
+    assert results["separate"][1] == results["shared"][1]
+    for col, profile in results["separate"][0].items():
+        assert profile["unique_count"] == results["shared"][0][col]["unique_count"], col
+
+
+if __name__ == "__main__":
+    main()
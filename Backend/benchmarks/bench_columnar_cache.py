@@ -0,0 +1,91 @@
+"""
+Benchmark a first audit of a CSV file, which also writes its columnar
+copy, against a repeat audit that reads the copy instead.
+
+Each audit runs compute_audit in a fresh interpreter:
+
+- first:   the CSV file, writing ``<file>.parquet`` next to it.
+- repeat:  the Parquet copy written by the first audit.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_columnar_cache.py --rows 2000000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+
+def write_dataset(path: str, rows: int, seed: int = 9) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "quantity": rng.integers(1, 20, size=rows),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+            "note": rng.choice(["", "ok", "late delivery", "refund requested"], size=rows),
+        }
+    )
+    df.to_csv(path, index=False)
+
+
+def dir_size(path: str) -> int:
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def run_single(mode: str, path: str) -> None:
+    from app.services.audit_service import compute_audit
+    from app.services.columnar_cache import columnar_cache_path
+
+    source = path if mode == "first" else columnar_cache_path(path)
+    start = time.perf_counter()
+    result = compute_audit("benchmark", source)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"mode={mode:<7} rows={result.total_rows:>9} source_size={dir_size(source) / 1e6:7.1f}MB "
+        f"elapsed={elapsed:6.2f}s peak_rss={peak_mb:7.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.csv")
+        write_dataset(path, args.rows)
+        env = dict(os.environ, AUDIT_CHECKPOINT_INTERVAL_CHUNKS="0")
+        print(f"rows={args.rows}")
+        for mode in ("first", "repeat"):
+            subprocess.run(
+                [sys.executable, __file__, "--single", mode, "--path", path],
+                check=True,
+                env=env,
+            )
+
+
+if __name__ == "__main__":
+    main()
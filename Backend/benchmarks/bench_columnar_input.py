@@ -0,0 +1,119 @@
+"""
+Benchmark profiling the same dataset stored as CSV, Parquet and Feather.
+
+Each mode streams the file through DataProcessor.iter_views and
+ColumnProfiler in a fresh interpreter:
+
+- csv:                the CSV file with the configured CSV engine.
+- parquet:            every column of the Parquet file, row group by row
+                      group, with footer statistics.
+- parquet-projected:  only the two numeric columns of the Parquet file.
+- feather:            every column of the Arrow IPC (Feather V2) file.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_columnar_input.py --rows 2000000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+from app.ai_modules.profiling import ColumnProfiler
+from app.services.data_processing_service import DataProcessor
+
+
+MODES = ["csv", "parquet", "parquet-projected", "feather"]
+FILES = {
+    "csv": "large.csv",
+    "parquet": "large.parquet",
+    "parquet-projected": "large.parquet",
+    "feather": "large.feather",
+}
+
+
+def write_datasets(directory: str, rows: int, seed: int = 9) -> None:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "quantity": rng.integers(1, 20, size=rows),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+            "note": rng.choice(["", "ok", "late delivery", "refund requested"], size=rows),
+        }
+    )
+    df.to_csv(os.path.join(directory, "large.csv"), index=False)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, os.path.join(directory, "large.parquet"), row_group_size=250_000)
+    feather.write_feather(table, os.path.join(directory, "large.feather"))
+
+
+def run_single(mode: str, directory: str) -> None:
+    path = os.path.join(directory, FILES[mode])
+    columns = ["amount", "quantity"] if mode == "parquet-projected" else None
+    processor = DataProcessor(path, columns=columns)
+    profiler = ColumnProfiler()
+    rows = 0
+    start = time.perf_counter()
+    for view in processor.iter_views():
+        profiler.process_chunk(view.frame, view)
+        rows += len(view)
+    profiler.build_profiles()
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / 1e6
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"mode={mode:<18} rows={rows:>9} file_size={size_mb:7.1f}MB "
+        f"elapsed={elapsed:6.2f}s peak_rss={peak_mb:7.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--modes", nargs="+", default=MODES)
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    parser.add_argument("--generate", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generate:
+        write_datasets(args.dir, args.rows)
+        return
+    if args.single:
+        run_single(args.single, args.dir)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Generated in a child process: peak RSS survives fork + exec, so a
+        # large parent would inflate every measurement.
+        subprocess.run(
+            [sys.executable, __file__, "--generate", "--rows", str(args.rows), "--dir", tmp],
+            check=True,
+        )
+        print(f"rows={args.rows}")
+        for mode in args.modes:
+            subprocess.run(
+                [sys.executable, __file__, "--single", mode, "--dir", tmp],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
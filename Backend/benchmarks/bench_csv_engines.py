@@ -0,0 +1,117 @@
+"""
+Benchmark CSV parse throughput and peak memory of the two CSV engines.
+
+Each mode reads the whole file chunk by chunk in a fresh interpreter:
+
+- pandas:       pd.read_csv(dtype=object) chunks, the original path.
+- arrow:        Arrow record batches from iter_csv_record_batches.
+- arrow-view:   record batches wrapped in ChunkView.from_record_batch with
+                every column decoded to numbers, as audits consume them.
+- pandas-view:  pandas chunks wrapped in ChunkView with the same decoding.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_csv_engines.py --rows 2000000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+from app.ai_modules.chunk_view import ChunkView
+from app.core.config import settings
+from app.services.arrow_csv import iter_csv_record_batches
+
+
+MODES = ["pandas", "arrow", "pandas-view", "arrow-view"]
+
+
+def write_dataset(path: str, rows: int, seed: int = 9) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "quantity": rng.integers(1, 20, size=rows),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+            "note": rng.choice(["", "ok", "late delivery", "refund requested"], size=rows),
+        }
+    )
+    df.to_csv(path, index=False)
+
+
+def run_single(mode: str, path: str) -> None:
+    chunk_size = settings.csv_chunk_size
+    rows = 0
+    start = time.perf_counter()
+    if mode.startswith("pandas"):
+        reader = pd.read_csv(
+            path, chunksize=chunk_size, dtype=object, on_bad_lines="warn"
+        )
+        for chunk in reader:
+            rows += len(chunk)
+            if mode == "pandas-view":
+                view = ChunkView(chunk)
+                for col in view.columns:
+                    view.numeric(col)
+    else:
+        for batch in iter_csv_record_batches(path, chunk_size):
+            rows += batch.num_rows
+            if mode == "arrow-view":
+                view = ChunkView.from_record_batch(batch)
+                for col in view.columns:
+                    view.numeric(col)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / 1e6
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"mode={mode:<12} rows={rows:>9} elapsed={elapsed:6.2f}s "
+        f"throughput={size_mb / elapsed:7.1f}MB/s peak_rss={peak_mb:7.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--modes", nargs="+", default=MODES)
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    parser.add_argument("--generate", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generate:
+        write_dataset(args.path, args.rows)
+        return
+    if args.single:
+        run_single(args.single, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.csv")
+        # Generated in a child process: peak RSS survives fork + exec, so a
+        # large parent would inflate every measurement.
+        subprocess.run(
+            [sys.executable, __file__, "--generate", "--rows", str(args.rows), "--path", path],
+            check=True,
+        )
+        print(f"rows={args.rows} file_size={os.path.getsize(path) / 1e6:.1f}MB")
+        for mode in args.modes:
+            subprocess.run(
+                [sys.executable, __file__, "--single", mode, "--path", path],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the exact-duplicate pass of DuplicateDetector.
+
+Compares the vectorized 64-bit row hashing engine against the previous
+per-row ``iterrows`` + SHA-256 path on a synthetic dataset and checks that
+both report the same duplicate counts.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_duplicates.py --rows 500000
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+from app.ai_modules.common import hash_rows
+from app.ai_modules.seen_set import HashSeenSet
+
+
+def make_chunks(rows: int, chunk_size: int, seed: int = 7) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    # Draw from a pool smaller than the row count so duplicates appear
+    # both inside a chunk and across chunk boundaries.
+    pool = max(rows // 10, 1)
+    ids = rng.integers(0, pool, size=rows)
+    df = pd.DataFrame(
+        {
+            "customer_id": ids.astype(str),
+            "email": [f"user{i}@example.com" for i in ids],
+            "amount": (ids % 997).astype(float).astype(str),
+            "region": np.array(["north", "south", "east", "west"])[ids % 4],
+        },
+        dtype=object,
+    )
+    return [df.iloc[i:i + chunk_size] for i in range(0, rows, chunk_size)]
+
+
+def legacy_exact_duplicates(chunks: list[pd.DataFrame]) -> int:
+    """
+    The previous implementation: hash each row in Python.
+    """
+    seen: set[str] = set()
+    duplicates = 0
+    for chunk in chunks:
+        for _, row in chunk.iterrows():
+            row_str = "||".join(row.astype(str).tolist())
+            digest = hashlib.sha256(row_str.encode("utf-8")).hexdigest()
+            if digest in seen:
+                duplicates += 1
+            else:
+                seen.add(digest)
+    return duplicates
+
+
+def vectorized_exact_duplicates(chunks: list[pd.DataFrame]) -> int:
+    """
+    The exact-duplicate pass used by DuplicateDetector.process_chunk.
+    """
+    seen = HashSeenSet()
+    for chunk in chunks:
+        seen.add(hash_rows(chunk))
+    return seen.total_count - seen.distinct_count()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.rows, args.chunk_size)
+    print(f"rows={args.rows} chunk_size={args.chunk_size} chunks={len(chunks)}")
+
+    start = time.perf_counter()
+    fast = vectorized_exact_duplicates(chunks)
+    fast_elapsed = time.perf_counter() - start
+    print(f"vectorized: duplicates={fast} elapsed={fast_elapsed:.3f}s")
+
+    if args.skip_legacy:
+        return
+
+    start = time.perf_counter()
+    legacy = legacy_exact_duplicates(chunks)
+    legacy_elapsed = time.perf_counter() - start
+    print(f"legacy:     duplicates={legacy} elapsed={legacy_elapsed:.3f}s")
+    print(f"speedup={legacy_elapsed / max(fast_elapsed, 1e-9):.1f}x match={fast == legacy}")
+
+
+if __name__ == "__main__":
+    main()
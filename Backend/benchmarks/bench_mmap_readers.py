@@ -0,0 +1,143 @@
+"""
+Benchmark the memory of concurrent readers of one dataset with and without
+memory-mapped reads.
+
+For every mode, ``--readers`` processes stream the same file through
+DataProcessor.iter_views at once (as an audit and visualization requests
+would) with MEMORY_MAP_READS on and off. Each reader samples
+``/proc/self/smaps_rollup`` after every chunk and reports its peak RSS and
+peak anonymous memory. Mapped file pages count towards RSS but live in the
+shared page cache, so the sum of anonymous memory is what the readers
+cost on top of one cached copy of the file. Linux only.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_mmap_readers.py --rows 2000000 --readers 4
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+
+MODES = ["csv", "csv-arrow", "feather", "parquet"]
+FILES = {
+    "csv": "large.csv",
+    "csv-arrow": "large.csv",
+    "feather": "large.feather",
+    "parquet": "large.parquet",
+}
+
+
+def write_datasets(directory: str, rows: int, seed: int = 9) -> None:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "quantity": rng.integers(1, 20, size=rows),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+        }
+    )
+    df.to_csv(os.path.join(directory, "large.csv"), index=False)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, os.path.join(directory, "large.parquet"), row_group_size=250_000)
+    feather.write_feather(
+        table, os.path.join(directory, "large.feather"), compression="uncompressed"
+    )
+
+
+def memory_mb() -> tuple:
+    """
+    Current RSS and anonymous (heap, non file-backed) memory of this
+    process in MB.
+    """
+    fields = {}
+    with open("/proc/self/smaps_rollup") as handle:
+        for line in handle:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields.get("Rss", 0) / 1024, fields.get("Anonymous", 0) / 1024
+
+
+def run_reader(path: str) -> None:
+    from app.services.data_processing_service import DataProcessor
+
+    peak_rss = peak_anon = 0.0
+    rows = 0
+    for view in DataProcessor(path).iter_views():
+        view.numeric("amount")
+        rows += len(view)
+        rss, anon = memory_mb()
+        peak_rss, peak_anon = max(peak_rss, rss), max(peak_anon, anon)
+    print(f"{rows} {peak_rss:.1f} {peak_anon:.1f}")
+
+
+def run_mode(mode: str, directory: str, readers: int, memory_map: bool) -> None:
+    env = dict(
+        os.environ,
+        MEMORY_MAP_READS=str(memory_map).lower(),
+        CSV_ENGINE="arrow" if mode == "csv-arrow" else "pandas",
+    )
+    path = os.path.join(directory, FILES[mode])
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--reader", path],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        for _ in range(readers)
+    ]
+    results = []
+    for proc in procs:
+        out, _ = proc.communicate()
+        if proc.returncode:
+            raise SystemExit(f"reader failed mode={mode}")
+        results.append([float(x) for x in out.split()[-3:]])
+    rss = [r[1] for r in results]
+    anon = [r[2] for r in results]
+    print(
+        f"mode={mode:<10} memory_map={str(memory_map):<5} readers={readers} "
+        f"peak_rss_per_reader={max(rss):7.1f}MB peak_anon_per_reader={max(anon):7.1f}MB "
+        f"total_anon={sum(anon):7.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--modes", nargs="+", default=MODES)
+    parser.add_argument("--reader", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.reader:
+        run_reader(args.reader)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_datasets(tmp, args.rows)
+        print(f"rows={args.rows}")
+        for mode in args.modes:
+            for memory_map in (False, True):
+                run_mode(mode, tmp, args.readers, memory_map)
+
+
+if __name__ == "__main__":
+    main()
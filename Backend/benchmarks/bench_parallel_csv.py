@@ -0,0 +1,88 @@
+"""
+Benchmark full CSV audits with byte ranges parsed by 1..N processes.
+
+Each worker count runs compute_audit in a fresh interpreter with
+CSV_PARALLEL_WORKERS set; 1 is the serial path. The speed-up is bounded by
+the number of cores, so run it on the machine size you want to size for.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_parallel_csv.py --rows 4000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+import pandas as pd
+
+
+def write_dataset(path: str, rows: int, seed: int = 9) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "quantity": rng.integers(1, 20, size=rows),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+            # Quoted newlines make sure range splitting is exercised.
+            "note": rng.choice(["", "ok", "late\ndelivery", 'said "refund"'], size=rows),
+        }
+    )
+    df.to_csv(path, index=False)
+
+
+def run_single(path: str) -> None:
+    from app.core.config import settings
+    from app.services.audit_service import compute_audit
+
+    start = time.perf_counter()
+    result = compute_audit("benchmark", path)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / 1e6
+    print(
+        f"workers={settings.csv_parallel_workers:<3} rows={result.total_rows:>9} "
+        f"elapsed={elapsed:6.2f}s throughput={size_mb / elapsed:6.1f}MB/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.csv")
+        write_dataset(path, args.rows)
+        print(f"rows={args.rows} file_size={os.path.getsize(path) / 1e6:.1f}MB cpus={os.cpu_count()}")
+        for workers in args.workers:
+            env = dict(
+                os.environ,
+                CSV_PARALLEL_WORKERS=str(workers),
+                CSV_PARALLEL_MIN_MB="1",
+                AUDIT_CHECKPOINT_INTERVAL_CHUNKS="0",
+            )
+            subprocess.run(
+                [sys.executable, __file__, "--single", "--path", path],
+                check=True,
+                env=env,
+            )
+
+
+if __name__ == "__main__":
+    main()
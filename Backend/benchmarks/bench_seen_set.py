@@ -0,0 +1,99 @@
+"""
+Benchmark peak memory of the duplicate seen-set as input size grows.
+
+Each configuration runs in a fresh interpreter so its peak RSS is measured
+in isolation. Compares a plain Python set of hex digests (the original
+DuplicateDetector storage), HashSeenSet fully in memory, and HashSeenSet
+with a small memory budget that forces spilling to disk. All exact modes
+must report the same duplicate count.
+
+Run from the ``Backend`` directory:
+
+    python benchmarks/bench_seen_set.py --rows 1000000 2000000 4000000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "benchmark")
+
+import numpy as np
+
+from app.ai_modules.seen_set import HashSeenSet
+
+
+CHUNK_SIZE = 100_000
+
+
+def iter_hashes(rows: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    # Roughly 20% of rows repeat an earlier key.
+    pool = np.iinfo(np.uint64).max
+    for start in range(0, rows, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, rows - start)
+        batch = rng.integers(0, pool, size=size, dtype=np.uint64, endpoint=True)
+        repeat = rng.random(size) < 0.2
+        batch[repeat] = rng.integers(0, 1_000, size=int(repeat.sum()), dtype=np.uint64)
+        yield batch
+
+
+def run_single(mode: str, rows: int, budget_mb: int) -> None:
+    start = time.perf_counter()
+    if mode == "python-set":
+        seen: set[str] = set()
+        total = 0
+        for batch in iter_hashes(rows):
+            total += batch.size
+            seen.update(f"{int(h):064x}" for h in batch)
+        duplicates = total - len(seen)
+    else:
+        budget = budget_mb * 1024 * 1024 if mode == "spill" else None
+        seen_set = HashSeenSet(memory_budget_bytes=budget)
+        for batch in iter_hashes(rows):
+            seen_set.add(batch)
+        duplicates = seen_set.total_count - seen_set.distinct_count()
+        seen_set.close()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"mode={mode:<10} rows={rows:>10} duplicates={duplicates:>9} "
+        f"elapsed={elapsed:6.2f}s peak_rss={peak_mb:8.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[500_000, 1_000_000, 2_000_000])
+    parser.add_argument("--budget-mb", type=int, default=8)
+    parser.add_argument("--modes", nargs="+", default=["python-set", "memory", "spill"])
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.rows[0], args.budget_mb)
+        return
+
+    for rows in args.rows:
+        for mode in args.modes:
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--single",
+                    mode,
+                    "--rows",
+                    str(rows),
+                    "--budget-mb",
+                    str(args.budget_mb),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from app.core.dependencies import get_dataset_repository
+from app.main import app
+from app.services.audit_executor import run_in_audit_executor, shutdown_audit_executor
+from app.services.audit_service import compute_audit
+
+
+# Health checks must keep answering well within this while an audit runs.
+MAX_HEALTH_LATENCY_SECONDS = 1.0
+
+
+def _write_dataset(path, rows: int) -> None:
+    rng = np.random.default_rng(3)
+    pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, rows, size=rows),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, rows, size=rows)],
+            "amount": rng.normal(100, 25, size=rows).round(2),
+            "region": rng.choice(["north", "south", "east", "west"], size=rows),
+        }
+    ).to_csv(path, index=False)
+
+
+async def _health_latencies_until_done(client: httpx.AsyncClient, work: asyncio.Future) -> list:
+    latencies = []
+    while not work.done():
+        start = time.perf_counter()
+        response = await client.get("/api/health")
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        await asyncio.sleep(0.02)
+    return latencies
+
+
+async def _health_latencies_during_audit(path: str) -> list:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Start the pool first so process start-up is not part of the audit.
+        await run_in_audit_executor(int, "0")
+        audit = asyncio.ensure_future(run_in_audit_executor(compute_audit, "test", path))
+        latencies = await _health_latencies_until_done(client, audit)
+        result = await audit
+    assert result.total_rows > 0
+    return latencies
+
+
+def test_health_answers_while_audit_runs(tmp_path):
+    path = tmp_path / "large.csv"
+    _write_dataset(path, 200_000)
+    try:
+        latencies = asyncio.run(_health_latencies_during_audit(str(path)))
+    finally:
+        shutdown_audit_executor()
+
+    assert len(latencies) >= 5
+    assert max(latencies) < MAX_HEALTH_LATENCY_SECONDS
+
+
+class FakeDatasetRepository:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    async def get_by_id(self, dataset_id):
+        return SimpleNamespace(storage_path=self.path, columnar_path=None, sheet_names=None)
+
+
+async def _health_latencies_during_correlations(path: str) -> list:
+    app.dependency_overrides[get_dataset_repository] = lambda: FakeDatasetRepository(path)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            request = asyncio.ensure_future(
+                client.get("/api/visualization/correlations/test", timeout=120)
+            )
+            latencies = await _health_latencies_until_done(client, request)
+            response = await request
+    finally:
+        app.dependency_overrides.pop(get_dataset_repository, None)
+    assert response.status_code == 200
+    assert response.json()["numeric_correlations"]["columns"] == ["customer_id", "amount"]
+    return latencies
+
+
+def test_health_answers_during_full_file_correlations(tmp_path):
+    # Correlations sample rows across the whole file, not just its head.
+    path = tmp_path / "large.csv"
+    _write_dataset(path, 200_000)
+
+    latencies = asyncio.run(_health_latencies_during_correlations(str(path)))
+
+    assert len(latencies) >= 5
+    assert max(latencies) < MAX_HEALTH_LATENCY_SECONDS
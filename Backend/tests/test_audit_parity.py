@@ -0,0 +1,224 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ai_modules.sketches import KLLSketch
+from app.core.config import settings
+from app.services import audit_service
+from app.services.audit_service import compute_audit
+from app.services.schema_inference import infer_schema
+
+
+ROWS = 20_000
+CHUNK_SIZE = 1_000
+# Profile entries that do not depend on samples or sketches.
+EXACT_PROFILE_KEYS = (
+    "inferred_type",
+    "missing_percentage",
+    "unique_count",
+    "unique_ratio",
+    "min",
+    "max",
+    "mean",
+    "std",
+    "variance",
+)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(7)
+    amount = rng.normal(100, 25, size=ROWS).round(2)
+    amount[rng.random(ROWS) < 0.05] = np.nan
+    notes = rng.choice(["ok", "late, again", "multi\nline", 'said "hi"', ""], size=ROWS)
+    df = pd.DataFrame(
+        {
+            "order_id": rng.integers(0, ROWS // 2, size=ROWS),
+            "email": [f"user{i}@example.com" for i in rng.integers(0, 5_000, size=ROWS)],
+            "amount": amount,
+            "quantity": pd.array(rng.integers(1, 20, size=ROWS), dtype="Int64"),
+            "region": rng.choice(["north", "south", "east", "west", "North"], size=ROWS),
+            "note": notes,
+        }
+    )
+    df.loc[rng.random(ROWS) < 0.03, "quantity"] = pd.NA
+    # Whole-row duplicates.
+    df = pd.concat([df, df.iloc[:500]], ignore_index=True)
+    path = tmp_path / "orders.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def audit_settings(monkeypatch):
+    monkeypatch.setattr(settings, "csv_chunk_size", CHUNK_SIZE)
+    # Range workers are separate processes that read the environment.
+    monkeypatch.setenv("CSV_CHUNK_SIZE", str(CHUNK_SIZE))
+    monkeypatch.setattr(settings, "audit_checkpoint_interval_chunks", 0)
+    monkeypatch.setattr(settings, "columnar_cache_enabled", False)
+
+
+def _outcome(result) -> dict:
+    return {
+        "profiles": result.profiles,
+        "inconsistency_issues": result.inconsistency_issues,
+        "total_rows": result.total_rows,
+        "duplicate_count": result.duplicate_count,
+        "anomaly_count": result.anomaly_count,
+        "reliability_score": result.reliability_score,
+        "issue_summary": result.issue_summary,
+    }
+
+
+def _assert_same(left, right, rel_tol: float = 0.0, path: str = "") -> None:
+    """
+    Compare nested audit results; NaNs compare equal and floats may differ
+    by ``rel_tol``.
+    """
+    if isinstance(left, dict):
+        assert isinstance(right, dict) and left.keys() == right.keys(), path
+        for key in left:
+            _assert_same(left[key], right[key], rel_tol, f"{path}.{key}")
+    elif isinstance(left, (list, tuple)):
+        assert isinstance(right, (list, tuple)) and len(left) == len(right), path
+        for i, (a, b) in enumerate(zip(left, right)):
+            _assert_same(a, b, rel_tol, f"{path}[{i}]")
+    elif isinstance(left, float) and isinstance(right, float):
+        if math.isnan(left) or math.isnan(right):
+            assert math.isnan(left) and math.isnan(right), path
+        else:
+            assert math.isclose(left, right, rel_tol=rel_tol, abs_tol=rel_tol), (path, left, right)
+    else:
+        assert left == right, (path, left, right)
+
+
+def test_resumed_audit_matches_uninterrupted_run(dataset, monkeypatch):
+    expected = _outcome(compute_audit("test", dataset))
+
+    monkeypatch.setattr(settings, "audit_checkpoint_interval_chunks", 3)
+    process_view = audit_service._process_view
+    calls = []
+
+    def crash_midway(detectors, view):
+        calls.append(len(view))
+        if len(calls) == 11:
+            raise RuntimeError("worker killed")
+        process_view(detectors, view)
+
+    monkeypatch.setattr(audit_service, "_process_view", crash_midway)
+    with pytest.raises(RuntimeError):
+        compute_audit("test", dataset)
+
+    monkeypatch.setattr(audit_service, "_process_view", process_view)
+    load_checkpoint = audit_service.load_checkpoint
+    resumed_from = []
+
+    def spy(file_path):
+        checkpoint = load_checkpoint(file_path)
+        resumed_from.append(checkpoint.rows_done if checkpoint else None)
+        return checkpoint
+
+    monkeypatch.setattr(audit_service, "load_checkpoint", spy)
+    result = compute_audit("test", dataset)
+
+    assert resumed_from == [9 * CHUNK_SIZE]
+    _assert_same(_outcome(result), expected)
+
+
+def test_parallel_byte_ranges_match_serial_run(dataset, monkeypatch):
+    expected = compute_audit("test", dataset)
+
+    monkeypatch.setattr(settings, "csv_parallel_workers", 2)
+    monkeypatch.setattr(settings, "csv_parallel_min_mb", 0)
+    result = compute_audit("test", dataset)
+
+    # Counts and moments are exact; sums of floats are added up in a
+    # different order.
+    for outcome in ("total_rows", "duplicate_count", "anomaly_count", "inconsistency_issues"):
+        _assert_same(getattr(result, outcome), getattr(expected, outcome))
+    for col, profile in expected.profiles.items():
+        for key in EXACT_PROFILE_KEYS:
+            _assert_same(result.profiles[col][key], profile[key], rel_tol=1e-9, path=f"{col}.{key}")
+
+    # Quantiles come from merged sketches: within the sketch's rank error.
+    amounts = np.sort(pd.read_csv(dataset)["amount"].dropna().to_numpy())
+    for q, key in ((0.25, "q1"), (0.5, "median"), (0.75, "q3")):
+        rank = np.searchsorted(amounts, result.profiles["amount"][key]) / len(amounts)
+        assert abs(rank - q) <= KLLSketch().normalized_rank_error()
+
+
+def test_arrow_engine_matches_pandas_engine(dataset, monkeypatch):
+    monkeypatch.setattr(settings, "csv_engine", "pandas")
+    expected = _outcome(compute_audit("test", dataset))
+
+    monkeypatch.setattr(settings, "csv_engine", "arrow")
+    result = compute_audit("test", dataset)
+
+    _assert_same(_outcome(result), expected)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_memory_mapped_reads_do_not_change_results(dataset, monkeypatch, engine):
+    monkeypatch.setattr(settings, "csv_engine", engine)
+    monkeypatch.setattr(settings, "memory_map_reads", False)
+    expected = _outcome(compute_audit("test", dataset))
+
+    monkeypatch.setattr(settings, "memory_map_reads", True)
+    result = compute_audit("test", dataset)
+
+    _assert_same(_outcome(result), expected)
+
+
+def test_typed_columns_match_text_columns(dataset):
+    schema = infer_schema(dataset)
+    assert schema["quantity"] == "int" and schema["amount"] == "float"
+
+    typed = compute_audit("test", dataset, schema=schema)
+    text = compute_audit("test", dataset, schema={col: "string" for col in schema})
+
+    _assert_same(_outcome(typed), _outcome(text))
+
+
+def test_value_missed_by_schema_demotes_column(dataset):
+    schema = infer_schema(dataset)
+    expected = _outcome(compute_audit("test", dataset, schema=schema))
+
+    # "email" never parses as an int: the audit starts over reading it
+    # as text and gets the same result.
+    result = compute_audit("test", dataset, schema={**schema, "email": "int"})
+
+    assert result.schema["email"] == "string"
+    _assert_same(_outcome(result), expected)
+
+
+def test_columnar_copy_audit_matches_source_csv(dataset, monkeypatch):
+    monkeypatch.setattr(settings, "columnar_cache_enabled", True)
+    expected = compute_audit("test", dataset)
+    assert expected.columnar_path
+
+    result = compute_audit("test", expected.columnar_path)
+
+    # Row groups are not the CSV chunks, so float sums are added up in a
+    # different order.
+    assert result.columnar_path is None
+    _assert_same(_outcome(result), _outcome(expected), rel_tol=1e-9)
+
+
+def test_columnar_copy_written_in_parts_matches_source_csv(dataset, monkeypatch):
+    expected = compute_audit("test", dataset)
+
+    # A parallel audit writes one part file per byte range.
+    monkeypatch.setattr(settings, "columnar_cache_enabled", True)
+    monkeypatch.setattr(settings, "csv_parallel_workers", 2)
+    monkeypatch.setattr(settings, "csv_parallel_min_mb", 0)
+    columnar_path = compute_audit("test", dataset).columnar_path
+    result = compute_audit("test", columnar_path)
+
+    # Part files end mid-chunk, so only counts and moments are exact.
+    for outcome in ("total_rows", "duplicate_count", "anomaly_count", "inconsistency_issues"):
+        _assert_same(getattr(result, outcome), getattr(expected, outcome))
+    for col, profile in expected.profiles.items():
+        for key in EXACT_PROFILE_KEYS:
+            _assert_same(result.profiles[col][key], profile[key], rel_tol=1e-9, path=f"{col}.{key}")
@@ -0,0 +1,207 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.config import settings
+from app.repositories.audit_job_repository import AuditJobRepository
+from app.repositories.audit_report_repository import AuditReportRepository
+from app.repositories.dataset_repository import DatasetRepository
+from app.services import audit_scheduler, audit_service
+from app.services.audit_checkpoint import AuditLeaseLostError, checkpoint_dir_for
+from app.services.audit_scheduler import AuditScheduler
+from app.services.audit_service import compute_audit
+from app.services.columnar_cache import columnar_cache_path
+
+
+class FakeAuditService:
+    """
+    Stands in for AuditService: ``run_audit`` takes ``duration`` seconds.
+    """
+
+    def __init__(self, duration: float) -> None:
+        self.duration = duration
+        self.started = self.cancelled = self.completed = False
+
+    async def get_dataset_status(self, dataset_id):
+        return SimpleNamespace(status="completed" if self.completed else "uploaded")
+
+    async def run_audit(self, dataset_id, lease=None):
+        self.started = True
+        try:
+            await asyncio.sleep(self.duration)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        self.completed = True
+
+    async def get_audit_report(self, dataset_id):
+        return None
+
+
+async def _expire_lease(repo: AuditJobRepository, job_id) -> None:
+    await repo._collection.update_one(
+        {"_id": job_id},
+        {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}},
+    )
+
+
+async def _stale_worker_cannot_finish():
+    repo = AuditJobRepository(AsyncMongoMockClient()["test"])
+    await repo.enqueue(str(ObjectId()))
+    stale = await repo.claim_next("worker-a", lease_seconds=60)
+    await _expire_lease(repo, stale.id)
+    await repo.requeue_expired(max_attempts=3)
+    current = await repo.claim_next("worker-b", lease_seconds=60)
+    assert current.id == stale.id and current.attempts == 2
+
+    assert not await repo.heartbeat(str(stale.id), "worker-a", 60)
+    assert not await repo.finish(str(stale.id), "worker-a", "failed", error_message="stale")
+    job = await repo.get_by_id(str(stale.id))
+    assert (job.status, job.worker_id, job.error_message) == ("running", "worker-b", None)
+
+    assert await repo.heartbeat(str(current.id), "worker-b", 60)
+    assert await repo.finish(str(current.id), "worker-b", "completed")
+    assert (await repo.get_by_id(str(current.id))).status == "completed"
+
+
+def test_stale_worker_cannot_heartbeat_or_finish():
+    asyncio.run(_stale_worker_cannot_finish())
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(settings, "audit_job_lease_seconds", 0.3)
+    repo = AuditJobRepository(AsyncMongoMockClient()["test"])
+    scheduler = AuditScheduler()
+    monkeypatch.setattr(scheduler, "_job_repo", lambda: repo)
+    return scheduler, repo
+
+
+def test_lost_lease_cancels_the_audit(scheduler, monkeypatch):
+    scheduler, repo = scheduler
+    service = FakeAuditService(duration=30)
+    monkeypatch.setattr(scheduler, "_audit_service", lambda: service)
+
+    async def run():
+        await repo.enqueue(str(ObjectId()))
+        job = await repo.claim_next(scheduler.worker_id, lease_seconds=60)
+        # Another instance re-claimed the job after the lease expired.
+        await repo._collection.update_one({"_id": job.id}, {"$set": {"worker_id": "other"}})
+        await asyncio.wait_for(scheduler._run_job(job), timeout=5)
+        return await repo.get_by_id(str(job.id))
+
+    job = asyncio.run(run())
+
+    assert service.started and service.cancelled
+    assert (job.status, job.worker_id) == ("running", "other")
+
+
+def test_job_finishes_while_lease_is_held(scheduler, monkeypatch):
+    scheduler, repo = scheduler
+    # Outlives a few heartbeats.
+    service = FakeAuditService(duration=0.5)
+    monkeypatch.setattr(scheduler, "_audit_service", lambda: service)
+
+    async def run():
+        await repo.enqueue(str(ObjectId()))
+        job = await repo.claim_next(scheduler.worker_id, lease_seconds=60)
+        await scheduler._run_job(job)
+        return await repo.get_by_id(str(job.id))
+
+    job = asyncio.run(run())
+
+    assert service.completed and not service.cancelled
+    assert job.status == "completed"
+
+
+def test_retry_completes_while_the_orphaned_audit_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "audit_job_lease_seconds", 0.3)
+    monkeypatch.setattr(settings, "csv_chunk_size", 100)
+    monkeypatch.setattr(settings, "audit_checkpoint_interval_chunks", 1)
+    monkeypatch.setattr(settings, "columnar_cache_enabled", True)
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"id": np.arange(1_500), "score": rng.normal(size=1_500).round(2)})
+    path = tmp_path / "people.csv"
+    # The last 500 rows repeat the first 500, read before the lease was lost.
+    pd.concat([df, df.head(500)]).to_csv(path, index=False)
+
+    db = AsyncMongoMockClient()["test"]
+    monkeypatch.setattr(audit_scheduler, "get_database", lambda: db)
+    # Threads instead of worker processes, so the first attempt can be
+    # paused and outlive its lease like an orphaned pool worker.
+    threads = ThreadPoolExecutor(max_workers=2)
+    audits = []
+
+    async def run_in_threads(func, *args):
+        audits.append(threads.submit(func, *args))
+        return await asyncio.wrap_future(audits[-1])
+
+    monkeypatch.setattr(audit_service, "run_in_audit_executor", run_in_threads)
+
+    first_thread = []
+    paused, retry_done = threading.Event(), threading.Event()
+    process_view = audit_service._process_view
+
+    def pausing_process_view(detectors, view):
+        first_thread[:1] = first_thread or [threading.get_ident()]
+        if first_thread == [threading.get_ident()] and view.frame.index[0] == 300:
+            paused.set()
+            retry_done.wait(timeout=30)
+        process_view(detectors, view)
+
+    monkeypatch.setattr(audit_service, "_process_view", pausing_process_view)
+
+    async def run():
+        job_repo = AuditJobRepository(db)
+        dataset = await DatasetRepository(db).create("people.csv", path.stat().st_size, str(path))
+        await job_repo.enqueue(str(dataset.id))
+        first, retry = AuditScheduler(), AuditScheduler()
+
+        job = await job_repo.claim_next(first.worker_id, lease_seconds=60)
+        abandoned = asyncio.create_task(first._run_job(job))
+        while not paused.is_set():
+            await asyncio.sleep(0.01)
+        retried = None
+        while retried is None:
+            await _expire_lease(job_repo, job.id)
+            await job_repo.requeue_expired(max_attempts=3)
+            retried = await job_repo.claim_next(retry.worker_id, lease_seconds=60)
+        await asyncio.wait_for(abandoned, timeout=5)
+
+        await asyncio.wait_for(retry._run_job(retried), timeout=30)
+        retry_done.set()
+        return (
+            await job_repo.get_by_id(str(job.id)),
+            await DatasetRepository(db).get_by_id(str(dataset.id)),
+            await AuditReportRepository(db).get_by_dataset_id(str(dataset.id)),
+        )
+
+    try:
+        job, dataset, report = asyncio.run(run())
+        # The orphan stops at its next checkpoint instead of finishing.
+        with pytest.raises(AuditLeaseLostError):
+            audits[0].result(timeout=30)
+    finally:
+        retry_done.set()
+        threads.shutdown(wait=True)
+
+    assert (job.status, job.attempts) == ("completed", 2)
+    assert (dataset.status, dataset.rows) == ("completed", 2_000)
+    # Nothing of either attempt is left behind for a later audit to read.
+    assert not os.path.exists(checkpoint_dir_for(str(path)))
+    assert sorted(os.listdir(tmp_path)) == ["people.csv"]
+
+    monkeypatch.setattr(settings, "audit_checkpoint_interval_chunks", 0)
+    monkeypatch.setattr(settings, "columnar_cache_enabled", False)
+    expected = compute_audit("test", str(path))
+    assert report.duplicate_count == expected.duplicate_count == 500
+    assert report.reliability_score == expected.reliability_score
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from app.ai_modules.chunk_view import ChunkView
+
+
+def test_arrow_float_strings_match_pandas():
+    values = [100.0, 131.43, None, 1.5e-7, 1e20, -0.0]
+    arrow = ChunkView.from_record_batch(
+        pa.RecordBatch.from_pydict({"amount": pa.array(values, type=pa.float64())})
+    )
+    frame = ChunkView(pd.DataFrame({"amount": pd.Series(values, dtype=np.float64)}))
+
+    assert arrow.strings("amount").tolist() == frame.strings("amount").tolist()
+    assert arrow.strings("amount").tolist()[:3] == ["100.0", "131.43", "nan"]
+    assert arrow.string_counts("amount").to_dict() == frame.string_counts("amount").to_dict()
+
+
+def test_arrow_column_is_cast_to_strings_once(monkeypatch):
+    cast = ChunkView._cast_arrow_strings
+    calls = []
+
+    def counting_cast(array):
+        calls.append(array.type)
+        return cast(array)
+
+    monkeypatch.setattr(ChunkView, "_cast_arrow_strings", staticmethod(counting_cast))
+    view = ChunkView.from_record_batch(
+        pa.RecordBatch.from_pydict({"amount": pa.array([1.5, None, 1.5], type=pa.float64())})
+    )
+
+    assert view.strings("amount").tolist() == ["1.5", "nan", "1.5"]
+    assert view.unique_strings("amount").tolist() == ["1.5"]
+    assert view.string_counts("amount").to_dict() == {"1.5": 2}
+    assert calls == [pa.float64()]
@@ -0,0 +1,14 @@
+import pandas as pd
+
+from app.ai_modules.consistency import ConsistencyChecker
+
+
+def test_future_dates_in_naive_column_are_flagged():
+    checker = ConsistencyChecker()
+    checker.process_chunk(
+        pd.DataFrame({"signup_date": ["2020-01-05", "2021-03-04", "2199-12-31"]})
+    )
+
+    issues = checker.evaluate({"signup_date": {"inferred_type": "datetime"}})
+
+    assert "Temporal inconsistency: future dates detected." in issues["signup_date"]
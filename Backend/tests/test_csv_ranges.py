@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.csv_ranges import (
+    count_csv_rows,
+    csv_records_end,
+    open_csv_range,
+    read_csv_header,
+    split_csv_ranges,
+)
+from app.services.data_processing_service import DataProcessor
+
+
+@pytest.fixture
+def quoted_csv(tmp_path):
+    rng = np.random.default_rng(5)
+    rows = 3_000
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            # Newlines, commas and escaped quotes inside quoted fields.
+            "note": rng.choice(["plain", "two\nlines", "a, b", 'say ""hi""\n', "\n\n"], size=rows),
+            "value": rng.normal(size=rows).round(3),
+        }
+    )
+    path = tmp_path / "quoted.csv"
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+def _read_ranges(path, ranges, memory_map=False) -> pd.DataFrame:
+    header = read_csv_header(path)
+    parts = []
+    for start, end in ranges:
+        with open_csv_range(path, start, end, memory_map=memory_map) as handle:
+            parts.append(pd.read_csv(handle, header=None, names=header))
+    return pd.concat(parts, ignore_index=True)
+
+
+@pytest.mark.parametrize("parts", [1, 2, 7, 64])
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_ranges_cover_every_record_once(quoted_csv, parts, memory_map):
+    path, df = quoted_csv
+    ranges = split_csv_ranges(path, parts, block_size=4_096)
+
+    assert 1 <= len(ranges) <= parts
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    pd.testing.assert_frame_equal(_read_ranges(path, ranges, memory_map), df)
+
+
+def test_split_points_skip_quoted_newlines(tmp_path):
+    # Every newline but the record ends is inside a quoted field.
+    path = tmp_path / "wide.csv"
+    path.write_bytes(b'a,b\n1,"' + b"x\n" * 500 + b'"\n2,"y"\n')
+
+    ranges = split_csv_ranges(str(path), 4, block_size=64)
+
+    with open(path, "rb") as handle:
+        data = handle.read()
+    assert [data[start:end].split(b",")[0] for start, end in ranges] == [b"1", b"2"]
+
+
+def test_header_only_file_has_no_ranges(tmp_path):
+    path = tmp_path / "header.csv"
+    path.write_bytes(b"a,b")
+
+    assert split_csv_ranges(str(path), 4) == []
+
+
+@pytest.mark.parametrize("data", [b"", b"a,b", b"a,b\n"])
+def test_memory_mapped_empty_input(tmp_path, monkeypatch, data):
+    monkeypatch.setattr(settings, "memory_map_reads", True)
+    monkeypatch.setattr(settings, "csv_engine", "pandas")
+    path = tmp_path / "empty.csv"
+    path.write_bytes(data)
+
+    for start in (0, len(data)):
+        with open_csv_range(str(path), start, len(data), memory_map=True) as handle:
+            assert handle.read() == data[start:]
+    if data:
+        assert sum(len(chunk) for chunk in DataProcessor(str(path)).iter_chunks()) == 0
+    else:
+        with pytest.raises(pd.errors.EmptyDataError):
+            list(DataProcessor(str(path)).iter_chunks())
+
+
+def test_records_end_skips_quoted_newlines(tmp_path):
+    path = tmp_path / "notes.csv"
+    data = b'id,note\n1,"a\nb"\n2,c\n3,d'
+    path.write_bytes(data)
+
+    assert csv_records_end(str(path), 2, block_size=3) == data.index(b"2,c")
+    assert csv_records_end(str(path), 10) == len(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"a,b\n1,2\n3,4\n",
+        b"a,b\n1,2\n3,4",
+        b"a,b\r\n1,2\r\n\r\n3,4\r\n",
+        b"\n\na,b\n1,2\n\n\n3,4\n\n",
+        # Lines of spaces and tabs are blank; a field of spaces is not.
+        b"a,b\n1,2\n   \n3,4\n",
+        b"a,b\n1,2\n \t \r\n3,4\n \t",
+        b"a\n1\n  \n3\n",
+        b'a,b\n1,2\n , \n"  ",x\n3,4\n',
+        # Newlines and blank lines inside quoted fields.
+        b'a,b\n1,"x\n\n  \ny"\n2,"""q"""\n',
+        b"a,b\n",
+        b"a,b",
+        b"",
+    ],
+)
+@pytest.mark.parametrize("block_size", [1, 3, 8 << 20])
+def test_count_rows_matches_read_csv(tmp_path, data, block_size):
+    path = tmp_path / "rows.csv"
+    path.write_bytes(data)
+    try:
+        expected = len(pd.read_csv(path, dtype=object))
+    except pd.errors.EmptyDataError:
+        expected = 0
+
+    assert count_csv_rows(str(path), block_size=block_size) == expected
+
+
+def test_count_rows_of_random_and_compressed_files(quoted_csv, tmp_path):
+    path, df = quoted_csv
+    compressed = tmp_path / "quoted.csv.gz"
+    df.to_csv(compressed, index=False)
+
+    for block_size in (7, 4_096, 8 << 20):
+        assert count_csv_rows(path, block_size=block_size) == len(df)
+    assert count_csv_rows(str(compressed)) == len(df)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from app.ai_modules.inconsistencies import InconsistencyDetector
+from app.ai_modules.profiling import ColumnProfiler
+
+
+RARE_VALUES_ISSUE = "Rare categorical values detected"
+
+
+def _issues(values: np.ndarray, chunk_size: int = 10_000):
+    profiler, detector = ColumnProfiler(), InconsistencyDetector()
+    for start in range(0, len(values), chunk_size):
+        chunk = pd.DataFrame({"category": values[start : start + chunk_size]})
+        profiler.process_chunk(chunk)
+        detector.process_chunk(chunk)
+    profiles, _ = profiler.build_profiles()
+    return profiles["category"], detector.evaluate(profiles).get("category", [])
+
+
+def test_evenly_spread_categories_are_not_rare():
+    # 60 categories of about 1.7% of the rows each: all below the 2% rare
+    # category threshold, but none of them rare.
+    rng = np.random.default_rng(0)
+    values = np.array([f"category {i}" for i in range(60)], dtype=object)
+    profile, issues = _issues(rng.choice(values, size=100_000))
+
+    assert profile["rare_value_ratio"] == 0.0
+    assert not any(issue.startswith(RARE_VALUES_ISSUE) for issue in issues)
+
+
+def test_long_tail_of_rare_values_is_flagged():
+    rng = np.random.default_rng(1)
+    common = rng.choice(np.array(["red", "green", "blue"], dtype=object), size=70_000)
+    typos = np.array([f"colour-{i}" for i in range(30_000)], dtype=object)
+    profile, issues = _issues(rng.permutation(np.concatenate([common, typos])))
+
+    assert 0.25 < profile["rare_value_ratio"] < 0.35
+    assert any(issue.startswith(RARE_VALUES_ISSUE) for issue in issues)
+
+
+def test_small_column_counts_values_seen_once_or_twice():
+    values = np.array(["a"] * 6 + ["b"] * 2 + ["c", "d"], dtype=object)
+    profile, issues = _issues(values)
+
+    assert profile["rare_value_ratio"] == 0.4
+    assert any(issue.startswith(RARE_VALUES_ISSUE) for issue in issues)
+
+
+def test_rare_value_ratio_of_a_column_larger_than_the_sample():
+    # 300k rows, far more than the 10,000-value sample. Values seen 600
+    # times (0.2% of the rows) are not rare; values seen 50 times
+    # (0.017%) are, and they all sit at the end of the file.
+    common = np.repeat(np.array(["red", "green", "blue"], dtype=object), 60_000)
+    frequent = np.repeat(np.array([f"size {i}" for i in range(50)], dtype=object), 600)
+    rare = np.repeat(np.array([f"colour-{i}" for i in range(1_800)], dtype=object), 50)
+    head = np.random.default_rng(2).permutation(np.concatenate([common, frequent]))
+    profile, issues = _issues(np.concatenate([head, rare]))
+
+    assert 0.25 < profile["rare_value_ratio"] < 0.35
+    assert any(issue.startswith(RARE_VALUES_ISSUE) for issue in issues)
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from app.ai_modules.duplicates import RecordLinker
+from app.ai_modules.scoring import compute_reliability_score
+from app.core.config import settings
+from app.services.audit_service import compute_audit
+
+
+def _customers() -> pd.DataFrame:
+    names = ["alice smith", "bob jones", "carol white", "dave brown", "erin black"]
+    rows = []
+    for i, name in enumerate(names * 4):
+        rows.append(
+            {
+                "customer_id": f"C{i:04d}",
+                "email": f"{name.replace(' ', '.')}@example.com",
+                "amount": i,
+            }
+        )
+    # A near-duplicate of the first customer with a typo in the e-mail.
+    rows.append({"customer_id": "C0000", "email": "alice.smitth@example.com", "amount": 99})
+    return pd.DataFrame(rows)
+
+
+def test_find_matches_returns_sample_pairs():
+    linker = RecordLinker(["customer_id", "email"], max_rows=1_000, sample_pairs=3)
+    linker.process_chunk(_customers())
+
+    result = linker.find_matches()
+
+    assert result["key_columns"] == ["customer_id", "email"]
+    assert result["fuzzy_record_pairs"] >= 1
+    assert 1 <= len(result["sample_pairs"]) <= 3
+    pair = result["sample_pairs"][0]
+    assert pair["similarity"] >= 0.8
+    assert {pair["left_row"], pair["right_row"]} <= set(range(result["linked_rows"]))
+
+
+def test_record_linkage_reaches_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "record_linkage_enabled", True)
+    monkeypatch.setattr(settings, "audit_checkpoint_interval_chunks", 0)
+    monkeypatch.setattr(settings, "columnar_cache_enabled", False)
+    path = tmp_path / "customers.csv"
+    _customers().to_csv(path, index=False)
+
+    result = compute_audit("test", str(path))
+
+    assert result.record_linkage is not None
+    assert result.record_linkage["fuzzy_record_pairs"] >= 1
+    assert "near-duplicate records" in result.issue_summary["duplicates"]
+    assert any("near-duplicate record pairs" in rec for rec in result.recommendations)
+
+
+def test_summary_without_linkage_is_unchanged():
+    _, _, summary = compute_reliability_score(
+        profiles={"a": {"missing_percentage": 0.0}},
+        inconsistency_issues={},
+        anomaly_stats={},
+        duplicate_stats={"duplicate_ratio": 0.0},
+    )
+    assert summary["duplicates"] == "Duplicate ratio: 0.0000"
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.audit_service import compute_audit
+from app.services.schema_inference import infer_schema, infer_type, sample_rows
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (["12", "-3", "0", "4096"], "int"),
+        (["1.5", "2.0", "-0.25", "1e-07"], "float"),
+        # Leading zeros, explicit signs and padded decimals do not print
+        # back the same once parsed.
+        (["02134", "2134", "00501", "90210"], "string"),
+        (["+5", "6", "7", "8"], "string"),
+        (["-0", "1", "2", "3"], "string"),
+        (["1.50", "1.5", "2.25", "3.0"], "string"),
+        (["3", "2.5", "4.75", "1.25"], "string"),
+    ],
+)
+def test_numeric_types_only_for_round_tripping_text(values, expected):
+    assert infer_type(pd.Series(values * 3, dtype=object)) == expected
+
+
+def test_zip_codes_keep_leading_zeros(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "audit_checkpoint_interval_chunks", 0)
+    monkeypatch.setattr(settings, "columnar_cache_enabled", False)
+    path = tmp_path / "addresses.csv"
+    path.write_text("zip,city\n02134,Boston\n2134,Allston\n00501,Holtsville\n90210,Beverly Hills\n")
+
+    schema = infer_schema(str(path))
+    result = compute_audit("test", str(path))
+
+    assert schema["zip"] == "string"
+    assert result.profiles["zip"]["unique_count"] == 4
+    assert set(result.profiles["zip"]["top_values"]) == {"02134", "2134", "00501", "90210"}
+    assert result.duplicate_count == 0
+
+
+def test_small_file_rows_are_not_sampled_twice(tmp_path):
+    path = tmp_path / "people.csv"
+    path.write_text("name,age\nAda,36\nGrace,45\nAlan,41\nEdsger,72\n")
+
+    sample = sample_rows(str(path))
+
+    assert sample["name"].tolist() == ["Ada", "Grace", "Alan", "Edsger"]
+    assert infer_schema(str(path))["name"] == "string"
+
+
+def test_offset_samples_skip_bytes_already_read(tmp_path):
+    rows = 5_000
+    path = tmp_path / "people.csv"
+    pd.DataFrame({"name": [f"person {i}" for i in range(rows)], "age": range(rows)}).to_csv(
+        path, index=False
+    )
+
+    sample = sample_rows(str(path))
+
+    # The head plus every offset, with no record read twice.
+    assert len(sample) > settings.schema_sample_rows
+    assert sample["name"].is_unique
+    assert infer_schema(str(path))["name"] == "string"
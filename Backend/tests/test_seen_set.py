@@ -0,0 +1,66 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from app.ai_modules.common import hash_values
+from app.ai_modules.duplicates import DuplicateDetector
+from app.ai_modules.seen_set import BloomSeenSet, HashSeenSet
+
+
+def _hashes(start: int, stop: int) -> np.ndarray:
+    return hash_values(pd.Series(np.arange(start, stop).astype(str), dtype=object))
+
+
+def test_hash_seen_set_spills_and_counts_exactly(tmp_path):
+    seen = HashSeenSet(memory_budget_bytes=8 * 1_000, spill_dir=str(tmp_path))
+    for start in range(0, 50_000, 5_000):
+        seen.add(_hashes(start, start + 5_000))
+    seen.add(_hashes(0, 10_000))
+
+    assert seen.is_spilled
+    assert seen.total_count == 60_000
+    assert seen.distinct_count() == 50_000
+    seen.close()
+
+
+def test_hash_seen_set_merge_after_pickling(tmp_path):
+    first = HashSeenSet(memory_budget_bytes=8 * 1_000, spill_dir=str(tmp_path))
+    second = HashSeenSet(memory_budget_bytes=8 * 1_000, spill_dir=str(tmp_path))
+    first.add(_hashes(0, 20_000))
+    second.add(_hashes(15_000, 30_000))
+
+    first.merge(pickle.loads(pickle.dumps(second)))
+
+    assert first.total_count == 35_000
+    assert first.distinct_count() == 30_000
+    first.close()
+
+
+def test_bloom_error_bound_covers_false_positives():
+    bloom = BloomSeenSet(capacity=20_000, false_positive_rate=0.05)
+    # Twice the capacity of distinct values: plenty of false positives.
+    for start in range(0, 40_000, 1_000):
+        bloom.add(_hashes(start, start + 1_000))
+
+    false_positives = 40_000 - bloom.distinct_count()
+    assert false_positives > 0
+    assert bloom.expected_false_positives() > 0
+    assert false_positives <= bloom.false_positive_bound()
+    assert bloom.false_positive_bound() <= bloom.total_count
+
+
+def test_approximate_detector_reports_errors_for_key_columns():
+    detector = DuplicateDetector(approximate=True)
+    ids = np.arange(30_000)
+    for start in range(0, 30_000, 5_000):
+        chunk = ids[start : start + 5_000]
+        detector.process_chunk(pd.DataFrame({"user_id": chunk.astype(str), "value": chunk % 7}))
+
+    stats = detector.get_stats()
+
+    assert set(stats["key_duplicate_error_bounds"]) == {"user_id"}
+    assert stats["key_duplicate_error_bounds"]["user_id"] >= stats["key_duplicate_expected_errors"]["user_id"]
+    assert stats["duplicate_error_bound"] >= stats["duplicate_expected_error"]
+    assert stats["duplicate_count"] / 30_000 <= stats["duplicate_error_bound"]
+    detector.close()
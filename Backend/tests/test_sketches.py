@@ -0,0 +1,143 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from app.ai_modules.common import (
+    ReservoirSampler,
+    StratifiedReservoirSampler,
+    WeightedReservoirSampler,
+    hash_values,
+)
+from app.ai_modules.sketches import CountMinSketch, HyperLogLog, KLLSketch, MisraGries
+
+
+def _rank_error(sketch: KLLSketch, values: np.ndarray, q: float) -> float:
+    ordered = np.sort(values)
+    estimate = sketch.quantile(q)
+    return abs(np.searchsorted(ordered, estimate) / len(ordered) - q)
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(0).lognormal(size=200_000)
+    sketch = KLLSketch()
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+
+    assert sketch.n == len(values)
+    assert sketch.min == values.min() and sketch.max == values.max()
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert _rank_error(sketch, values, q) <= sketch.normalized_rank_error()
+
+
+def test_kll_merge_and_pickle_match_a_single_sketch():
+    values = np.random.default_rng(1).normal(size=100_000)
+    left, right = KLLSketch(seed=1), KLLSketch(seed=2)
+    left.update(values[:60_000])
+    right.update(values[60_000:])
+    left = pickle.loads(pickle.dumps(left))
+    left.merge(right)
+
+    assert left.n == len(values)
+    for q in (0.1, 0.5, 0.9):
+        assert _rank_error(left, values, q) <= left.normalized_rank_error()
+
+
+def test_kll_ignores_nan_and_handles_empty():
+    sketch = KLLSketch()
+    assert sketch.quantiles([0.5]) == [None]
+    sketch.update(np.array([np.nan, 1.0, np.nan]))
+    assert sketch.n == 1
+    assert sketch.quantile(0.5) == 1.0
+
+
+def _hashes(start: int, stop: int) -> np.ndarray:
+    return hash_values(pd.Series(np.arange(start, stop)).astype(str))
+
+
+def test_hll_is_exact_below_threshold():
+    sketch = HyperLogLog()
+    sketch.update(_hashes(0, 300))
+    sketch.update(_hashes(100, 400))
+
+    assert sketch.is_exact
+    assert sketch.count() == 400
+
+
+def test_hll_estimate_and_merge():
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(_hashes(0, 60_000))
+    right.update(_hashes(40_000, 100_000))
+    left.merge(pickle.loads(pickle.dumps(right)))
+
+    assert not left.is_exact
+    # Four standard errors.
+    assert abs(left.count() - 100_000) <= 4 * left.relative_error() * 100_000
+
+
+def test_misra_gries_keeps_every_heavy_hitter():
+    rng = np.random.default_rng(2)
+    heavy = np.repeat(["a", "b", "c"], [5_000, 3_000, 2_000])
+    tail = np.array([f"v{i}" for i in rng.integers(0, 50_000, size=40_000)])
+    values = pd.Series(rng.permutation(np.concatenate([heavy, tail])))
+    left, right = MisraGries(capacity=16), MisraGries(capacity=16)
+    for part, summary in ((values[:25_000], left), (values[25_000:], right)):
+        for start in range(0, len(part), 5_000):
+            summary.update(part.iloc[start : start + 5_000].value_counts())
+    left.merge(right)
+
+    assert left.n == len(values)
+    assert left.candidates()[:3] == ["a", "b", "c"]
+    assert left.error <= len(values) / (left.capacity + 1)
+
+
+def test_count_min_never_undercounts():
+    values = pd.Series(np.random.default_rng(3).zipf(1.5, size=50_000).astype(str))
+    counts = values.value_counts()
+    sketch = CountMinSketch()
+    sketch.update(hash_values(pd.Series(counts.index)), counts.to_numpy())
+
+    estimates = sketch.estimate(hash_values(pd.Series(counts.index)))
+    assert (estimates >= counts.to_numpy()).all()
+    assert (estimates - counts.to_numpy()).max() <= np.e / sketch.width * len(values) * 2
+
+
+def test_reservoir_sample_is_uniform_across_chunks_and_merge():
+    hits = np.zeros(1_000)
+    for seed in range(200):
+        left = ReservoirSampler(100, seed=seed)
+        right = ReservoirSampler(100, seed=seed + 1_000)
+        for chunk in np.array_split(np.arange(600), 7):
+            left.add(chunk)
+        for chunk in np.array_split(np.arange(600, 1_000), 3):
+            right.add(chunk)
+        left.merge(right)
+        assert len(left) == 100 and left.seen == 1_000
+        assert len(np.unique(left.values)) == 100
+        hits[left.values.astype(int)] += 1
+
+    # Each row is sampled with probability 0.1: 20 times on average.
+    first, second = hits[:600].mean(), hits[600:].mean()
+    assert abs(first - 20) < 2 and abs(second - 20) < 2
+
+
+def test_weighted_reservoir_prefers_heavy_rows():
+    sampler = WeightedReservoirSampler(50)
+    rows = np.arange(10_000)
+    weights = np.where(rows < 100, 100.0, 1.0)
+    weights[-10:] = 0
+    sampler.add(rows, weights)
+
+    assert len(sampler) == 50
+    assert (sampler.values < 100).mean() > 0.3
+    assert not np.isin(sampler.values, rows[-10:]).any()
+
+
+def test_stratified_reservoir_keeps_rare_strata():
+    sampler = StratifiedReservoirSampler(20)
+    strata = np.where(np.arange(10_000) < 5, "rare", "common")
+    sampler.add(np.arange(10_000), strata)
+
+    assert len(sampler.strata["rare"]) == 5
+    assert len(sampler.strata["common"]) == 20
+    assert len(sampler.values) == 25
@@ -127,6 +127,8 @@ export interface AuditReport {
     error_message?: string | null;
     is_sampled: boolean;
     sample_size: number;
+    is_approximate?: boolean;
+    duplicate_error_bound?: number;
     columns: ColumnProfile[];
 }
 